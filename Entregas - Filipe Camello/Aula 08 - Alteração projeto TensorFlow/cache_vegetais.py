@@ -0,0 +1,124 @@
+"""load_data do notebook Vegetables com decodificação em paralelo e cache em .npy.
+
+Na primeira execução cada split (train/test/validation) é decodificado e
+redimensionado em um pool de processos e gravado em um .npy uint8; nas seguintes
+o arquivo é aberto memory-mapped em milissegundos. A chave do cache inclui a
+lista de arquivos (caminho, tamanho, mtime), o ``img_size`` e a versão do
+formato, então trocar o ``img_size`` só gera o cache daquele tamanho.
+
+Uso no notebook (mesma estrutura de retorno do load_data original, mas em uint8;
+a normalização é feita por lote no pipeline):
+
+    from cache_vegetais import load_data
+    from pipeline_tfdata import dataset_memmap
+    (imagens_treino, labels_treino), (imagens_teste, labels_teste), (imagens_val, labels_val), class_names = load_data()
+    treino = dataset_memmap(imagens_treino, labels_treino, batch_size=64)
+    teste = dataset_memmap(imagens_teste, labels_teste, batch_size=64, embaralhar=False)
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from pastas_imagens import listar
+
+VERSAO = 1
+
+
+def _chave(pasta, caminhos, img_size):
+    h = hashlib.sha1(f"{VERSAO}|{img_size[0]}x{img_size[1]}".encode())
+    for caminho in caminhos:
+        stat = os.stat(caminho)
+        h.update(f"{os.path.relpath(caminho, pasta)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return h.hexdigest()[:16]
+
+
+def _processar_lote(args):
+    """Decodifica um trecho da lista direto no .npy (executado nos processos do pool)"""
+    arquivo, caminhos, inicio, img_size = args
+    imagens = np.load(arquivo, mmap_mode="r+")
+    ok = []
+    for i, caminho in enumerate(caminhos):
+        img = cv2.imread(caminho)
+        if img is None:
+            ok.append(False)
+            continue
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        imagens[inicio + i] = cv2.resize(img, img_size)
+        ok.append(True)
+    imagens.flush()
+    return ok
+
+
+def carregar_pasta(pasta, img_size=(32, 32), cache_dir='.cache_vegetais', workers=None, lote=256):
+    """(imagens uint8 memory-mapped, labels, classes) de ``pasta/<classe>/<imagem>``"""
+    caminhos, labels, classes = listar(pasta)
+    split = os.path.basename(os.path.normpath(pasta))
+    base = os.path.join(cache_dir, f"{split}-{img_size[0]}x{img_size[1]}-{_chave(pasta, caminhos, img_size)}")
+    arquivo, arquivo_labels, arquivo_meta = base + ".npy", base + ".labels.npy", base + ".json"
+
+    if not os.path.exists(arquivo_meta):
+        os.makedirs(cache_dir, exist_ok=True)
+        temporario = base + ".tmp.npy"
+        n = len(caminhos)
+        imagens = np.lib.format.open_memmap(temporario, mode="w+", dtype=np.uint8,
+                                            shape=(n, img_size[1], img_size[0], 3))
+        del imagens
+
+        tarefas = [(temporario, caminhos[i:i + lote], i, img_size) for i in range(0, n, lote)]
+        workers = workers or os.cpu_count() or 1
+        if workers <= 1:
+            resultados = [_processar_lote(t) for t in tarefas]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                resultados = list(pool.map(_processar_lote, tarefas))
+        ok = np.array([v for r in resultados for v in r], dtype=bool)
+
+        if ok.all():
+            os.replace(temporario, arquivo)
+        else:
+            # Imagens ilegíveis são descartadas, como no load_data original
+            np.save(arquivo, np.load(temporario, mmap_mode="r")[ok])
+            os.remove(temporario)
+        np.save(arquivo_labels, np.array(labels, dtype=np.int64)[ok])
+        # O .json marca o cache como completo
+        with open(arquivo_meta, "w", encoding="utf-8") as f:
+            json.dump({"classes": classes, "img_size": list(img_size), "n": int(ok.sum()),
+                       "descartadas": int((~ok).sum()), "versao": VERSAO}, f)
+
+    return np.load(arquivo, mmap_mode="r"), np.load(arquivo_labels), classes
+
+
+def load_data(base_dir='dataset/Vegetable Images', img_size=(32, 32), cache_dir='.cache_vegetais',
+              workers=None, normalizar=False):
+    """Mesma estrutura de retorno do load_data do notebook.
+
+    Por padrão os arrays ficam em uint8 memory-mapped (sem cópia) e a normalização
+    é feita por lote com ``pipeline_tfdata.dataset_memmap``. ``normalizar=True``
+    reproduz o float32 em [0, 1] do notebook, ao custo de uma cópia inteira em memória.
+    """
+    train_dir = os.path.join(base_dir, 'train')
+    test_dir = os.path.join(base_dir, 'test')
+    val_dir = os.path.join(base_dir, 'validation')
+    for pasta in (train_dir, test_dir):
+        if not os.path.exists(pasta):
+            raise ValueError(f"Diretório não encontrado: {pasta}")
+
+    def preparar(pasta):
+        imagens, labels, classes = carregar_pasta(pasta, img_size, cache_dir, workers)
+        if normalizar:
+            imagens = imagens.astype('float32') / 255.0
+        return imagens, labels, classes
+
+    X_train, y_train, class_names = preparar(train_dir)
+    X_test, y_test, test_classes = preparar(test_dir)
+    if test_classes != class_names:
+        print("Aviso: Classes de treino e teste são diferentes!")
+
+    if os.path.exists(val_dir):
+        X_val, y_val, _ = preparar(val_dir)
+        return (X_train, y_train), (X_test, y_test), (X_val, y_val), class_names
+    return (X_train, y_train), (X_test, y_test), class_names
@@ -0,0 +1,16 @@
+"""Listagem de ``pasta/<classe>/<imagem>`` compartilhada por pipeline_tfdata.py e cache_vegetais.py."""
+import os
+
+EXTENSOES = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+def listar(pasta, extensoes=EXTENSOES):
+    """(caminhos, labels, classes) em ordem estável; a classe é o nome da subpasta"""
+    classes = sorted(d for d in os.listdir(pasta) if os.path.isdir(os.path.join(pasta, d)))
+    caminhos, labels = [], []
+    for idx, classe in enumerate(classes):
+        for nome in sorted(os.listdir(os.path.join(pasta, classe))):
+            if nome.lower().endswith(extensoes):
+                caminhos.append(os.path.join(pasta, classe, nome))
+                labels.append(idx)
+    return caminhos, labels, classes
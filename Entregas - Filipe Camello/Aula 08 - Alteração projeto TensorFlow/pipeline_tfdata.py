@@ -0,0 +1,123 @@
+"""Pipeline tf.data para os notebooks CIFAR-10 e Vegetables.
+
+As imagens ficam em uint8 (cache, shuffle) e só viram float32 normalizado já em
+lote, dentro do pipeline — nada de ``imagens_treino / 255.0`` sobre o array
+inteiro (cópia float64 de ~1,2 GB no CIFAR-10). No Vegetables os arquivos são
+lidos sob demanda da árvore de pastas, decodificados em paralelo e o
+``fit`` não espera pela entrada graças ao ``prefetch``.
+
+Uso nos notebooks:
+
+    from pipeline_tfdata import dataset_cifar10, carregar_vegetais
+
+    treino, teste = dataset_cifar10(batch_size=64)
+    history = modelo_lia.fit(treino, epochs=2, validation_data=teste)
+
+    treino, teste, validacao, class_names = carregar_vegetais('dataset/Vegetable Images')
+    history = modelo_lia.fit(treino, epochs=20, validation_data=teste)
+
+Com o cache .npy do cache_vegetais.py (uint8 memory-mapped), os lotes saem direto
+do arquivo e só o lote vira float32:
+
+    (imagens_treino, labels_treino), (imagens_teste, labels_teste), *_ = load_data()
+    treino = dataset_memmap(imagens_treino, labels_treino, batch_size=64)
+"""
+import os
+
+import numpy as np
+import tensorflow as tf
+
+from pastas_imagens import listar
+
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+def normalizar(imagens, labels):
+    """uint8 -> float32 em [0, 1], aplicado por lote"""
+    return tf.cast(imagens, tf.float32) / 255.0, labels
+
+
+def _finalizar(ds, batch_size, embaralhar, tamanho_buffer, cache):
+    if cache is not None:
+        # cache="" guarda em memória (uint8); um caminho guarda em disco
+        ds = ds.cache(cache)
+    if embaralhar:
+        ds = ds.shuffle(tamanho_buffer, reshuffle_each_iteration=True)
+    return (ds.batch(batch_size)
+              .map(normalizar, num_parallel_calls=AUTOTUNE)
+              .prefetch(AUTOTUNE))
+
+
+def dataset_cifar10(batch_size=64, tamanho_buffer=10_000):
+    """(treino, teste) do CIFAR-10 mantendo os arrays em uint8"""
+    (x_treino, y_treino), (x_teste, y_teste) = tf.keras.datasets.cifar10.load_data()
+    treino = tf.data.Dataset.from_tensor_slices((x_treino, y_treino))
+    teste = tf.data.Dataset.from_tensor_slices((x_teste, y_teste))
+    return (_finalizar(treino, batch_size, True, tamanho_buffer, None),
+            _finalizar(teste, batch_size, False, tamanho_buffer, None))
+
+
+def dataset_memmap(imagens, labels, batch_size=64, embaralhar=True, seed=None):
+    """Lotes lidos do array uint8 (ex.: memory-mapped do cache_vegetais) e normalizados por lote.
+
+    A cada época os índices são embaralhados; dentro do lote eles são lidos em
+    ordem crescente para o acesso ao arquivo ficar sequencial.
+    """
+    labels = np.asarray(labels)
+    n = len(labels)
+    rng = np.random.default_rng(seed)
+
+    def lotes():
+        ordem = rng.permutation(n) if embaralhar else np.arange(n)
+        for inicio in range(0, n, batch_size):
+            indices = np.sort(ordem[inicio:inicio + batch_size])
+            yield np.asarray(imagens[indices]), labels[indices]
+
+    assinatura = (tf.TensorSpec((None,) + tuple(imagens.shape[1:]), tf.uint8),
+                  tf.TensorSpec((None,) + labels.shape[1:], tf.as_dtype(labels.dtype)))
+    ds = tf.data.Dataset.from_generator(lotes, output_signature=assinatura)
+    return ds.map(normalizar, num_parallel_calls=AUTOTUNE).prefetch(AUTOTUNE)
+
+
+def dataset_pasta(pasta, img_size=(32, 32), batch_size=64, embaralhar=True,
+                  cache="", tamanho_buffer=10_000):
+    """Dataset lido sob demanda de ``pasta/<classe>/<imagem>``.
+
+    Só os caminhos ficam em memória; a decodificação e o redimensionamento rodam
+    em paralelo no pipeline. Com ``cache=""`` as imagens já redimensionadas (uint8)
+    ficam em memória depois da primeira época; com um caminho, em disco.
+    """
+    caminhos, labels, classes = listar(pasta)
+    if not caminhos:
+        raise ValueError(f"Nenhuma imagem encontrada em: {pasta}")
+
+    def carregar(caminho, label):
+        img = tf.io.decode_image(tf.io.read_file(caminho), channels=3, expand_animations=False)
+        img = tf.image.resize(img, img_size)
+        return tf.cast(tf.clip_by_value(tf.round(img), 0, 255), tf.uint8), label
+
+    ds = tf.data.Dataset.from_tensor_slices((caminhos, labels))
+    if embaralhar:
+        # Embaralha os caminhos antes de decodificar (barato) e de novo depois do cache
+        ds = ds.shuffle(len(caminhos), reshuffle_each_iteration=False)
+    ds = ds.map(carregar, num_parallel_calls=AUTOTUNE)
+    return _finalizar(ds, batch_size, embaralhar, tamanho_buffer, cache), classes
+
+
+def carregar_vegetais(base_dir='dataset/Vegetable Images', img_size=(32, 32), batch_size=64,
+                      cache=""):
+    """Substitui o load_data do notebook: (treino, teste, validação, class_names)"""
+    pastas = {nome: os.path.join(base_dir, nome) for nome in ('train', 'test', 'validation')}
+    for nome in ('train', 'test'):
+        if not os.path.exists(pastas[nome]):
+            raise ValueError(f"Diretório não encontrado: {pastas[nome]}")
+
+    def cache_de(nome):
+        return cache if cache == "" or cache is None else f"{cache}_{nome}"
+
+    treino, class_names = dataset_pasta(pastas['train'], img_size, batch_size, True, cache_de('train'))
+    teste, _ = dataset_pasta(pastas['test'], img_size, batch_size, False, cache_de('test'))
+    validacao = None
+    if os.path.exists(pastas['validation']):
+        validacao, _ = dataset_pasta(pastas['validation'], img_size, batch_size, False, cache_de('validation'))
+    return treino, teste, validacao, class_names
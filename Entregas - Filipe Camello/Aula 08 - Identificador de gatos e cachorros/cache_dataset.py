@@ -0,0 +1,147 @@
+"""Cache pré-processado do dataset de cães e gatos para o ViT.
+
+O ``DogsAndCatsDataset`` do notebook decodifica o JPEG e roda o ViTImageProcessor
+a cada acesso, repetindo o mesmo trabalho em todas as épocas. Aqui as imagens são
+decodificadas e redimensionadas uma única vez para um array uint8 (N, 224, 224, 3)
+memory-mapped; a normalização é feita por lote, já no formato do ViT.
+
+Uso no notebook (no lugar de ``DogsAndCatsDataset``):
+
+    from cache_dataset import construir_cache, DatasetEmCache, normalizar_lote
+
+    construir_cache('./dataset_treino', './cache_treino')
+    full_dataset = DatasetEmCache('./cache_treino')
+    ...
+    for images, labels in train_loader:
+        images = normalizar_lote(images, processor.image_mean, processor.image_std).to(device)
+
+Ou pela linha de comando:
+
+    python cache_dataset.py ./dataset_treino ./cache_treino --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import torch
+from PIL import Image
+from torch.utils.data import Dataset
+from torchvision.datasets import ImageFolder
+
+TAMANHO = 224
+VERSAO = 1
+
+
+def _assinatura(amostras, tamanho):
+    """Hash da lista de arquivos (caminho, tamanho, mtime) + tamanho alvo"""
+    h = hashlib.sha1(f"{VERSAO}:{tamanho}".encode())
+    for caminho, label in amostras:
+        stat = os.stat(caminho)
+        h.update(f"{caminho}|{label}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def _decodificar(caminho, tamanho):
+    # Mesmo redimensionamento do ViTImageProcessor (bilinear, sem manter proporção)
+    with Image.open(caminho) as img:
+        return np.asarray(img.convert("RGB").resize((tamanho, tamanho), Image.BILINEAR), dtype=np.uint8)
+
+
+def _processar_lote(args):
+    arquivo_npy, caminhos, inicio, tamanho = args
+    imagens = np.load(arquivo_npy, mmap_mode="r+")
+    for i, caminho in enumerate(caminhos):
+        imagens[inicio + i] = _decodificar(caminho, tamanho)
+    imagens.flush()
+    return len(caminhos)
+
+
+def construir_cache(root_dir, destino, tamanho=TAMANHO, workers=None, lote=64):
+    """Decodifica e redimensiona todas as imagens uma vez; não refaz se nada mudou"""
+    pasta = ImageFolder(root_dir)
+    assinatura = _assinatura(pasta.samples, tamanho)
+    os.makedirs(destino, exist_ok=True)
+    arquivo_meta = os.path.join(destino, "meta.json")
+    arquivo_npy = os.path.join(destino, "imagens.npy")
+
+    if os.path.exists(arquivo_meta):
+        with open(arquivo_meta, encoding="utf-8") as f:
+            if json.load(f).get("assinatura") == assinatura:
+                return destino
+
+    n = len(pasta.samples)
+    imagens = np.lib.format.open_memmap(arquivo_npy, mode="w+", dtype=np.uint8,
+                                        shape=(n, tamanho, tamanho, 3))
+    del imagens
+    np.save(os.path.join(destino, "labels.npy"), np.array(pasta.targets, dtype=np.int64))
+
+    caminhos = [c for c, _ in pasta.samples]
+    tarefas = [(arquivo_npy, caminhos[i:i + lote], i, tamanho) for i in range(0, n, lote)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for t in tarefas:
+            _processar_lote(t)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_processar_lote, tarefas))
+
+    # O meta.json só é gravado no fim: um cache interrompido é refeito na próxima vez
+    with open(arquivo_meta, "w", encoding="utf-8") as f:
+        json.dump({"assinatura": assinatura, "classes": pasta.classes, "n": n,
+                   "tamanho": tamanho, "fonte": os.path.abspath(root_dir)}, f)
+    return destino
+
+
+class DatasetEmCache(Dataset):
+    """Lê o cache memory-mapped; devolve (imagem uint8 HWC, label).
+
+    O arquivo é aberto de forma preguiçosa em cada processo, então os workers do
+    DataLoader compartilham as páginas do cache do sistema em vez de copiar o array.
+    """
+
+    def __init__(self, pasta_cache):
+        self.pasta_cache = pasta_cache
+        with open(os.path.join(pasta_cache, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.classes = meta["classes"]
+        self.labels = np.load(os.path.join(pasta_cache, "labels.npy"))
+        self._imagens = None
+
+    @property
+    def imagens(self):
+        if self._imagens is None:
+            self._imagens = np.load(os.path.join(self.pasta_cache, "imagens.npy"), mmap_mode="r")
+        return self._imagens
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        estado["_imagens"] = None
+        return estado
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, idx):
+        return torch.from_numpy(np.array(self.imagens[idx])), int(self.labels[idx])
+
+
+def normalizar_lote(imagens, media=(0.5, 0.5, 0.5), desvio=(0.5, 0.5, 0.5)):
+    """Lote uint8 (N, H, W, 3) -> float32 (N, 3, H, W) normalizado como o ViTImageProcessor"""
+    x = imagens.permute(0, 3, 1, 2).float().div_(255.0)
+    media = torch.tensor(media, dtype=x.dtype, device=x.device).view(1, 3, 1, 1)
+    desvio = torch.tensor(desvio, dtype=x.dtype, device=x.device).view(1, 3, 1, 1)
+    return x.sub_(media).div_(desvio)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o cache uint8 memory-mapped do dataset")
+    parser.add_argument("root_dir")
+    parser.add_argument("destino")
+    parser.add_argument("--tamanho", type=int, default=TAMANHO)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    construir_cache(args.root_dir, args.destino, args.tamanho, args.workers)
+    print(f"✅ Cache pronto em {args.destino}")
@@ -0,0 +1,198 @@
+"""Inferência em lote na CPU para o ViT de cães e gatos (FP32 ou INT8).
+
+O modelo treinado no notebook deve ser salvo antes com
+``model.save_pretrained('modelo_vit')`` e ``processor.save_pretrained('modelo_vit')``.
+
+Classificar uma pasta inteira e gravar o CSV:
+
+    python inferencia_lote.py classificar modelo_vit ./dataset_teste previsoes.csv --int8 --batch 32
+
+Comparar FP32 x INT8 (latência, vazão e acurácia) na validação:
+
+    python inferencia_lote.py benchmark modelo_vit ./dataset_treino --split 0.2
+
+Exportar o modelo para ONNX:
+
+    python inferencia_lote.py onnx modelo_vit vit.onnx
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import torch
+from torch.utils.data import random_split
+from torchvision.datasets import ImageFolder
+from transformers import ViTForImageClassification, ViTImageProcessor
+
+from cache_dataset import TAMANHO, _decodificar, normalizar_lote
+
+EXTENSOES = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+def rotulos(model):
+    """Nomes das classes na ordem das saídas, lidos do checkpoint (config.id2label)"""
+    id2label = model.config.id2label
+    return [id2label[i] for i in range(len(id2label))]
+
+
+def carregar_modelo(pasta_modelo, int8=False, threads=None):
+    if threads:
+        torch.set_num_threads(threads)
+    model = ViTForImageClassification.from_pretrained(pasta_modelo).eval()
+    try:
+        processor = ViTImageProcessor.from_pretrained(pasta_modelo)
+    except OSError:
+        processor = ViTImageProcessor.from_pretrained("google/vit-base-patch16-224")
+    if int8:
+        model = quantizar(model)
+    return model, processor
+
+
+def quantizar(model):
+    """Quantização dinâmica INT8 das camadas Linear (pesos int8, ativações quantizadas na hora)"""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def exportar_onnx(model, destino, tamanho=TAMANHO):
+    exemplo = torch.zeros(1, 3, tamanho, tamanho)
+    torch.onnx.export(model, (exemplo,), destino, input_names=["pixel_values"], output_names=["logits"],
+                      dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}}, opset_version=17)
+    return destino
+
+
+def _decodificar_lote(caminhos, tamanho):
+    return np.stack([_decodificar(c, tamanho) for c in caminhos])
+
+
+def lotes_prefetch(caminhos, batch_size, workers=4, adiante=2, tamanho=TAMANHO):
+    """Decodifica os próximos lotes em threads enquanto o modelo processa o atual"""
+    grupos = [caminhos[i:i + batch_size] for i in range(0, len(caminhos), batch_size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def enviar(g):
+            # Cada lote é dividido entre as threads de decodificação
+            partes = [g[i::workers] for i in range(workers) if g[i::workers]]
+            return [pool.submit(_decodificar_lote, p, tamanho) for p in partes], len(partes)
+
+        pendentes = [enviar(g) for g in grupos[:adiante]]
+        for i, grupo in enumerate(grupos):
+            futuros, n_partes = pendentes.pop(0)
+            if i + adiante < len(grupos):
+                pendentes.append(enviar(grupos[i + adiante]))
+            partes = [f.result() for f in futuros]
+            # Desfaz a intercalação g[i::workers]
+            imagens = np.empty((len(grupo),) + partes[0].shape[1:], dtype=np.uint8)
+            for k, parte in enumerate(partes):
+                imagens[k::n_partes] = parte
+            yield grupo, imagens
+
+
+@torch.inference_mode()
+def prever(model, processor, imagens):
+    x = normalizar_lote(torch.from_numpy(imagens), processor.image_mean, processor.image_std)
+    return torch.softmax(model(pixel_values=x).logits, dim=-1).numpy()
+
+
+def listar_imagens(pasta):
+    return sorted(os.path.join(raiz, nome) for raiz, _, nomes in os.walk(pasta)
+                  for nome in nomes if nome.lower().endswith(EXTENSOES))
+
+
+def classificar_pasta(model, processor, pasta, saida_csv, batch_size=32, workers=4):
+    """Classifica todas as imagens da pasta e grava (arquivo, classe, confiança) no CSV"""
+    caminhos = listar_imagens(pasta)
+    classes = rotulos(model)
+    inicio = time.perf_counter()
+    with open(saida_csv, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.writer(f)
+        escritor.writerow(["arquivo", "classe", "confianca"])
+        for grupo, imagens in lotes_prefetch(caminhos, batch_size, workers):
+            probs = prever(model, processor, imagens)
+            for caminho, p in zip(grupo, probs):
+                escritor.writerow([caminho, classes[int(p.argmax())], round(float(p.max()), 4)])
+    tempo = time.perf_counter() - inicio
+    return {"imagens": len(caminhos), "tempo_s": round(tempo, 2),
+            "imagens_s": round(len(caminhos) / tempo, 2) if tempo else 0.0}
+
+
+def _avaliar(model, processor, caminhos, labels, batch_size, workers):
+    latencias, acertos = [], 0
+    inicio = time.perf_counter()
+    for i, (grupo, imagens) in enumerate(lotes_prefetch(caminhos, batch_size, workers)):
+        t0 = time.perf_counter()
+        probs = prever(model, processor, imagens)
+        latencias.append((time.perf_counter() - t0) / len(grupo))
+        acertos += int((probs.argmax(1) == labels[i * batch_size:i * batch_size + len(grupo)]).sum())
+    tempo = time.perf_counter() - inicio
+    lat = np.array(latencias) * 1000
+    return {"latencia_ms_p50": round(float(np.percentile(lat, 50)), 2),
+            "latencia_ms_p95": round(float(np.percentile(lat, 95)), 2),
+            "imagens_s": round(len(caminhos) / tempo, 2),
+            "acuracia_%": round(100 * acertos / len(caminhos), 2)}
+
+
+def benchmark(pasta_modelo, pasta_treino, split=0.2, seed=42, batch_size=32, workers=4, threads=None):
+    """FP32 x INT8 na mesma divisão de validação (semente fixa)"""
+    pasta = ImageFolder(pasta_treino)
+    n_val = int(split * len(pasta))
+    _, val = random_split(range(len(pasta)), [len(pasta) - n_val, n_val],
+                          generator=torch.Generator().manual_seed(seed))
+    indices = list(val)
+    caminhos = [pasta.samples[i][0] for i in indices]
+    labels = np.array([pasta.samples[i][1] for i in indices])
+
+    resultados = {}
+    for nome, int8 in (("fp32", False), ("int8", True)):
+        model, processor = carregar_modelo(pasta_modelo, int8=int8, threads=threads)
+        resultados[nome] = _avaliar(model, processor, caminhos, labels, batch_size, workers)
+        print(nome, resultados[nome])
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inferência em lote do ViT na CPU")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("classificar")
+    p.add_argument("modelo")
+    p.add_argument("pasta")
+    p.add_argument("saida_csv")
+    p.add_argument("--int8", action="store_true")
+    p.add_argument("--batch", type=int, default=32)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--threads", type=int, default=None)
+
+    p = sub.add_parser("benchmark")
+    p.add_argument("modelo")
+    p.add_argument("pasta_treino")
+    p.add_argument("--split", type=float, default=0.2)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--batch", type=int, default=32)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--threads", type=int, default=None)
+    p.add_argument("--json", default=None)
+
+    p = sub.add_parser("onnx")
+    p.add_argument("modelo")
+    p.add_argument("destino")
+
+    args = parser.parse_args()
+    if args.comando == "classificar":
+        model, processor = carregar_modelo(args.modelo, int8=args.int8, threads=args.threads)
+        print(classificar_pasta(model, processor, args.pasta, args.saida_csv, args.batch, args.workers))
+    elif args.comando == "benchmark":
+        resultados = benchmark(args.modelo, args.pasta_treino, args.split, args.seed,
+                               args.batch, args.workers, args.threads)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(resultados, f, indent=2)
+    else:
+        model, _ = carregar_modelo(args.modelo)
+        print(f"✅ ONNX salvo em {exportar_onnx(model, args.destino)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,16 @@ import pyautogui
 import tkinter as tk
 import threading
 import time
+import sys
+from pathlib import Path
+
+pasta_modulos = str(Path(__file__).resolve().parents[2])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from visao import perfil
+
+# Rastreamento opcional das etapas: LIA_PERFIL=trace.json ou --perfil trace.json [--cprofile 5:10]
+perfil.configurar()
 
 # Carregar o modelo YOLO
 model = YOLO('model/minecraft_best.pt')
@@ -32,9 +42,11 @@ def detection_worker():
     print("🔍 Iniciando thread de detecção...")
     
     while running:
+        perfil.tick()
         try:
             # Capturar tela
-            frame = capture_screen()
+            with perfil.span("capture"):
+                frame = capture_screen()
             if frame is None:
                 time.sleep(0.1)
                 continue
@@ -43,17 +55,18 @@ def detection_worker():
             
             # Fazer detecção com tamanho otimizado
             resized_width, resized_height = 640, 640
-            small_frame = cv2.resize(frame, (resized_width, resized_height))
-            
-            # Configurações para melhor detecção
-            results = model.predict(
-                small_frame, 
-                verbose=False, 
-                save=False,
-                imgsz=640,
-                conf=0.3,
-                iou=0.5
-            )
+            with perfil.span("inference"):
+                small_frame = cv2.resize(frame, (resized_width, resized_height))
+                
+                # Configurações para melhor detecção
+                results = model.predict(
+                    small_frame, 
+                    verbose=False, 
+                    save=False,
+                    imgsz=640,
+                    conf=0.3,
+                    iou=0.5
+                )
             
             # Processar resultados e escalar coordenadas
             current_detections = []
@@ -61,31 +74,32 @@ def detection_worker():
             scale_y = original_height / resized_height
             
             detection_count = 0
-            for result in results:
-                for box in result.boxes:
-                    x1, y1, x2, y2 = map(int, box.xyxy[0])
-                    confidence = box.conf[0]
-                    cls = int(box.cls[0])
-                    class_name = class_names[cls] if cls in class_names else 'Desconhecido'
-                    
-                    # Escalar coordenadas
-                    x1 = int(x1 * scale_x)
-                    y1 = int(y1 * scale_y)
-                    x2 = int(x2 * scale_x)
-                    y2 = int(y2 * scale_y)
-                    
-                    # Garantir que as coordenadas estão dentro da tela
-                    x1 = max(0, min(x1, original_width))
-                    x2 = max(0, min(x2, original_width))
-                    y1 = max(0, min(y1, original_height))
-                    y2 = max(0, min(y2, original_height))
-                    
-                    current_detections.append({
-                        'bbox': (x1, y1, x2, y2),
-                        'confidence': float(confidence),
-                        'class_name': class_name
-                    })
-                    detection_count += 1
+            with perfil.span("postprocess"):
+                for result in results:
+                    for box in result.boxes:
+                        x1, y1, x2, y2 = map(int, box.xyxy[0])
+                        confidence = box.conf[0]
+                        cls = int(box.cls[0])
+                        class_name = class_names[cls] if cls in class_names else 'Desconhecido'
+                        
+                        # Escalar coordenadas
+                        x1 = int(x1 * scale_x)
+                        y1 = int(y1 * scale_y)
+                        x2 = int(x2 * scale_x)
+                        y2 = int(y2 * scale_y)
+                        
+                        # Garantir que as coordenadas estão dentro da tela
+                        x1 = max(0, min(x1, original_width))
+                        x2 = max(0, min(x2, original_width))
+                        y1 = max(0, min(y1, original_height))
+                        y2 = max(0, min(y2, original_height))
+                        
+                        current_detections.append({
+                            'bbox': (x1, y1, x2, y2),
+                            'confidence': float(confidence),
+                            'class_name': class_name
+                        })
+                        detection_count += 1
             
             detections = current_detections
             if detection_count > 0:
@@ -163,49 +177,51 @@ def create_transparent_overlay():
             root.quit()
             return
         
-        # Limpar canvas (importante: não limpar completamente para manter transparência)
-        canvas.delete("detection")
-        canvas.delete("detection_text")
-        canvas.delete("info")
-        canvas.delete("controls")
-        canvas.delete("status_bg")
+        with perfil.span("ui"):
+            # Limpar canvas (importante: não limpar completamente para manter transparência)
+            canvas.delete("detection")
+            canvas.delete("detection_text")
+            canvas.delete("info")
+            canvas.delete("controls")
+            canvas.delete("status_bg")
         
-        if not paused and detections:
-            # Desenhar detecções
-            for detection in detections:
-                draw_detection(canvas, detection)
+            if not paused and detections:
+                # Desenhar detecções
+                with perfil.span("draw"):
+                    for detection in detections:
+                        draw_detection(canvas, detection)
         
-        # Desenhar informações de status (em cores não-brancas)
-        if show_info:
-            # Fundo semi-transparente para informações
-            canvas.create_rectangle(
-                5, 5, 300, 80,
-                fill='black',
-                stipple='gray50',  # Padrão de pontilhado para transparência
-                tags="status_bg"
-            )
+            # Desenhar informações de status (em cores não-brancas)
+            if show_info:
+                # Fundo semi-transparente para informações
+                canvas.create_rectangle(
+                    5, 5, 300, 80,
+                    fill='black',
+                    stipple='gray50',  # Padrão de pontilhado para transparência
+                    tags="status_bg"
+                )
             
-            status_color = '#FF0000' if paused else '#00FF00'
-            status_text = f"Detecções: {len(detections)} | {'PAUSADO' if paused else 'ATIVO'}"
+                status_color = '#FF0000' if paused else '#00FF00'
+                status_text = f"Detecções: {len(detections)} | {'PAUSADO' if paused else 'ATIVO'}"
             
-            canvas.create_text(
-                10, 10,
-                text=status_text,
-                fill=status_color,
-                font=('Arial', 12, 'bold'),
-                anchor='nw',
-                tags="info"
-            )
+                canvas.create_text(
+                    10, 10,
+                    text=status_text,
+                    fill=status_color,
+                    font=('Arial', 12, 'bold'),
+                    anchor='nw',
+                    tags="info"
+                )
             
-            controls_text = "ESC: Sair | ESPAÇO: Pausar | I: Info"
-            canvas.create_text(
-                10, 35,
-                text=controls_text,
-                fill='#FFFFFF', 
-                font=('Arial', 10),
-                anchor='nw',
-                tags="controls"
-            )
+                controls_text = "ESC: Sair | ESPAÇO: Pausar | I: Info"
+                canvas.create_text(
+                    10, 35,
+                    text=controls_text,
+                    fill='#FFFFFF', 
+                    font=('Arial', 10),
+                    anchor='nw',
+                    tags="controls"
+                )
         
         # Agendar próxima atualização
         root.after(50, update_overlay)  # 20 FPS
@@ -1,7 +1,15 @@
 import cv2
+import sys
+from pathlib import Path
 from ultralytics import YOLO
 import yt_dlp
 
+pasta_modulos = str(Path(__file__).resolve().parents[2])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from visao.latencia import ControladorLatencia, detectar_frame
+from visao.captura import CapturaFrames
+
 # Carregar o modelo YOLO
 model = YOLO('model/minecraft_best.pt')
 
@@ -26,46 +34,32 @@ def get_youtube_stream(url):
 # Importando vídeo do youtube - use a URL completa
 video_url = "https://www.youtube.com/shorts/ZgihpwdUFEI"
 
-# Obter URL do stream
-stream_url = get_youtube_stream(video_url)
-
+# A URL do stream expira: a captura chama get_youtube_stream de novo a cada reconexão
 print("Conectando ao stream do YouTube...")
-video = cv2.VideoCapture(stream_url)
+# Leitura em thread própria: fica só o frame mais novo (sem atraso acumulado no buffer)
+# e a conexão é refeita com espera exponencial quando cai. O vídeo é sob demanda: o fim
+# do vídeo encerra a leitura e, se a conexão cair, desiste depois de 5 tentativas
+video = CapturaFrames(lambda: get_youtube_stream(video_url), max_tentativas=5)
 
 
 # Ler a webcam
-#video = cv2.VideoCapture(0)
-
-# Configurações para melhor performance
-frame_skip = 1  # Processar 1 frame a cada X frames
-frame_count = 0
-resize_factor = 1  # Reduzir resolução para 50%
+#video = CapturaFrames(0)
 
-# Dicionário de nomes das classes
-class_names = model.names
+# Configurações para melhor performance: em vez de fixar o salto de frames e a
+# resolução, o controle ajusta imgsz (640/480/320) e o salto pelo p95 da latência
+latencia_alvo_ms = 1000 / 30  # acompanhar um stream de 30 FPS
+controle = ControladorLatencia(alvo_ms=latencia_alvo_ms)
+caixas = []
 
 while True:
-    check, img = video.read()
+    check, img = video.read(timeout=30)
+    if not check:
+        print("Fim do stream ou falha na leitura.")
+        break
     
-    # Realizar a predição na imagem
-    results = model.predict(img, verbose=False, save=True)
-
-    # Extrair detecções e desenhar na imagem
-    for result in results:
-        for box in result.boxes:
-            # Obter coordenadas, confiança e classe
-            x1, y1, x2, y2 = map(int, box.xyxy[0])  # Convertendo coordenadas para inteiros
-            confidence = box.conf[0]
-            cls = int(box.cls[0])
-            
-            # Obter o nome da classe
-            class_name = class_names[cls] if cls in class_names else 'Desconhecido'
-            
-            # Desenhar o retângulo na imagem
-            cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            # Adicionar o nome da classe e a confiança
-            cv2.putText(img, f'{class_name} ({confidence:.2f})', 
-                        (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    # Predição só nos frames escolhidos pelo controle de latência (só o predict é cronometrado);
+    # nos frames pulados são desenhadas as detecções do último frame processado
+    caixas = detectar_frame(model, img, controle, caixas)
 
     # Mostrar o vídeo com as detecções
     cv2.imshow('Detectando em LIA 2025', img)
@@ -76,4 +70,9 @@ while True:
 
 # Liberar a captura e destruir todas as janelas
 video.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+cv2.destroyAllWindows()
+
+# Métricas da captura (descartes, atraso, reconexões) e do controle de latência
+print(video.metricas())
+print(controle.estado())
+controle.salvar_decisoes('metricas_latencia.csv')
\ No newline at end of file
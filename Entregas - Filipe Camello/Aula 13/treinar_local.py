@@ -0,0 +1,144 @@
+"""Treinamento local (CPU) do modelo YOLO do Minecraft.
+
+Equivale à célula do Treinamento_do_Modelo.ipynb
+
+    !yolo task=detect mode=train model=yolo11n.pt data=/content/minecraft-2/data.yaml epochs=5 imgsz=640 workers=2
+
+mas roda a partir de uma pasta local no mesmo formato do download do Roboflow
+(data.yaml + train/ valid/ test/), com:
+  - imagens pré-decodificadas em cache na RAM ou em disco (``--cache``);
+  - número de workers calculado a partir dos núcleos disponíveis;
+  - checkpoints retomáveis (``--retomar`` continua do last.pt);
+  - log de vazão por época (imagens/s, tempo da época) em throughput.csv.
+
+Uso:
+    python treinar_local.py --data ./minecraft-2 --epochs 5 --imgsz 640
+    python treinar_local.py --data ./minecraft-2 --retomar
+"""
+import argparse
+import csv
+import os
+import time
+
+import psutil
+import yaml
+from ultralytics import YOLO
+
+NOME_PADRAO = "minecraft_cpu"
+
+# Formatos de imagem lidos pelo YOLO (os .txt de labels e outros arquivos não entram no cache)
+EXTENSOES_IMAGEM = (".bmp", ".dng", ".jpeg", ".jpg", ".mpo", ".png", ".tif", ".tiff", ".webp", ".pfm")
+
+
+def workers_padrao():
+    """Deixa um núcleo livre para o processo principal (máx. 8, como o padrão do YOLO)"""
+    nucleos = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    return max(1, min(8, nucleos - 1))
+
+
+def cache_padrao(pasta, imgsz):
+    """RAM se as imagens decodificadas couberem com folga na memória livre, senão disco.
+
+    Conta só os arquivos de imagem dentro das pastas ``images/`` (train/valid/test).
+    """
+    n_imagens = sum(1 for raiz, _, arquivos in os.walk(pasta)
+                    if os.path.basename(raiz) == "images"
+                    for nome in arquivos if nome.lower().endswith(EXTENSOES_IMAGEM))
+    estimativa = n_imagens * imgsz * imgsz * 3
+    return "ram" if estimativa < 0.5 * psutil.virtual_memory().available else "disk"
+
+
+def preparar_yaml(pasta):
+    """Gera data_local.yaml com as mesmas chaves do data.yaml, mas caminhos absolutos.
+
+    O data.yaml do Roboflow aponta para ../train/images etc., relativos ao Colab.
+    """
+    with open(os.path.join(pasta, "data.yaml"), encoding="utf-8") as f:
+        dados = yaml.safe_load(f)
+    pasta = os.path.abspath(pasta)
+    for chave in ("train", "val", "test"):
+        if chave not in dados:
+            continue
+        relativo = str(dados[chave])
+        candidatos = [os.path.join(pasta, relativo), os.path.join(pasta, relativo.replace("../", "", 1))]
+        dados[chave] = next((os.path.normpath(c) for c in candidatos if os.path.exists(c)), candidatos[0])
+    destino = os.path.join(pasta, "data_local.yaml")
+    with open(destino, "w", encoding="utf-8") as f:
+        yaml.safe_dump(dados, f, allow_unicode=True, sort_keys=False)
+    return destino
+
+
+def registrar_vazao(model, arquivo_log=None):
+    """Callbacks que medem a duração de cada época e a vazão em imagens/s"""
+    estado = {}
+
+    def inicio_epoca(trainer):
+        estado["inicio"] = time.perf_counter()
+
+    def fim_epoca(trainer):
+        tempo = time.perf_counter() - estado["inicio"]
+        n = len(trainer.train_loader.dataset)
+        linha = {"epoca": trainer.epoch + 1, "tempo_epoca_s": round(tempo, 2),
+                 "imagens": n, "imagens_s": round(n / tempo, 2) if tempo else 0.0}
+        caminho = arquivo_log or os.path.join(trainer.save_dir, "throughput.csv")
+        novo = not os.path.exists(caminho)
+        with open(caminho, "a", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(linha))
+            if novo:
+                escritor.writeheader()
+            escritor.writerow(linha)
+        print(f"⏱️ Época {linha['epoca']}: {linha['tempo_epoca_s']} s | {linha['imagens_s']} imagens/s")
+
+    model.add_callback("on_train_epoch_start", inicio_epoca)
+    model.add_callback("on_train_epoch_end", fim_epoca)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Treino local do YOLO (CPU)")
+    parser.add_argument("--data", required=True, help="pasta do dataset (com data.yaml)")
+    parser.add_argument("--model", default="yolo11n.pt")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--batch", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", choices=["ram", "disk", "nenhum"], default=None)
+    parser.add_argument("--project", default="runs/detect")
+    parser.add_argument("--name", default=NOME_PADRAO)
+    parser.add_argument("--save-period", type=int, default=1, help="salvar checkpoint a cada N épocas")
+    parser.add_argument("--retomar", action="store_true", help="continua do último checkpoint")
+    args = parser.parse_args()
+
+    workers = args.workers or workers_padrao()
+    ultimo = os.path.join(args.project, args.name, "weights", "last.pt")
+
+    if args.retomar:
+        if not os.path.exists(ultimo):
+            raise SystemExit(f"Checkpoint não encontrado: {ultimo}")
+        print(f"🔁 Retomando de {ultimo}")
+        model = YOLO(ultimo)
+        registrar_vazao(model)
+        model.train(resume=True, workers=workers, device="cpu")
+        return
+
+    cache = args.cache or cache_padrao(args.data, args.imgsz)
+    print(f"🧠 workers={workers} | cache={cache} | imgsz={args.imgsz}")
+
+    model = YOLO(args.model)
+    registrar_vazao(model)
+    model.train(
+        data=preparar_yaml(args.data),
+        epochs=args.epochs,
+        imgsz=args.imgsz,
+        batch=args.batch,
+        workers=workers,
+        cache=False if cache == "nenhum" else cache,
+        device="cpu",
+        project=args.project,
+        name=args.name,
+        exist_ok=True,
+        save_period=args.save_period,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,23 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[3] / "Streamlit")
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("Dieta", importar=["pandas", "numpy", "sklearn.model_selection", "sklearn.preprocessing",
+                                              "sklearn.ensemble", "sklearn.metrics", "utils.catalogo",
+                                              "utils.selecao_modelos"])
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import OrdinalEncoder
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
+from utils.catalogo import carregar_dataset
+from utils.selecao_modelos import parametros_escolhidos
 
 st.set_page_config(
     page_title="Sistema de Recomendação Dietética",
@@ -15,8 +28,8 @@ st.set_page_config(
 # Função para criar o modelo
 @st.cache_data
 def load_data_and_model():
-    # Carregar dados
-    df = pd.read_csv("Dieta\diet_recommendations_reduced.csv")
+    # Carregar dados (cópia colunar em cache, refeita só quando o CSV muda)
+    df = carregar_dataset("dieta")
     
     # Calcular BMI
     df['BMI'] = df['Weight_kg'] / ((df['Height_cm'] / 100) ** 2)
@@ -57,8 +70,9 @@ def load_data_and_model():
     # Dividir dados
     X_train, X_test, y_train, y_test = train_test_split(X_encoded, y, test_size=0.3, random_state=42)
     
-    # Treinar modelo
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    # Treinar modelo (com os hiperparâmetros da busca, se já tiver rodado: python -m utils.selecao_modelos dieta)
+    params = {"n_estimators": 100, **parametros_escolhidos("dieta")}
+    model = RandomForestClassifier(**params, random_state=42)
     model.fit(X_train, y_train)
     
     # Calcular acurácia
@@ -252,4 +266,6 @@ if st.button("🎯 Obter Recomendação de Dieta", type="primary"):
 
 # Rodapé
 st.markdown("---")
-st.markdown("*Sistema de recomendação baseado em aprendizado de máquina para orientação dietética personalizada.*")
\ No newline at end of file
+st.markdown("*Sistema de recomendação baseado em aprendizado de máquina para orientação dietética personalizada.*")
+
+concluir(relatorio_inicio)
\ No newline at end of file
@@ -1,7 +1,21 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[3] / "Streamlit")
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("Inflação", importar=["pandas", "numpy", "utils.selecao_ordem", "utils.backtest",
+                                                 "utils.graficos", "utils.upload"])
+
 import pandas as pd
-import matplotlib.pyplot as plt
-from statsmodels.tsa.arima.model import ARIMA
+import numpy as np
+# statsmodels e matplotlib só são importados quando o botão de previsão é usado
+from utils.selecao_ordem import buscar_ordem, gerar_candidatos
+from utils.backtest import backtest, comparar_janelas
+from utils.graficos import cache_figuras, hash_dados, lttb, pyplot
+from utils.upload import ler_upload, UploadInvalido
 
 # Configuração da página
 st.set_page_config(page_title="Previsão de Inflação", layout="wide")
@@ -12,12 +26,17 @@ st.sidebar.header("Configurações")
 uploaded_file = st.sidebar.file_uploader("📂 Faça upload do CSV", type=["csv"])
 
 if uploaded_file is not None:
-    # Ler o CSV
-    df = pd.read_csv(uploaded_file)
+    # Ler o CSV em blocos direto do buffer enviado (com limites de tamanho e linhas)
+    try:
+        df, amostra = ler_upload(uploaded_file)
+    except UploadInvalido as e:
+        st.error(f"❌ {e}")
+        st.stop()
     
-    # Mostrar dados originais
+    # Mostrar só uma amostra dos dados originais
     st.write("### 📊 Dados Originais")
-    st.dataframe(df, use_container_width=True)
+    st.write(f"{len(df)} linhas - exibindo as primeiras {len(amostra)}")
+    st.dataframe(amostra, use_container_width=True)
     
     # Processamento SIMPLES dos dados
     dados_lista = []
@@ -86,14 +105,31 @@ if uploaded_file is not None:
         step=1
     )
     
+    # Busca automática de ordem (p,d,q) em paralelo
+    ordem_auto = st.sidebar.checkbox("Selecionar ordem automaticamente", value=False)
+    criterio = st.sidebar.radio("Critério:", ["aic", "bic"], horizontal=True, disabled=not ordem_auto)
+    
+    # Avaliação do erro de previsão (rolling-origin)
+    avaliar = st.sidebar.checkbox("Avaliar erro (backtest)", value=False)
+    
     if st.sidebar.button("🔮 Gerar Previsão"):
         # Dados para treino
         valores_treino = df_clean['Valor'].tail(meses_treino).values
         
         try:
             # Modelo ARIMA
-            model = ARIMA(valores_treino, order=(1, 1, 1))
-            model_fit = model.fit()
+            ordem = (1, 1, 1)
+            if ordem_auto:
+                busca = buscar_ordem(valores_treino, gerar_candidatos(), criterio=criterio)
+                model_fit = busca.resultado
+                ordem = busca.melhor[0]
+                st.sidebar.success(f"Ordem escolhida: {busca.melhor[0]} ({busca.tempo_s:.2f} s)")
+                with st.expander("Ranking dos candidatos"):
+                    st.dataframe(busca.ranking, use_container_width=True)
+            else:
+                from statsmodels.tsa.arima.model import ARIMA
+                model = ARIMA(valores_treino, order=ordem)
+                model_fit = model.fit()
             
             # Previsão
             forecast = model_fit.forecast(steps=meses_previsao)
@@ -139,28 +175,64 @@ if uploaded_file is not None:
             # Gráfico
             st.write("### 📈 Histórico + Previsão")
             
-            fig, ax = plt.subplots(figsize=(14, 6))
-            
-            # Histórico em azul
-            ax.plot(df_treino['Período'], df_treino['Valor Real'], 
-                   label='Histórico', color='blue', marker='o', linewidth=2)
-            
-            # Previsão em vermelho
-            ax.plot(df_prev['Período'], df_prev['Previsão'], 
-                   label='Previsão', color='red', marker='s', linestyle='--', linewidth=2)
-            
-            ax.set_xlabel("Período")
-            ax.set_ylabel("Inflação (%)")
-            ax.set_title("Previsão de Inflação")
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
-            st.pyplot(fig)
+            def desenhar():
+                fig, ax = pyplot().subplots(figsize=(14, 6))
+                n = len(df_treino)
+                
+                # Histórico em azul (reduzido a ~1 ponto por pixel com LTTB)
+                idx = lttb(np.arange(n), valores_treino, 1400)
+                ax.plot(idx, valores_treino[idx], label='Histórico', color='blue',
+                        marker='o' if len(idx) <= 120 else None, linewidth=2)
+                
+                # Previsão em vermelho
+                ax.plot(np.arange(n, n + meses_previsao), df_prev['Previsão'],
+                        label='Previsão', color='red', marker='s', linestyle='--', linewidth=2)
+                
+                # No máximo 24 rótulos no eixo x
+                rotulos = list(df_treino['Período']) + datas_futuras
+                ticks = np.unique(np.linspace(0, len(rotulos) - 1, min(len(rotulos), 24)).astype(int))
+                ax.set_xticks(ticks)
+                ax.set_xticklabels([rotulos[t] for t in ticks], rotation=45)
+                
+                ax.set_xlabel("Período")
+                ax.set_ylabel("Inflação (%)")
+                ax.set_title("Previsão de Inflação")
+                ax.legend()
+                ax.grid(True, alpha=0.3)
+                fig.tight_layout()
+                return fig
+            
+            # A figura só é redesenhada quando os dados ou os rótulos mudam
+            chave = ("inflacao", hash_dados(valores_treino, np.asarray(forecast)),
+                     df_treino['Período'].iloc[0], datas_futuras[0])
+            st.image(cache_figuras.obter(chave, desenhar), use_container_width=True)
+            
+            if avaliar:
+                st.write("### 📏 Erro de Previsão (backtest rolling-origin)")
+                serie_completa = df_clean['Valor'].values
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.write(f"Janela deslizante de {meses_treino} meses")
+                    bt = backtest(serie_completa, order=ordem, horizonte=meses_previsao,
+                                  janela=meses_treino)
+                    st.dataframe(bt.por_horizonte(), use_container_width=True)
+                    st.caption(f"{len(bt.folds)} folds em {bt.tempo_total:.2f} s")
+                with col2:
+                    st.write("Comparação de tamanhos de janela (meses de treino)")
+                    janelas = sorted({12, 24, 36, 48, 60, int(meses_treino)})
+                    comparacao = comparar_janelas(serie_completa, janelas, horizonte=meses_previsao,
+                                                  order=ordem)
+                    if comparacao.empty:
+                        st.info("Série curta demais para comparar os tamanhos de janela.")
+                    else:
+                        st.dataframe(comparacao, use_container_width=True)
             
         except Exception as e:
             st.error(f"Erro: {e}")
 
 else:
-    st.info("📤 Faça upload do arquivo CSV para começar")
\ No newline at end of file
+    st.info("📤 Faça upload do arquivo CSV para começar")
+
+# Depois da primeira pintura, adianta em segundo plano o que a previsão vai usar
+concluir(relatorio_inicio, precarregar=["statsmodels.tsa.arima.model", "statsmodels.tsa.statespace.sarimax",
+                                        "pyarrow.csv", pyplot])
\ No newline at end of file
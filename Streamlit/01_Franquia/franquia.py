@@ -1,12 +1,23 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("01_Franquia", importar=["pandas", "sklearn.linear_model", "matplotlib.pyplot",
+                                                    "utils.catalogo"])
+
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 import matplotlib.pyplot as plt
+from utils.catalogo import carregar_dataset
 
 st.title("Previsão de Custo para Franquia")
 
-# Carregar os dados
-data = pd.read_csv("franquia_custos_iniciais.csv", sep=";")
+# Carregar os dados (cópia colunar em cache, refeita só quando o CSV muda)
+data = carregar_dataset("franquia")
 
 # X -> dataframe; y -> série do pandas
 X = data[['custo_franquia_anual']]
@@ -45,5 +56,7 @@ if process:
    prevision = model.predict(data_new_value)
    st.header(f"Previsão de Custo: R$ {prevision[0]:.2f}") 
 
+concluir(relatorio_inicio)
+
 # Para rodar a APP
 # python - m streamlit run .\01. Franquia.py
@@ -1,9 +1,22 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("02_Veiculos", importar=["pandas", "sklearn.model_selection", "sklearn.preprocessing",
+                                                    "sklearn.naive_bayes", "sklearn.metrics", "utils.catalogo",
+                                                    "utils.selecao_modelos"])
+
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import OrdinalEncoder
 from sklearn.naive_bayes import CategoricalNB
 from sklearn.metrics import accuracy_score
+from utils.catalogo import carregar_dataset
+from utils.selecao_modelos import parametros_escolhidos
 
 st.set_page_config(
     page_title="Avaliação de Veículos",
@@ -14,18 +27,17 @@ st.set_page_config(
 # Função para criar o modelo e a predição
 @st.cache_data
 def load_data_and_model():
-    cars = pd.read_csv("avaliacao_veiculo.csv", sep=";")
+    # As colunas já chegam como category a partir do cache colunar
+    cars = carregar_dataset("veiculos")
     encoder = OrdinalEncoder()
 
-    for col in cars.columns.drop('evaluation'):
-        cars[col] = cars[col].astype('category')
-
     X_encoded = encoder.fit_transform(cars.drop('evaluation',axis=1))
     y = cars['evaluation'].astype('category').cat.codes
 
     X_train, X_test, y_train, y_test = train_test_split(X_encoded, y, test_size=0.3, random_state=42)
 
-    model = CategoricalNB()
+    # Hiperparâmetros da busca, se já tiver rodado: python -m utils.selecao_modelos veiculos
+    model = CategoricalNB(**parametros_escolhidos("veiculos"))
     model.fit(X_train, y_train)
 
     y_pred = model.predict(X_test)
@@ -55,4 +67,6 @@ if st.button("Processar"):
     input_encoded = encoder.transform(input_df)
     predict_encoded = model.predict(input_encoded)
     predict = cars['evaluation'].astype('category').cat.categories[predict_encoded][0]
-    st.header(f"Resultado da avaliação: {predict}")
\ No newline at end of file
+    st.header(f"Resultado da avaliação: {predict}")
+
+concluir(relatorio_inicio)
\ No newline at end of file
@@ -1,10 +1,22 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("03_Leite", importar=["pandas", "utils.sarimax_incremental", "utils.selecao_ordem",
+                                                 "utils.backtest", "utils.graficos", "utils.upload"])
+
 import pandas as pd
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-from statsmodels.tsa.seasonal import seasonal_decompose
-import matplotlib.pyplot as plt
 from datetime import date
-from io import StringIO
+# statsmodels, matplotlib e pyarrow só são importados dentro das funções que os usam
+from utils.sarimax_incremental import PrevisorIncremental, MODO_COMPLETO, MODO_FILTRO, MODO_WARM
+from utils.selecao_ordem import buscar_ordem, gerar_candidatos
+from utils.backtest import backtest
+from utils.graficos import grafico_decomposicao, grafico_previsao, pyplot
+from utils.upload import ler_upload, UploadInvalido
 
 st.set_page_config(page_title="Sistema de Análise e Previsão de Séries Temporais", layout="wide")
 
@@ -13,40 +25,83 @@ st.title("Estimativa de Produção de Leite")
 with st.sidebar:
     uploaded_file = st.file_uploader("Escolha o arquivo:", type=['csv'])
     if uploaded_file is not None:
-        string_io = StringIO(uploaded_file.getvalue().decode("utf-8"))
-        data = pd.read_csv(string_io, header=None)
+        # Leitura em blocos direto do buffer enviado, com limites de tamanho e linhas
+        try:
+            data, sample = ler_upload(uploaded_file, header=None)
+        except UploadInvalido as ex:
+            st.error(str(ex))
+            st.stop()
+        st.caption(f"{len(data)} meses carregados")
         start_date = date(2011, 1, 1)
         period = st.date_input("Período Inicial da Série", start_date)
         forecast_period = st.number_input("Informe a quantidade de meses para previsão", 
                                            min_value=1, max_value=48, value=12)
+        modos = {"Filtrar novos meses (parâmetros fixos)": MODO_FILTRO,
+                 "Reajuste com warm start": MODO_WARM,
+                 "Reajuste completo": MODO_COMPLETO}
+        update_mode = modos[st.selectbox("Atualização quando chegam novos meses", list(modos))]
+        check_drift = st.checkbox("Comparar com reajuste completo", value=False)
+        auto_order = st.checkbox("Selecionar ordem automaticamente", value=False)
+        run_backtest = st.checkbox("Avaliar erro (backtest)", value=False)
         process_button = st.button("Processar")
 
 if uploaded_file is not None and process_button:
     try:
         ts_data = pd.Series(data.iloc[:,0].values, index=pd.date_range(
             start=period, periods=len(data), freq='M'))
-        decompose = seasonal_decompose(ts_data, model='additive')
-        pic_decompose = decompose.plot()
-        pic_decompose.set_size_inches(10,8)
+        # Figuras reduzidas à largura da tela e guardadas em cache (hash dos dados + parâmetros)
+        pic_decompose = grafico_decomposicao(ts_data, largura_px=1000, altura_px=800)
 
-        model = SARIMAX(ts_data, order=(2,0,0,), seasonal_order=(0,1,1,12))
-        model_fit = model.fit()
-        forecast = model_fit.forecast(steps=forecast_period)
+        # Reaproveita o ajuste da execução anterior quando a série só ganhou meses novos
+        if "previsor" not in st.session_state:
+            st.session_state.previsor = PrevisorIncremental(order=(2,0,0,), seasonal_order=(0,1,1,12))
+        previsor = st.session_state.previsor
+        if auto_order:
+            # Grade (p,d,q)(P,D,Q,12) ajustada em paralelo; o vencedor fica em cache
+            busca = buscar_ordem(ts_data, gerar_candidatos(p=range(3), d=range(2), q=range(2),
+                                                           P=range(2), D=range(2), Q=range(2), s=12))
+            previsor = PrevisorIncremental(*busca.melhor)
+            previsor.adotar(ts_data, busca.resultado)
+            st.session_state.previsor = previsor
+            st.sidebar.success(f"Ordem escolhida: {busca.melhor[0]}x{busca.melhor[1]} ({busca.tempo_s:.2f} s)")
+        else:
+            previsor.sincronizar(ts_data, modo=update_mode)
+        forecast = previsor.forecast(steps=forecast_period)
 
-        pic_forecast, ax = plt.subplots(figsize=(10,5))
-        ax = ts_data.plot(ax=ax)
-        forecast.plot(ax=ax, style='r--')
+        pic_forecast = grafico_previsao(ts_data, forecast, largura_px=1000, altura_px=500)
 
         col1, col2, col3 = st.columns([3,3,2])
         with col1:
             st.write("Decomposição")
-            st.pyplot(pic_decompose)
+            st.image(pic_decompose, use_container_width=True)
         with col2:
             st.write("Previsão")
-            st.pyplot(pic_forecast)
+            st.image(pic_forecast, use_container_width=True)
         with col3:
             st.write("Dados da Previsão")
-            st.dataframe(forecast)               
+            st.dataframe(forecast)
+            ultimo = previsor.historico[-1]
+            st.caption(f"Atualização: {ultimo['modo']} ({ultimo['observacoes']} obs.) em {ultimo['tempo_s']} s")
+            if check_drift:
+                drift = previsor.deriva_vs_completo(forecast_period)
+                st.write("Deriva vs. reajuste completo")
+                st.dataframe(pd.Series(drift, name="deriva"))
+
+        if run_backtest:
+            # Janela expansível, mínimo de 3 anos de treino
+            bt = backtest(ts_data, order=previsor.order, seasonal_order=previsor.seasonal_order,
+                          horizonte=forecast_period, min_treino=36)
+            st.write("Erro de previsão por horizonte (backtest rolling-origin)")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.dataframe(bt.por_horizonte())
+            with col2:
+                st.dataframe(bt.folds[["fold", "n_treino", "warm_start", "convergiu", "tempo_s"]])
+            st.caption(f"{len(bt.folds)} folds em {bt.tempo_total:.2f} s")
     
     except Exception as ex:
-        st.error(f"Erro ao processar os dados!: {ex}")
\ No newline at end of file
+        st.error(f"Erro ao processar os dados!: {ex}")
+
+# Depois da primeira pintura, adianta em segundo plano o que o botão Processar vai usar
+concluir(relatorio_inicio, precarregar=["statsmodels.tsa.statespace.sarimax", "statsmodels.tsa.seasonal",
+                                        "pyarrow.csv", pyplot])
\ No newline at end of file
@@ -1,19 +1,85 @@
 import streamlit as st
+from pathlib import Path
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("04_Falha", importar=["numpy", "pandas", "utils.graficos", "utils.frota_falhas"])
+
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.stats import poisson
+import pandas as pd
+# scipy.stats e matplotlib só são importados depois do clique em Processar
+from utils.graficos import pyplot
+from utils.frota_falhas import (CacheLambda, probabilidades_em_blocos, monte_carlo_frota,
+                                resumo_monte_carlo, COL_ATIVO, COL_TAXA, COL_HORIZONTE)
 
 st.set_page_config(page_title="Probabilidade de Falhas em Equipamentos", layout="wide")
 
 st.title("Probabilidade de Falhas em Equipamentos")
 
+@st.cache_resource
+def lambda_cache(k_max):
+    return CacheLambda(k_max)
+
 with st.sidebar:
     st.header("Principal")
+    mode = st.radio("Modo:", options=["Equipamento único", "Frota (tabela de ativos)"])
     type = st.radio("Selecione o tipo de cálculo:", options=["Exata", "Menos que", "Mais que"])
-    occ = st.number_input("Ocorrência Atual", min_value=1, max_value=99, value=2)
+    if mode == "Equipamento único":
+        occ = st.number_input("Ocorrência Atual", min_value=1, max_value=99, value=2)
+    else:
+        st.header("Frota")
+        assets_file = st.file_uploader(f"Tabela de ativos ({COL_ATIVO};{COL_TAXA};{COL_HORIZONTE})", type=["csv"])
+        k = st.number_input("Número de falhas (k)", min_value=0, max_value=500, value=2)
+        n_sim = st.number_input("Simulações Monte Carlo", min_value=0, max_value=1_000_000, value=100_000, step=10_000)
+        seed = st.number_input("Semente", min_value=0, value=42)
     process = st.button("Processar")
 
-if process:
+if process and mode != "Equipamento único":
+    if assets_file is None:
+        st.warning("Envie a tabela de ativos.")
+        st.stop()
+    plt = pyplot()
+    assets = pd.read_csv(assets_file, sep=None, engine="python")
+    column = {"Exata": "exata", "Menos que": "no_maximo", "Mais que": "mais_que"}[type]
+
+    # Resultados transmitidos em blocos para a tabela; ela é redesenhada nos blocos 1, 2, 4, 8...
+    # (o custo total das concatenações fica linear no número de ativos)
+    st.subheader(f"Probabilidades por ativo (k = {k})")
+    table = st.empty()
+    parts = []
+    for part in probabilidades_em_blocos(assets, int(k), cache=lambda_cache(max(int(k), 50))):
+        parts.append(part)
+        if len(parts) & (len(parts) - 1) == 0:
+            table.dataframe(pd.concat(parts, ignore_index=True), use_container_width=True)
+    result = pd.concat(parts, ignore_index=True)
+    table.dataframe(result, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        pic, ax = plt.subplots()
+        ax.hist(result[column], bins=30, color="gray")
+        ax.set_title(f"Distribuição de P({column}) na frota")
+        ax.set_xlabel("Probabilidade")
+        ax.set_ylabel("Ativos")
+        plt.tight_layout()
+        st.pyplot(pic)
+    with col2:
+        if n_sim:
+            totals = monte_carlo_frota(assets, n_sim=int(n_sim), seed=int(seed))
+            pic, ax = plt.subplots()
+            ax.hist(totals, bins=50, color="steelblue")
+            ax.set_title("Total de falhas da frota (Monte Carlo)")
+            ax.set_xlabel("Falhas")
+            plt.tight_layout()
+            st.pyplot(pic)
+            st.dataframe(pd.Series(resumo_monte_carlo(totals), name="total de falhas"))
+
+elif process:
+    from scipy.stats import poisson
+    plt = pyplot()
     lamb = occ
     start = lamb - 2
     end = lamb + 2
@@ -38,5 +104,8 @@ if process:
     plt.xticks(rotation=45, ha="right")
     plt.tight_layout()
     st.pyplot(pic)
+
+# Depois da primeira pintura, adianta em segundo plano o que o botão Processar vai usar
+concluir(relatorio_inicio, precarregar=["scipy.stats", pyplot])
     
 #https://appdataanalysistravel.streamlit.app/
\ No newline at end of file
@@ -0,0 +1,92 @@
+import streamlit as st
+from pathlib import Path
+import os
+import sys
+
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.inicializacao import iniciar, concluir
+relatorio_inicio = iniciar("previsao_paises", importar=["pandas", "utils.graficos", "utils.previsao_lote",
+                                                        "utils.backtest"])
+
+import pandas as pd
+# statsmodels e matplotlib só são importados quando o lote roda
+from utils.graficos import pyplot
+from utils.previsao_lote import COLUNAS_WLD, carregar_wld, prever_lote, salvar_lote
+from utils.backtest import backtest_paises
+
+CSV_WLD = Path(__file__).resolve().parent / "WLD_RTFP_country_2023-10-02.csv"
+
+st.set_page_config(page_title="Previsão em Lote por País", layout="wide")
+st.title("🌍 Previsão em Lote - Preços de Alimentos por País (WLD RTFP)")
+
+
+@st.cache_data
+def load_data():
+    return carregar_wld(CSV_WLD)
+
+
+df = load_data()
+paises = sorted(df["ISO3"].unique())
+
+with st.sidebar:
+    st.header("Configurações")
+    coluna = st.selectbox("Série", COLUNAS_WLD, index=COLUNAS_WLD.index("Close"))
+    selecionados = st.multiselect("Países (vazio = todos)", paises)
+    p = st.number_input("p", min_value=0, max_value=3, value=1)
+    d = st.number_input("d", min_value=0, max_value=2, value=1)
+    q = st.number_input("q", min_value=0, max_value=3, value=1)
+    passos = st.number_input("Meses para previsão", min_value=1, max_value=24, value=6)
+    workers = st.number_input("Processos", min_value=1, max_value=os.cpu_count() or 1,
+                              value=os.cpu_count() or 1)
+    pasta_saida = st.text_input("Pasta de saída (Parquet)", value="saida_lote")
+    process = st.button("Processar")
+    run_backtest = st.button("Backtest de todos os países")
+
+if process:
+    with st.spinner("Ajustando modelos..."):
+        previsoes, resumo, tempo_total = prever_lote(
+            df, coluna=coluna, order=(p, d, q), passos=passos,
+            workers=workers, paises=selecionados or None)
+        salvar_lote(previsoes, resumo, pasta_saida)
+
+    soma = resumo["tempo_s"].sum()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Países", len(resumo))
+    col2.metric("Tempo total (s)", f"{tempo_total:.2f}")
+    col3.metric("Soma dos ajustes / tempo total", f"{soma / tempo_total:.1f}x" if tempo_total else "-")
+
+    # Tabela ordenável (clique no cabeçalho da coluna)
+    st.write("### Resumo por país")
+    st.dataframe(resumo, use_container_width=True)
+    st.caption(f"Previsões gravadas em {os.path.abspath(pasta_saida)}")
+
+    ok = resumo.dropna(subset=["variacao_%"]) if "variacao_%" in resumo else resumo.iloc[0:0]
+    if len(ok):
+        plt = pyplot()
+        fig, ax = plt.subplots(figsize=(12, 4))
+        ok = ok.sort_values("variacao_%")
+        ax.bar(ok["ISO3"], ok["variacao_%"], color="tab:blue")
+        ax.set_ylabel("Variação prevista (%)")
+        ax.set_title(f"Variação de {coluna} em {passos} meses")
+        plt.xticks(rotation=45)
+        plt.tight_layout()
+        st.pyplot(fig)
+
+    with st.expander("Previsões (formato longo)"):
+        st.dataframe(previsoes, use_container_width=True)
+elif run_backtest:
+    with st.spinner("Executando backtest..."):
+        tabela = backtest_paises(df[df["ISO3"].isin(selecionados)] if selecionados else df,
+                                 coluna=coluna, workers=workers, order=(p, d, q),
+                                 horizonte=passos, min_treino=36, passo=3)
+    st.write("### Erro por país e horizonte")
+    st.dataframe(tabela, use_container_width=True)
+    if "mae" in tabela:
+        st.dataframe(tabela.groupby("horizonte")[["mae", "mape_%"]].mean(), use_container_width=True)
+else:
+    st.info("Escolha a série e os países na barra lateral e clique em 'Processar'.")
+
+# Depois da primeira pintura, adianta em segundo plano o que o lote vai usar
+concluir(relatorio_inicio, precarregar=["statsmodels.tsa.statespace.sarimax", pyplot])
@@ -0,0 +1 @@
+# Módulos compartilhados pelas aplicações Streamlit (séries temporais, gráficos, dados)
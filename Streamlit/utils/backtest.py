@@ -0,0 +1,177 @@
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def gerar_folds(n, horizonte, min_treino, passo=1, janela=None):
+    """Origens do rolling-origin: lista de (inicio, fim) do treino.
+
+    Com ``janela=None`` a janela é expansível (o treino sempre começa em 0);
+    caso contrário ela desliza com tamanho fixo ``janela``.
+    """
+    tamanho_min = janela or min_treino
+    folds = []
+    for fim in range(tamanho_min, n - horizonte + 1, passo):
+        inicio = 0 if janela is None else fim - janela
+        folds.append((inicio, fim))
+    return folds
+
+
+def _blocos(folds, workers):
+    """Divide os folds em blocos contíguos, um por processo, para aproveitar o warm start"""
+    n_blocos = max(1, min(workers, len(folds)))
+    return [list(b) for b in np.array_split(np.arange(len(folds)), n_blocos) if len(b)]
+
+
+def _executar_bloco(args):
+    """Ajusta folds vizinhos em sequência, cada um partindo dos parâmetros do anterior"""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    valores, folds, indices, order, seasonal_order, horizonte, maxiter = args
+    linhas, erros = [], []
+    params = None
+    for i in indices:
+        inicio_treino, fim = folds[i]
+        treino = valores[inicio_treino:fim]
+        real = valores[fim:fim + horizonte]
+        t0 = time.perf_counter()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model = SARIMAX(treino, order=order, seasonal_order=seasonal_order)
+                res = model.fit(start_params=params, maxiter=maxiter, disp=False)
+            prev = np.asarray(res.forecast(steps=horizonte))
+            warm = params is not None
+            params = res.params
+            convergiu = bool(res.mle_retvals.get("converged", False))
+            erro = None
+        except Exception as e:
+            prev = np.full(horizonte, np.nan)
+            warm, convergiu, erro = params is not None, False, str(e)
+            params = None
+        linhas.append({"fold": i, "inicio": inicio_treino, "fim_treino": fim, "n_treino": fim - inicio_treino,
+                       "warm_start": warm, "convergiu": convergiu,
+                       "tempo_s": round(time.perf_counter() - t0, 4), "erro": erro})
+        for h, (p, r) in enumerate(zip(prev, real), start=1):
+            erros.append({"fold": i, "horizonte": h, "real": r, "previsto": p})
+    return linhas, erros
+
+
+class Backtest:
+    """Resultado de um backtest: tempos por fold e erros por horizonte"""
+
+    def __init__(self, folds, erros, tempo_total):
+        self.folds = folds
+        self.erros = erros
+        self.tempo_total = tempo_total
+
+    def por_horizonte(self):
+        e = self.erros.dropna(subset=["previsto"])
+        abs_err = (e["previsto"] - e["real"]).abs()
+        ape = abs_err / e["real"].abs().where(e["real"] != 0)
+        tabela = pd.DataFrame({"horizonte": e["horizonte"], "mae": abs_err, "mape_%": ape * 100})
+        return tabela.groupby("horizonte").mean().round(4)
+
+    def resumo(self):
+        tabela = self.por_horizonte()
+        return {"mae": float(tabela["mae"].mean()), "mape_%": float(tabela["mape_%"].mean()),
+                "folds": len(self.folds), "tempo_s": round(self.tempo_total, 3)}
+
+
+def backtest(serie, order=(1, 1, 1), seasonal_order=(0, 0, 0, 0), horizonte=6,
+             min_treino=24, passo=1, janela=None, workers=None, maxiter=50):
+    """Avaliação rolling-origin de um ARIMA/SARIMAX com folds em paralelo"""
+    valores = np.asarray(serie, dtype=float)
+    folds = gerar_folds(len(valores), horizonte, min_treino, passo, janela)
+    if not folds:
+        raise ValueError("Série curta demais para o treino mínimo e o horizonte escolhidos.")
+    workers = workers or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    tarefas = [(valores, folds, b, order, seasonal_order, horizonte, maxiter)
+               for b in _blocos(folds, workers)]
+    if len(tarefas) == 1:
+        saidas = [_executar_bloco(tarefas[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=len(tarefas)) as pool:
+            saidas = list(pool.map(_executar_bloco, tarefas))
+
+    linhas = [l for s in saidas for l in s[0]]
+    erros = [e for s in saidas for e in s[1]]
+    return Backtest(pd.DataFrame(linhas).sort_values("fold").reset_index(drop=True),
+                    pd.DataFrame(erros), time.perf_counter() - inicio)
+
+
+COLUNAS_RESUMO = ["janela", "mae", "mape_%", "folds", "tempo_s"]
+
+
+def comparar_janelas(serie, janelas, horizonte=6, workers=None, **kwargs):
+    """Backtest com janela deslizante para cada tamanho de treino candidato (ex.: meses_treino).
+
+    Janelas que não cabem na série são puladas; se nenhuma couber, a tabela volta vazia.
+    """
+    linhas = []
+    for janela in janelas:
+        if janela + horizonte >= len(serie):
+            continue
+        bt = backtest(serie, horizonte=horizonte, janela=janela, workers=workers, **kwargs)
+        linhas.append(dict(janela=janela, **bt.resumo()))
+    if not linhas:
+        return pd.DataFrame(columns=COLUNAS_RESUMO)
+    return pd.DataFrame(linhas, columns=COLUNAS_RESUMO).sort_values("mae").reset_index(drop=True)
+
+
+def preencher_lacunas(valores, max_lacuna=3):
+    """Corta os NaN do início e do fim e interpola as lacunas internas de até ``max_lacuna`` meses.
+
+    Lacunas maiores levantam ValueError: remover os NaN do meio juntaria meses que
+    não são vizinhos e deslocaria a sazonalidade e o horizonte.
+    """
+    valores = np.asarray(valores, dtype=float)
+    observados = np.flatnonzero(~np.isnan(valores))
+    if not len(observados):
+        raise ValueError("série sem observações")
+    valores = valores[observados[0]:observados[-1] + 1].copy()
+    faltantes = np.isnan(valores)
+    if faltantes.any():
+        bordas = np.diff(np.concatenate(([0], faltantes.astype(np.int8), [0])))
+        maior = int((np.flatnonzero(bordas == -1) - np.flatnonzero(bordas == 1)).max())
+        if maior > max_lacuna:
+            raise ValueError(f"lacuna interna de {maior} meses (máximo {max_lacuna})")
+        x = np.arange(len(valores))
+        valores[faltantes] = np.interp(x[faltantes], x[~faltantes], valores[~faltantes])
+    return valores
+
+
+def _backtest_pais(args):
+    iso3, valores, kwargs = args
+    max_lacuna = kwargs.pop("max_lacuna", 3)
+    try:
+        valores = preencher_lacunas(valores, max_lacuna)
+        bt = backtest(valores, workers=1, **kwargs)
+        tabela = bt.por_horizonte().reset_index()
+        tabela.insert(0, "ISO3", iso3)
+        tabela["tempo_s"] = round(bt.tempo_total, 3)
+        return tabela
+    except Exception as e:
+        return pd.DataFrame([{"ISO3": iso3, "erro": str(e)}])
+
+
+def backtest_paises(df, coluna="Close", workers=None, **kwargs):
+    """Backtest de todos os países da tabela WLD; cada país roda inteiro em um processo.
+
+    Cada série é posta em grade mensal (meses ausentes viram NaN) antes do backtest;
+    países com lacuna interna maior que ``max_lacuna`` meses saem com ``erro``.
+    """
+    tarefas = [(iso3, g.set_index("date")[coluna].resample("MS").mean().to_numpy(dtype=float), dict(kwargs))
+               for iso3, g in df.groupby("ISO3", observed=True)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        tabelas = [_backtest_pais(t) for t in tarefas]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tabelas = list(pool.map(_backtest_pais, tarefas))
+    return pd.concat(tabelas, ignore_index=True)
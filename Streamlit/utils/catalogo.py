@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+RAIZ = Path(__file__).resolve().parents[2]
+
+# Pasta das cópias em Arrow IPC (pode ser trocada pela variável de ambiente)
+PASTA_CACHE = Path(os.environ.get("LIA_CACHE_DADOS", RAIZ / ".cache_dados"))
+
+# Versão do formato do cache; mudar invalida todas as cópias
+VERSAO = 1
+
+# Conjuntos de dados conhecidos: caminho do CSV, opções do read_csv e colunas categóricas
+CATALOGO = {
+    "franquia": {
+        "csv": "Streamlit/01_Franquia/franquia_custos_iniciais.csv",
+        "opcoes": {"sep": ";"},
+        "categorias": [],
+    },
+    "veiculos": {
+        "csv": "Streamlit/02_Veículos/avaliacao_veiculo.csv",
+        "opcoes": {"sep": ";"},
+        "categorias": ["buying", "maint", "doors", "seats", "lug_boot", "safety", "evaluation"],
+    },
+    "dieta": {
+        "csv": "Entregas - Filipe Camello/Projeto Streamlit 08-10/Dieta/diet_recommendations_reduced.csv",
+        "opcoes": {},
+        # As colunas com vazios (Disease_Type, Allergies...) ficam como texto para o fillna do app
+        "categorias": ["Gender", "Severity", "Physical_Activity_Level", "Preferred_Cuisine",
+                       "Diet_Recommendation"],
+    },
+    "leite": {
+        "csv": "Streamlit/03_Leite/producao_mensal_leite_litros.csv",
+        "opcoes": {"header": None},
+        "categorias": [],
+    },
+    "wld_rtfp": {
+        "csv": "Streamlit/Inflação/WLD_RTFP_country_2023-10-02.csv",
+        "opcoes": {"parse_dates": ["date"]},
+        "categorias": ["country", "ISO3"],
+    },
+    "wld_detalhes": {
+        "csv": "Streamlit/Inflação/WLD_RTP_details_2023-10-02.csv",
+        "opcoes": {},
+        "categorias": [],
+    },
+}
+
+
+def _hash_arquivo(caminho, bloco=1 << 20):
+    h = hashlib.sha1()
+    with open(caminho, "rb") as f:
+        while True:
+            dados = f.read(bloco)
+            if not dados:
+                break
+            h.update(dados)
+    return h.hexdigest()
+
+
+def _aplicar_categorias(df, categorias, max_unicos=0.5):
+    """Converte colunas para category; com "auto", as colunas texto de baixa cardinalidade"""
+    if categorias == "auto":
+        categorias = [c for c in df.select_dtypes(include="object").columns
+                      if df[c].nunique(dropna=True) <= max_unicos * max(1, len(df))]
+    for col in categorias:
+        df[col] = df[col].astype("category")
+    return df
+
+
+def _caminhos(csv):
+    nome = hashlib.sha1(str(Path(csv).resolve()).encode()).hexdigest()[:12]
+    base = f"{Path(csv).stem}-{nome}"
+    return PASTA_CACHE / f"{base}.arrow", PASTA_CACHE / f"{base}.meta.json"
+
+
+def esta_atualizado(csv, opcoes=None, categorias=None):
+    """Confere se a cópia colunar corresponde ao CSV (mtime/tamanho, e hash se preciso)"""
+    arrow, meta = _caminhos(csv)
+    if not arrow.exists() or not meta.exists():
+        return False
+    info = json.loads(meta.read_text(encoding="utf-8"))
+    stat = os.stat(csv)
+    if info.get("versao") != VERSAO or info.get("opcoes") != _serializavel(opcoes) \
+            or info.get("categorias") != categorias:
+        return False
+    if info["mtime"] == stat.st_mtime and info["tamanho"] == stat.st_size:
+        return True
+    # mtime mudou (checkout, cópia...): só reconstrói se o conteúdo mudou de fato
+    if info["tamanho"] == stat.st_size and info["sha1"] == _hash_arquivo(csv):
+        info["mtime"] = stat.st_mtime
+        meta.write_text(json.dumps(info), encoding="utf-8")
+        return True
+    return False
+
+
+def _serializavel(opcoes):
+    return json.loads(json.dumps(opcoes or {}, default=str))
+
+
+def converter(csv, opcoes=None, categorias=None):
+    """Lê o CSV uma única vez e grava a cópia em Arrow IPC (sem compressão, para memory-map)"""
+    opcoes = opcoes or {}
+    df = pd.read_csv(csv, **opcoes)
+    df = _aplicar_categorias(df, categorias or [])
+    df.columns = [str(c) for c in df.columns]
+
+    arrow, meta = _caminhos(csv)
+    arrow.parent.mkdir(parents=True, exist_ok=True)
+    temporario = Path(f"{arrow}.tmp")
+    feather.write_feather(df, temporario, compression="uncompressed")
+    os.replace(temporario, arrow)
+
+    stat = os.stat(csv)
+    meta.write_text(json.dumps({
+        "versao": VERSAO,
+        "csv": str(Path(csv).resolve()),
+        "mtime": stat.st_mtime,
+        "tamanho": stat.st_size,
+        "sha1": _hash_arquivo(csv),
+        "opcoes": _serializavel(opcoes),
+        "categorias": categorias,
+    }), encoding="utf-8")
+    return arrow
+
+
+def carregar(csv, opcoes=None, categorias=None):
+    """DataFrame do CSV a partir da cópia colunar (reconvertida só quando o CSV muda)"""
+    if not esta_atualizado(csv, opcoes, categorias):
+        converter(csv, opcoes, categorias)
+    arrow, _ = _caminhos(csv)
+    # As colunas numéricas sem nulos ficam apontando para o arquivo mapeado (sem cópia)
+    fonte = pa.memory_map(str(arrow), "r")
+    tabela = pa.ipc.open_file(fonte).read_all()
+    df = tabela.to_pandas(split_blocks=True)
+    # O CSV sem cabeçalho tem colunas 0, 1, ...; o Arrow as guarda como texto
+    if opcoes and opcoes.get("header", "infer") is None:
+        df.columns = range(df.shape[1])
+    return df
+
+
+def carregar_dataset(nome):
+    """Carrega um dos conjuntos de dados registrados em CATALOGO"""
+    item = CATALOGO[nome]
+    return carregar(RAIZ / item["csv"], item["opcoes"], item["categorias"])
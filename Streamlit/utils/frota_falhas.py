@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Colunas esperadas na tabela de ativos
+COL_ATIVO = "ativo"
+COL_TAXA = "taxa"            # falhas esperadas por unidade de tempo
+COL_HORIZONTE = "horizonte"  # unidades de tempo avaliadas
+
+
+class CacheLambda:
+    """Guarda as linhas pmf/cdf/sf já calculadas para cada λ (até ``k_max``).
+
+    Frotas costumam ter muitos ativos com a mesma taxa e o mesmo horizonte, então
+    só os λ inéditos são calculados, todos de uma vez. O cache é LRU com no máximo
+    ``max_lambdas`` valores e pode ser compartilhado entre sessões (tem trava).
+    """
+
+    def __init__(self, k_max, max_lambdas=20_000):
+        self.k_max = k_max
+        self.max_lambdas = max_lambdas
+        self._linhas = OrderedDict()
+        self._trava = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def matrizes(self, lam):
+        """(pmf, cdf, sf) com uma linha por λ e colunas k = 0..k_max"""
+        lam = np.asarray(lam, dtype=float)
+        unicos, inverso = np.unique(lam, return_inverse=True)
+        with self._trava:
+            novos = np.array([l for l in unicos if l not in self._linhas])
+            self.misses += len(novos)
+            self.hits += len(unicos) - len(novos)
+            linhas = {}
+            if len(novos):
+                from scipy.stats import poisson
+                k = np.arange(self.k_max + 1)[None, :]
+                # sf calculada direto: 1 - cdf perde precisão justamente nas caudas pequenas
+                calculadas = zip(poisson.pmf(k, novos[:, None]), poisson.cdf(k, novos[:, None]),
+                                 poisson.sf(k, novos[:, None]))
+                linhas.update(zip(novos, calculadas))
+            for l in unicos:
+                if l not in linhas:
+                    self._linhas.move_to_end(l)
+                    linhas[l] = self._linhas[l]
+            self._linhas.update((l, linhas[l]) for l in novos)
+            while len(self._linhas) > self.max_lambdas:
+                self._linhas.popitem(last=False)
+        pmf_u, cdf_u, sf_u = (np.stack([linhas[l][i] for l in unicos]) for i in range(3))
+        return pmf_u[inverso], cdf_u[inverso], sf_u[inverso]
+
+
+def lambdas(ativos):
+    return ativos[COL_TAXA].to_numpy(dtype=float) * ativos[COL_HORIZONTE].to_numpy(dtype=float)
+
+
+def probabilidades(ativos, k, cache=None):
+    """Probabilidades exata / no máximo / mais que ``k`` falhas para cada ativo"""
+    lam = lambdas(ativos)
+    cache = cache or CacheLambda(k)
+    if cache.k_max < k:
+        raise ValueError("k maior que o k_max do cache")
+    pmf, cdf, sf = cache.matrizes(lam)
+    return pd.DataFrame({
+        COL_ATIVO: ativos[COL_ATIVO].to_numpy(),
+        "lambda": lam,
+        "exata": pmf[:, k],
+        "no_maximo": cdf[:, k],
+        "mais_que": sf[:, k],
+    })
+
+
+def probabilidades_em_blocos(ativos, k, tamanho_bloco=5000, cache=None):
+    """Gera os resultados em blocos, para a interface ir mostrando a tabela aos poucos"""
+    cache = cache or CacheLambda(k)
+    for inicio in range(0, len(ativos), tamanho_bloco):
+        yield probabilidades(ativos.iloc[inicio:inicio + tamanho_bloco], k, cache)
+
+
+def monte_carlo_frota(ativos, n_sim=100_000, seed=42, max_elementos=5_000_000):
+    """Simula o total de falhas da frota com um gerador NumPy semeado, em blocos.
+
+    Cada bloco sorteia no máximo ``max_elementos`` valores Poisson, então a memória
+    não cresce com ``n_sim``.
+    """
+    lam = lambdas(ativos)
+    rng = np.random.default_rng(seed)
+    bloco = max(1, max_elementos // max(1, len(lam)))
+    totais = np.empty(n_sim, dtype=np.int64)
+    for inicio in range(0, n_sim, bloco):
+        fim = min(n_sim, inicio + bloco)
+        totais[inicio:fim] = rng.poisson(lam, size=(fim - inicio, len(lam))).sum(axis=1)
+    return totais
+
+
+def resumo_monte_carlo(totais):
+    return {
+        "media": float(totais.mean()),
+        "desvio": float(totais.std()),
+        "p05": float(np.percentile(totais, 5)),
+        "p50": float(np.percentile(totais, 50)),
+        "p95": float(np.percentile(totais, 95)),
+    }
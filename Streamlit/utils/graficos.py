@@ -0,0 +1,156 @@
+import hashlib
+import io
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+DPI = 100
+
+
+def pyplot():
+    """matplotlib só é importado quando uma figura é desenhada de fato"""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def lttb(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: reduz (x, y) para ``n_out`` pontos preservando a forma.
+
+    Devolve os índices dos pontos escolhidos.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Os extremos entram sempre; o miolo é dividido em n_out - 2 baldes
+    limites = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = np.empty(n_out, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    anterior = 0
+    for i in range(n_out - 2):
+        ini, fim = limites[i], max(limites[i + 1], limites[i] + 1)
+        # Média do próximo balde (ou o último ponto)
+        prox_ini = fim
+        prox_fim = limites[i + 2] if i + 2 < len(limites) else n
+        mx = x[prox_ini:prox_fim].mean()
+        my = y[prox_ini:prox_fim].mean()
+        # Área do triângulo (anterior, candidato, média do próximo)
+        area = np.abs((x[anterior] - mx) * (y[ini:fim] - y[anterior])
+                      - (x[anterior] - x[ini:fim]) * (my - y[anterior]))
+        anterior = ini + int(np.nanargmax(area)) if np.isfinite(area).any() else ini
+        indices[i + 1] = anterior
+    return indices
+
+
+def minmax(y, n_baldes):
+    """Mantém o mínimo e o máximo de cada balde (2 * ``n_baldes`` pontos). Devolve índices."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * n_baldes >= n:
+        return np.arange(n)
+    limites = np.linspace(0, n, n_baldes + 1).astype(int)
+    indices = []
+    for ini, fim in zip(limites[:-1], limites[1:]):
+        trecho = y[ini:fim]
+        indices.extend(sorted({ini + int(np.nanargmin(trecho)), ini + int(np.nanargmax(trecho))}))
+    return np.array(indices)
+
+
+def reduzir(serie, largura_px, metodo="lttb"):
+    """Reduz uma Series para no máximo ~1 ponto por pixel de largura"""
+    if len(serie) <= largura_px:
+        return serie
+    if metodo == "minmax":
+        idx = minmax(serie.values, largura_px // 2)
+    else:
+        x = serie.index.asi8 if isinstance(serie.index, pd.DatetimeIndex) else np.arange(len(serie))
+        idx = lttb(x, serie.values, largura_px)
+    return serie.iloc[idx]
+
+
+def hash_dados(*objs):
+    """Hash do conteúdo das séries/arrays (valores e índice)"""
+    h = hashlib.sha1()
+    for obj in objs:
+        if isinstance(obj, (pd.Series, pd.DataFrame)):
+            h.update(pd.util.hash_pandas_object(obj, index=True).values.tobytes())
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+    return h.hexdigest()
+
+
+class CacheFiguras:
+    """Cache LRU de figuras já renderizadas (PNG), chaveado por hash dos dados + parâmetros"""
+
+    def __init__(self, max_itens=64):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def obter(self, chave, desenhar):
+        if chave in self._itens:
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            return self._itens[chave]
+        self.misses += 1
+        fig = desenhar()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", dpi=DPI)
+        pyplot().close(fig)
+        png = buffer.getvalue()
+        self._itens[chave] = png
+        if len(self._itens) > self.max_itens:
+            self._itens.popitem(last=False)
+        return png
+
+
+cache_figuras = CacheFiguras()
+
+
+def grafico_previsao(historico, previsao, largura_px=1000, altura_px=500, titulo=None,
+                     metodo="lttb", cache=cache_figuras):
+    """PNG do histórico (reduzido à largura em pixels) seguido da previsão"""
+    chave = ("previsao", hash_dados(historico, previsao), largura_px, altura_px, titulo, metodo)
+
+    def desenhar():
+        fig, ax = pyplot().subplots(figsize=(largura_px / DPI, altura_px / DPI))
+        reduzir(historico, largura_px, metodo).plot(ax=ax, label="Histórico")
+        reduzir(previsao, largura_px, metodo).plot(ax=ax, style="r--", label="Previsão")
+        if titulo:
+            ax.set_title(titulo)
+        ax.legend()
+        fig.tight_layout()
+        return fig
+
+    return cache.obter(chave, desenhar)
+
+
+def grafico_decomposicao(serie, largura_px=1000, altura_px=800, model="additive",
+                         metodo="lttb", cache=cache_figuras):
+    """PNG da decomposição sazonal em quatro painéis, com cada componente reduzido"""
+    chave = ("decomposicao", hash_dados(serie), largura_px, altura_px, model, metodo)
+
+    def desenhar():
+        from statsmodels.tsa.seasonal import seasonal_decompose
+        decomposicao = seasonal_decompose(serie, model=model)
+        componentes = [("Observado", decomposicao.observed), ("Tendência", decomposicao.trend),
+                       ("Sazonalidade", decomposicao.seasonal), ("Resíduo", decomposicao.resid)]
+        fig, axes = pyplot().subplots(4, 1, sharex=True, figsize=(largura_px / DPI, altura_px / DPI))
+        for ax, (nome, comp) in zip(axes, componentes):
+            comp = reduzir(comp.dropna(), largura_px, metodo)
+            if nome == "Resíduo":
+                ax.plot(comp.index, comp.values, marker="o", linestyle="none", markersize=2)
+                ax.axhline(0, color="gray", linewidth=0.8)
+            else:
+                ax.plot(comp.index, comp.values)
+            ax.set_ylabel(nome)
+        fig.tight_layout()
+        return fig
+
+    return cache.obter(chave, desenhar)
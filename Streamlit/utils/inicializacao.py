@@ -0,0 +1,119 @@
+"""Tempo de inicialização dos apps: importações por módulo, primeira pintura e pré-carga.
+
+No topo do app, antes dos demais imports:
+
+    from utils.inicializacao import iniciar, concluir
+    relatorio = iniciar("03_Leite", importar=["pandas", "utils.graficos"])
+    ... imports e corpo do app ...
+    concluir(relatorio, precarregar=["statsmodels.tsa.statespace.sarimax"])
+
+``iniciar`` importa explicitamente os módulos pesados listados e mede cada um
+(só na primeira execução do processo, que é a que importa de verdade; os
+``import`` seguintes do script já os encontram em ``sys.modules``) e ``concluir``
+registra o tempo até a primeira pintura e importa em segundo plano o que os
+botões vão precisar. O
+relatório vai para ``.cache_dados/inicializacao.jsonl`` e, com
+``LIA_RELATORIO_INICIO=1``, aparece também na barra lateral.
+
+Este módulo só usa a biblioteca padrão para não pesar na própria medição.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[2]
+ARQUIVO_RELATORIO = Path(os.environ.get("LIA_CACHE_DADOS", RAIZ / ".cache_dados")) / "inicializacao.jsonl"
+
+# Um relatório por app, criado na primeira execução do script no processo
+_relatorios = {}
+
+
+class RelatorioInicio:
+    def __init__(self, app):
+        self.app = app
+        self.inicio = time.perf_counter()
+        self.importacoes = {}
+        self.precarga = {}
+        self.primeira_pintura_s = None
+        self._precarga_iniciada = False
+
+    def importar(self, modulos):
+        """Importa e cronometra cada módulo que ainda não está em ``sys.modules``"""
+        for nome in modulos:
+            if nome in sys.modules:
+                continue
+            inicio = time.perf_counter()
+            importlib.import_module(nome)
+            self.importacoes[nome] = time.perf_counter() - inicio
+
+    def linhas(self):
+        """[(módulo, fase, ms)] do mais lento para o mais rápido"""
+        linhas = [(m, "script", t * 1000) for m, t in self.importacoes.items()]
+        linhas += [(m, "precarga", t * 1000) for m, t in self.precarga.items()]
+        return sorted(linhas, key=lambda l: l[2], reverse=True)
+
+    def _registrar(self):
+        ARQUIVO_RELATORIO.parent.mkdir(parents=True, exist_ok=True)
+        registro = {"app": self.app, "data": datetime.now().isoformat(timespec="seconds"),
+                    "primeira_pintura_ms": round(self.primeira_pintura_s * 1000, 1),
+                    "importacoes_ms": {m: round(t * 1000, 1) for m, t in self.importacoes.items()}}
+        with open(ARQUIVO_RELATORIO, "a", encoding="utf-8") as f:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+
+def iniciar(app, importar=()):
+    """Começa a medir a inicialização e importa ``importar`` cronometrando cada módulo.
+
+    Nas execuções seguintes do script devolve o mesmo relatório sem medir nada.
+    """
+    if app not in _relatorios:
+        relatorio = RelatorioInicio(app)
+        relatorio.importar(importar)
+        _relatorios[app] = relatorio
+    return _relatorios[app]
+
+
+def _precarregar(relatorio, itens):
+    for item in itens:
+        inicio = time.perf_counter()
+        try:
+            if callable(item):
+                item()
+                nome = getattr(item, "__name__", repr(item))
+            else:
+                importlib.import_module(item)
+                nome = item
+        except Exception as e:
+            print(f"Pré-carga de {item!r} falhou: {e}")
+            continue
+        relatorio.precarga[nome] = time.perf_counter() - inicio
+
+
+def concluir(relatorio, precarregar=()):
+    """Chamar no fim do script: fecha a medição e dispara a pré-carga em segundo plano.
+
+    ``precarregar`` aceita nomes de módulos e funções sem argumentos (ex.: leitura
+    de um dataset do catálogo); roda uma única vez por processo.
+    """
+    if relatorio.primeira_pintura_s is None:
+        relatorio.primeira_pintura_s = time.perf_counter() - relatorio.inicio
+        try:
+            relatorio._registrar()
+        except OSError:
+            pass
+
+    if precarregar and not relatorio._precarga_iniciada:
+        relatorio._precarga_iniciada = True
+        threading.Thread(target=_precarregar, args=(relatorio, list(precarregar)),
+                         name="precarga", daemon=True).start()
+
+    if os.environ.get("LIA_RELATORIO_INICIO") == "1":
+        import streamlit as st
+        with st.sidebar.expander("⏱️ Inicialização"):
+            st.write(f"Primeira pintura: {relatorio.primeira_pintura_s * 1000:.0f} ms")
+            st.table([{"módulo": m, "fase": f, "ms": round(ms, 1)} for m, f, ms in relatorio.linhas()])
@@ -0,0 +1,99 @@
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from .catalogo import carregar
+
+COLUNAS_WLD = ["Open", "High", "Low", "Close", "Inflation"]
+
+
+def carregar_wld(caminho):
+    """Lê a tabela longa do WLD_RTFP (uma linha por país/mês) a partir do cache colunar"""
+    df = carregar(caminho, {"parse_dates": ["date"]}, ["country", "ISO3"])
+    return df.sort_values(["ISO3", "date"]).reset_index(drop=True)
+
+
+def _prever_pais(args):
+    """Ajusta e prevê a série de um país (executado nos processos do pool)"""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    iso3, datas, valores, order, seasonal_order, passos = args
+    inicio = time.perf_counter()
+    serie = pd.Series(valores, index=pd.DatetimeIndex(datas)).dropna()
+    resumo = {"ISO3": iso3, "n_obs": len(serie), "aic": np.nan, "erro": None}
+    previsao = None
+    try:
+        if len(serie) < 12:
+            raise ValueError("série com menos de 12 observações")
+        serie = serie.asfreq("MS")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            res = SARIMAX(serie, order=order, seasonal_order=seasonal_order).fit(disp=False)
+        fc = res.forecast(steps=passos)
+        previsao = pd.DataFrame({"ISO3": iso3, "date": fc.index, "passo": np.arange(1, passos + 1),
+                                 "previsao": fc.values})
+        resumo.update({
+            "ultimo_valor": float(serie.iloc[-1]),
+            "previsao_final": float(fc.iloc[-1]),
+            "variacao_%": float((fc.iloc[-1] / serie.iloc[-1] - 1) * 100) if serie.iloc[-1] else np.nan,
+            "aic": float(res.aic),
+        })
+    except Exception as e:
+        resumo["erro"] = str(e)
+    resumo["tempo_s"] = round(time.perf_counter() - inicio, 4)
+    resumo["pid"] = os.getpid()
+    return resumo, previsao
+
+
+def prever_lote(df, coluna="Close", order=(1, 1, 1), seasonal_order=(0, 0, 0, 0),
+                passos=6, workers=None, paises=None):
+    """Agrupa a tabela longa por ISO3 e ajusta cada país em paralelo.
+
+    Devolve (previsoes, resumo, tempo_total_s): ``previsoes`` em formato longo
+    (ISO3, date, passo, previsao) e ``resumo`` com uma linha por país, incluindo
+    o tempo de ajuste e o processo que o executou.
+    """
+    if coluna not in df.columns:
+        raise ValueError(f"Coluna inexistente: {coluna}")
+    if paises is not None:
+        df = df[df["ISO3"].isin(paises)]
+
+    tarefas = [(iso3, g["date"].values, g[coluna].values.astype(float), order, seasonal_order, passos)
+               for iso3, g in df.groupby("ISO3", sort=True, observed=True)]
+    nomes = df.drop_duplicates("ISO3").set_index("ISO3")["country"]
+
+    inicio = time.perf_counter()
+    resumos, previsoes = [], []
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        saidas = map(_prever_pais, tarefas)
+    else:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        saidas = (f.result() for f in as_completed([pool.submit(_prever_pais, t) for t in tarefas]))
+    try:
+        for resumo, previsao in saidas:
+            resumos.append(resumo)
+            if previsao is not None:
+                previsoes.append(previsao)
+    finally:
+        if workers > 1:
+            pool.shutdown()
+    tempo_total = time.perf_counter() - inicio
+
+    resumo = pd.DataFrame(resumos)
+    resumo.insert(1, "country", resumo["ISO3"].map(nomes))
+    resumo = resumo.sort_values("ISO3").reset_index(drop=True)
+    previsoes = (pd.concat(previsoes, ignore_index=True) if previsoes
+                 else pd.DataFrame(columns=["ISO3", "date", "passo", "previsao"]))
+    previsoes["coluna"] = coluna
+    return previsoes, resumo, tempo_total
+
+
+def salvar_lote(previsoes, resumo, pasta):
+    """Grava previsões e resumo (com tempos por país) em Parquet"""
+    os.makedirs(pasta, exist_ok=True)
+    previsoes.to_parquet(os.path.join(pasta, "previsoes.parquet"), index=False)
+    resumo.to_parquet(os.path.join(pasta, "resumo.parquet"), index=False)
@@ -0,0 +1,120 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+# Modos de atualização quando a série ganha novos meses
+MODO_COMPLETO = "completo"   # reajusta o modelo do zero
+MODO_FILTRO = "filtro"       # filtra as novas observações com parâmetros congelados
+MODO_WARM = "warm"           # reajusta partindo dos parâmetros anteriores
+
+MODOS = (MODO_COMPLETO, MODO_FILTRO, MODO_WARM)
+
+
+def ajustar(serie, order, seasonal_order, start_params=None, maxiter=50):
+    """Ajusta um SARIMAX completo sobre a série"""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    model = SARIMAX(serie, order=order, seasonal_order=seasonal_order)
+    return model.fit(start_params=start_params, maxiter=maxiter, disp=False)
+
+
+def deriva(resultado, referencia, passos):
+    """Compara as previsões de dois ajustes e devolve o quanto elas se afastam"""
+    prev = np.asarray(resultado.forecast(steps=passos))
+    ref = np.asarray(referencia.forecast(steps=passos))
+    diff = np.abs(prev - ref)
+    escala = np.maximum(np.abs(ref), 1e-9)
+    return {
+        "mae": float(diff.mean()),
+        "max": float(diff.max()),
+        "mape_%": float((diff / escala).mean() * 100),
+    }
+
+
+class PrevisorIncremental:
+    """Mantém um SARIMAX ajustado e o atualiza conforme chegam novos meses.
+
+    No modo ``filtro`` apenas as novas observações passam pelo filtro de Kalman
+    (``extend``), então o custo da atualização não depende do tamanho do histórico.
+    No modo ``warm`` o modelo é reajustado sobre a série inteira, mas a otimização
+    parte dos parâmetros anteriores e converge em poucas iterações.
+    """
+
+    def __init__(self, order=(2, 0, 0), seasonal_order=(0, 1, 1, 12), maxiter_warm=10):
+        self.order = order
+        self.seasonal_order = seasonal_order
+        self.maxiter_warm = maxiter_warm
+        self.serie = None
+        self.resultado = None
+        self.historico = []
+
+    def ajustar(self, serie):
+        inicio = time.perf_counter()
+        self.serie = serie
+        self.resultado = ajustar(serie, self.order, self.seasonal_order)
+        self._registrar(MODO_COMPLETO, len(serie), inicio)
+        return self.resultado
+
+    def adotar(self, serie, resultado):
+        """Passa a usar um ajuste já feito fora (ex.: vencedor da busca de ordem)"""
+        self.serie = serie
+        self.resultado = resultado
+        self.historico.append({"modo": "adotado", "observacoes": len(serie),
+                               "tamanho_serie": len(serie), "tempo_s": 0.0})
+        return self.resultado
+
+    def atualizar(self, novos, modo=MODO_FILTRO):
+        """Acrescenta ``novos`` (Series com índice de datas contínuo) ao ajuste atual"""
+        if self.resultado is None:
+            raise ValueError("Nenhum modelo ajustado. Chame ajustar() primeiro.")
+        if modo not in MODOS:
+            raise ValueError(f"Modo inválido: {modo}")
+        if len(novos) == 0:
+            return self.resultado
+
+        inicio = time.perf_counter()
+        serie_total = pd.concat([self.serie, novos])
+
+        if modo == MODO_FILTRO:
+            self.resultado = self.resultado.extend(novos)
+        elif modo == MODO_WARM:
+            self.resultado = ajustar(serie_total, self.order, self.seasonal_order,
+                                     start_params=self.resultado.params,
+                                     maxiter=self.maxiter_warm)
+        else:
+            self.resultado = ajustar(serie_total, self.order, self.seasonal_order)
+
+        self.serie = serie_total
+        self._registrar(modo, len(novos), inicio)
+        return self.resultado
+
+    def sincronizar(self, serie, modo=MODO_FILTRO):
+        """Atualiza a partir da série completa recebida, aproveitando o ajuste anterior.
+
+        Se a série nova não for uma continuação da atual, faz um ajuste completo.
+        """
+        if self.serie is None or not self._e_continuacao(serie):
+            return self.ajustar(serie)
+        return self.atualizar(serie.iloc[len(self.serie):], modo=modo)
+
+    def deriva_vs_completo(self, passos):
+        """Reajusta do zero e mede a diferença das previsões em relação ao estado atual"""
+        referencia = ajustar(self.serie, self.order, self.seasonal_order)
+        return deriva(self.resultado, referencia, passos)
+
+    def forecast(self, steps):
+        return self.resultado.forecast(steps=steps)
+
+    def _e_continuacao(self, serie):
+        n = len(self.serie)
+        if len(serie) < n or not serie.index[:n].equals(self.serie.index):
+            return False
+        return np.allclose(serie.values[:n], self.serie.values, equal_nan=True)
+
+    def _registrar(self, modo, n_obs, inicio):
+        self.historico.append({
+            "modo": modo,
+            "observacoes": n_obs,
+            "tamanho_serie": len(self.serie),
+            "tempo_s": round(time.perf_counter() - inicio, 4),
+        })
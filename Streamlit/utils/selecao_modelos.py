@@ -0,0 +1,466 @@
+"""Seleção de hiperparâmetros dos modelos tabulares (dieta, veículos, Student Performance).
+
+Em vez de um único split 70/30 com uma configuração fixa:
+
+1. Os atributos são codificados (OrdinalEncoder) e os folds do K-fold sorteados
+   uma única vez; tudo fica em ``.cache_dados/selecao/`` em arquivos ``.npy``
+   que os processos abrem por memory-map. A chave é o hash do conteúdo dos
+   dados, então rodar de novo com os mesmos dados não recodifica nada.
+2. Successive halving: todos os candidatos começam com uma fração pequena das
+   linhas de treino de cada fold; a cada rodada só o melhor 1/``eta`` segue, com
+   ``eta`` vezes mais linhas. Só os finalistas treinam com o fold inteiro.
+3. Cada par (candidato, fold) de uma rodada é uma tarefa do ProcessPoolExecutor.
+4. O vencedor é reajustado com todos os dados e salvo em ``modelos/<nome>.joblib``
+   (modelo + encoder), com ranking e tempos em ``modelos/<nome>.json``.
+
+    cd Streamlit
+    python -m utils.selecao_modelos dieta veiculos
+    python -m utils.selecao_modelos student --csv-student caminho/student_performance.csv
+
+Os apps leem só os hiperparâmetros escolhidos, sem depender do artefato existir:
+
+    params = parametros_escolhidos("dieta")
+    model = RandomForestClassifier(**{"n_estimators": 100, **params}, random_state=42)
+"""
+import argparse
+import hashlib
+import importlib
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .catalogo import PASTA_CACHE, RAIZ, carregar_dataset
+
+PASTA_MODELOS = Path(os.environ.get("LIA_MODELOS", RAIZ / "modelos"))
+
+# Versão do formato do cache de atributos/folds; mudar invalida as cópias
+VERSAO = 1
+
+URL_STUDENT = ("https://github.com/FilipeCamello/lia1_2025_2/blob/main/"
+               "Aula%2012%20-%20Student%20Performance%20Dataset/student_performance.csv?raw=true")
+
+
+# ---------------------------------------------------------------- preparo dos dados
+
+def preparar_dieta(df):
+    """Mesmas colunas derivadas do dieta.py (IMC, categoria do IMC, restrição automática)"""
+    df = df.copy()
+    df['BMI'] = df['Weight_kg'] / ((df['Height_cm'] / 100) ** 2)
+    df['BMI_Category'] = pd.cut(df['BMI'], [-np.inf, 18.5, 25, 30, np.inf], right=False,
+                                labels=['Abaixo do Peso', 'Normal', 'Sobrepeso', 'Obesidade']).astype(str)
+    for col in ['Disease_Type', 'Dietary_Restrictions', 'Allergies']:
+        df[col] = df[col].astype(object).fillna('None')
+    df['Auto_Restriction'] = df['Disease_Type'].map(
+        {'Diabetes': 'Low_Sugar', 'Hypertension': 'Low_Sodium'}).fillna('None')
+    colunas = ['Gender', 'Disease_Type', 'Severity', 'Physical_Activity_Level',
+               'Auto_Restriction', 'Allergies', 'Preferred_Cuisine', 'BMI_Category']
+    return df[colunas], df['Diet_Recommendation'], colunas
+
+
+def preparar_veiculos(df):
+    """Todas as colunas são categóricas; alvo ``evaluation``"""
+    colunas = [c for c in df.columns if c != 'evaluation']
+    return df[colunas], df['evaluation'], colunas
+
+
+def preparar_student(df):
+    """Limpeza do notebook da Aula 12 (duplicatas + IQR) e alvo ``total_score``"""
+    if str(RAIZ) not in sys.path:
+        sys.path.append(str(RAIZ))
+    from limpeza_dados import fonte_dataframe, plano_student
+
+    df = df.drop(columns=['student_id'], errors='ignore')
+    df = plano_student().executar(fonte_dataframe(df))
+    X = df.drop(columns='total_score')
+    categoricas = list(X.select_dtypes(exclude='number').columns)
+    return X, df['total_score'], categoricas
+
+
+def carregar_student(csv=None):
+    return pd.read_csv(csv or os.environ.get("LIA_CSV_STUDENT") or URL_STUDENT)
+
+
+# ---------------------------------------------------------------- espaços de busca
+
+def grade(estimador, fixos=None, escalar=False, **valores):
+    """Candidatos do produto cartesiano de ``valores``; ``fixos`` pode ser função dos atributos codificados"""
+    nomes = list(valores)
+    return [{"estimador": estimador, "params": dict(zip(nomes, combinacao)),
+             "fixos": fixos if callable(fixos) else dict(fixos or {}), "escalar": escalar}
+            for combinacao in itertools.product(*(valores[n] for n in nomes))]
+
+
+def _categorias_nb(X):
+    """CategoricalNB precisa conhecer todas as categorias, mesmo as ausentes no treino do fold"""
+    return {"min_categories": (X.max(axis=0) + 1).astype(int)}
+
+
+ESPACOS = {
+    "dieta": {
+        "carregar": lambda opcoes: carregar_dataset("dieta"),
+        "preparar": preparar_dieta,
+        "tarefa": "classificacao",
+        "metrica": "accuracy",
+        "candidatos": grade("sklearn.ensemble.RandomForestClassifier",
+                            fixos={"random_state": 42, "n_jobs": 1},
+                            n_estimators=[50, 100, 200, 400], max_depth=[None, 8, 16],
+                            min_samples_leaf=[1, 3], max_features=["sqrt", 0.5]),
+    },
+    "veiculos": {
+        "carregar": lambda opcoes: carregar_dataset("veiculos"),
+        "preparar": preparar_veiculos,
+        "tarefa": "classificacao",
+        "metrica": "accuracy",
+        "candidatos": grade("sklearn.naive_bayes.CategoricalNB", fixos=_categorias_nb,
+                            alpha=[0.01, 0.1, 0.3, 1.0, 3.0, 10.0], fit_prior=[True, False]),
+    },
+    "student": {
+        "carregar": lambda opcoes: carregar_student(opcoes.get("csv_student")),
+        "preparar": preparar_student,
+        "tarefa": "regressao",
+        "metrica": "neg_mean_absolute_error",
+        "candidatos": (grade("sklearn.ensemble.RandomForestRegressor",
+                             fixos={"random_state": 42, "n_jobs": 1},
+                             n_estimators=[100, 300], max_depth=[None, 10], min_samples_leaf=[1, 5])
+                       + grade("sklearn.ensemble.HistGradientBoostingRegressor", fixos={"random_state": 42},
+                               learning_rate=[0.05, 0.1], max_leaf_nodes=[15, 31])
+                       # Equivalente em sklearn do MLP Keras do notebook (64-32-16, com StandardScaler)
+                       + grade("sklearn.neural_network.MLPRegressor",
+                               fixos={"random_state": 42, "max_iter": 500, "early_stopping": True},
+                               escalar=True,
+                               hidden_layer_sizes=[(64, 32, 16), (32, 16)], alpha=[1e-4, 1e-2])),
+    },
+}
+
+
+# ---------------------------------------------------------------- cache de atributos e folds
+
+def _hash_dados(X, y, n_folds, seed):
+    h = hashlib.sha1()
+    h.update(pd.util.hash_pandas_object(X, index=False).values.tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).values.tobytes())
+    h.update(json.dumps([list(map(str, X.columns)), str(y.name), n_folds, seed, VERSAO]).encode())
+    return h.hexdigest()
+
+
+class DadosCodificados:
+    """Atributos codificados, alvo e folds de um conjunto, guardados em .npy"""
+
+    def __init__(self, pasta):
+        self.pasta = Path(pasta)
+        self.meta = json.loads((self.pasta / "meta.json").read_text(encoding="utf-8"))
+
+    @property
+    def n_folds(self):
+        return self.meta["n_folds"]
+
+    def arrays(self, mmap_mode="r"):
+        return tuple(np.load(self.pasta / f"{nome}.npy", mmap_mode=mmap_mode)
+                     for nome in ("X", "y", "fold", "ordem"))
+
+    def encoder(self):
+        import joblib
+        return joblib.load(self.pasta / "encoder.joblib")
+
+
+def codificar(nome, X, y, categoricas, tarefa, n_folds=5, seed=42):
+    """Codifica e sorteia os folds uma vez; devolve (DadosCodificados, veio_do_cache)"""
+    chave = _hash_dados(X, y, n_folds, seed)
+    pasta = PASTA_CACHE / "selecao" / f"{nome}-{chave[:16]}"
+    if (pasta / "meta.json").exists():
+        return DadosCodificados(pasta), True
+
+    import joblib
+    from sklearn.compose import ColumnTransformer
+    from sklearn.model_selection import KFold, StratifiedKFold
+    from sklearn.preprocessing import OrdinalEncoder
+
+    X = X.reset_index(drop=True)
+    y = y.reset_index(drop=True)
+    numericas = [c for c in X.columns if c not in categoricas]
+    encoder = ColumnTransformer([("categoricas", OrdinalEncoder(), list(categoricas))],
+                                remainder="passthrough", verbose_feature_names_out=False)
+    encoder.fit(X)
+    X_cod = np.ascontiguousarray(encoder.transform(X), dtype=np.float64)
+
+    if tarefa == "classificacao":
+        y_cat = y.astype("category")
+        classes = [str(c) for c in y_cat.cat.categories]
+        y_cod = y_cat.cat.codes.to_numpy(np.int64)
+        divisor = StratifiedKFold(n_folds, shuffle=True, random_state=seed)
+    else:
+        classes = None
+        y_cod = y.to_numpy(np.float64)
+        divisor = KFold(n_folds, shuffle=True, random_state=seed)
+
+    fold = np.empty(len(X), dtype=np.int8)
+    for k, (_, teste) in enumerate(divisor.split(X_cod, y_cod)):
+        fold[teste] = k
+    # Ordem fixa das linhas: os subconjuntos do halving são prefixos dela (encaixados entre rodadas)
+    ordem = np.random.default_rng(seed).permutation(len(X))
+
+    temporaria = pasta.with_name(pasta.name + ".tmp")
+    temporaria.mkdir(parents=True, exist_ok=True)
+    for nome_array, valores in (("X", X_cod), ("y", y_cod), ("fold", fold), ("ordem", ordem)):
+        np.save(temporaria / f"{nome_array}.npy", valores)
+    joblib.dump(encoder, temporaria / "encoder.joblib")
+    (temporaria / "meta.json").write_text(json.dumps({
+        "versao": VERSAO, "nome": nome, "tarefa": tarefa, "n_folds": n_folds, "seed": seed,
+        "linhas": len(X), "colunas": [str(c) for c in X.columns], "categoricas": list(categoricas),
+        "numericas": numericas, "classes": classes,
+    }, ensure_ascii=False), encoding="utf-8")
+    os.replace(temporaria, pasta)
+    return DadosCodificados(pasta), False
+
+
+# ---------------------------------------------------------------- avaliação (processos do pool)
+
+# Arrays abertos por processo: cada worker mapeia os .npy uma única vez
+_abertos = {}
+
+
+def _construir(candidato, fixos=None):
+    modulo, _, classe = candidato["estimador"].rpartition(".")
+    estimador = getattr(importlib.import_module(modulo), classe)(**{**(fixos or {}), **candidato["params"]})
+    if candidato["escalar"]:
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+        return make_pipeline(StandardScaler(), estimador)
+    return estimador
+
+
+def _treino_do_fold(fold, ordem, k, n_amostras):
+    treino = ordem[fold[ordem] != k]
+    return treino if n_amostras is None else treino[:n_amostras]
+
+
+def _avaliar(tarefa):
+    """Ajusta um candidato em um fold (com até ``n_amostras`` linhas de treino) e pontua"""
+    import warnings
+    from sklearn.metrics import get_scorer
+
+    pasta, indice, candidato, fixos, k, n_amostras, metrica = tarefa
+    if pasta not in _abertos:
+        _abertos[pasta] = DadosCodificados(pasta).arrays()
+    X, y, fold, ordem = _abertos[pasta]
+
+    treino = _treino_do_fold(fold, ordem, k, n_amostras)
+    teste = np.flatnonzero(fold == k)
+    inicio = time.perf_counter()
+    try:
+        modelo = _construir(candidato, fixos)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            modelo.fit(X[treino], y[treino])
+            score = float(get_scorer(metrica)(modelo, X[teste], y[teste]))
+        erro = None
+    except Exception as e:
+        score, erro = -np.inf, str(e)
+    return {"candidato": indice, "fold": k, "score": score,
+            "tempo_s": time.perf_counter() - inicio, "erro": erro}
+
+
+# ---------------------------------------------------------------- successive halving
+
+def rodadas_halving(n_candidatos, n_max, eta=3, min_amostras=50):
+    """Linhas de treino por rodada: n_max, n_max/eta, ... (no máximo até sobrar um candidato)"""
+    rodadas = 1 + int(math.log(max(n_candidatos, 1)) / math.log(eta) + 1e-9)
+    # Rodadas com menos de min_amostras linhas são descartadas (a primeira começa maior)
+    tamanhos = [t for t in (n_max // eta ** (rodadas - 1 - i) for i in range(rodadas)) if t >= min_amostras]
+    return tamanhos or [n_max]
+
+
+class BuscaModelo:
+    """Resultado da busca: ranking por rodada, vencedor reajustado e tempos"""
+
+    def __init__(self, nome, ranking, candidato, metrica, modelo, encoder, meta, tempos):
+        self.nome = nome
+        self.ranking = ranking
+        self.metrica = metrica
+        self.candidato = candidato
+        self.modelo = modelo
+        self.encoder = encoder
+        self.meta = meta
+        self.tempos = tempos
+
+    @property
+    def melhor(self):
+        return self.candidato["params"]
+
+    @property
+    def score(self):
+        final = self.ranking[self.ranking["rodada"] == self.ranking["rodada"].max()]
+        return float(final["score_medio"].max())
+
+
+def buscar(nome, X, y, categoricas, tarefa, candidatos, metrica, n_folds=5, eta=3,
+           min_amostras=50, workers=None, seed=42):
+    """Successive halving com validação cruzada paralela; o vencedor é reajustado com tudo"""
+    workers = workers or os.cpu_count() or 1
+    tempos = {}
+    inicio = time.perf_counter()
+
+    dados, do_cache = codificar(nome, X, y, categoricas, tarefa, n_folds, seed)
+    tempos["codificacao_s"] = time.perf_counter() - inicio
+    tempos["cache_atributos"] = do_cache
+    X_cod, y_cod, fold, ordem = dados.arrays()
+
+    fixos = [c["fixos"](X_cod) if callable(c["fixos"]) else c["fixos"] for c in candidatos]
+    sem_fixos = [{k: v for k, v in c.items() if k != "fixos"} for c in candidatos]
+    n_max = min(int((fold != k).sum()) for k in range(n_folds))
+    tamanhos = rodadas_halving(len(candidatos), n_max, eta, min_amostras)
+
+    vivos = list(range(len(candidatos)))
+    linhas, tempos["rodadas"] = [], []
+    ajustes = 0
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for rodada, n_amostras in enumerate(tamanhos):
+            t0 = time.perf_counter()
+            tarefas = [(str(dados.pasta), i, sem_fixos[i], fixos[i], k,
+                        None if n_amostras >= n_max else n_amostras, metrica)
+                       for i in vivos for k in range(n_folds)]
+            resultados = list(pool.map(_avaliar, tarefas)) if pool else [_avaliar(t) for t in tarefas]
+            ajustes += len(tarefas)
+
+            por_candidato = {}
+            for r in resultados:
+                por_candidato.setdefault(r["candidato"], []).append(r)
+            placar = []
+            for i, rs in por_candidato.items():
+                scores = np.array([r["score"] for r in rs])
+                erros = [r["erro"] for r in rs if r["erro"]]
+                placar.append({"rodada": rodada, "n_amostras": n_amostras, "candidato": i,
+                               "estimador": candidatos[i]["estimador"].rpartition(".")[2],
+                               "params": candidatos[i]["params"],
+                               "score_medio": float(scores.mean()) if not erros else -np.inf,
+                               "score_std": float(scores.std()) if not erros else np.nan,
+                               "tempo_s": sum(r["tempo_s"] for r in rs),
+                               "erro": erros[0] if erros else None})
+            placar.sort(key=lambda p: p["score_medio"], reverse=True)
+            linhas += placar
+            tempos["rodadas"].append({"rodada": rodada, "candidatos": len(vivos), "n_amostras": n_amostras,
+                                      "tempo_s": time.perf_counter() - t0})
+
+            if rodada < len(tamanhos) - 1:
+                vivos = [p["candidato"] for p in placar[:max(1, math.ceil(len(vivos) / eta))]
+                         if np.isfinite(p["score_medio"])] or [placar[0]["candidato"]]
+    finally:
+        if pool:
+            pool.shutdown()
+
+    if not np.isfinite(placar[0]["score_medio"]):
+        raise RuntimeError(f"Nenhum candidato pôde ser ajustado: {placar[0]['erro']}")
+    vencedor = placar[0]["candidato"]
+
+    t0 = time.perf_counter()
+    modelo = _construir(candidatos[vencedor], fixos[vencedor])
+    modelo.fit(np.asarray(X_cod), np.asarray(y_cod))
+    tempos["ajuste_final_s"] = time.perf_counter() - t0
+    tempos["ajustes"] = ajustes
+    tempos["ajustes_grade_completa"] = len(candidatos) * n_folds
+    tempos["total_s"] = time.perf_counter() - inicio
+
+    ranking = pd.DataFrame(linhas)
+    return BuscaModelo(nome, ranking, dict(candidatos[vencedor], fixos=fixos[vencedor]), metrica,
+                       modelo, dados.encoder(), dados.meta, tempos)
+
+
+def buscar_espaco(nome, workers=None, n_folds=5, eta=3, **opcoes):
+    """Carrega, prepara e busca um dos conjuntos de ESPACOS"""
+    espaco = ESPACOS[nome]
+    X, y, categoricas = espaco["preparar"](espaco["carregar"](opcoes))
+    return buscar(nome, X, y, categoricas, espaco["tarefa"], espaco["candidatos"], espaco["metrica"],
+                  n_folds=n_folds, eta=eta, workers=workers)
+
+
+# ---------------------------------------------------------------- artefato
+
+def _json(valor):
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, (np.integer, np.floating)):
+        return valor.item()
+    return str(valor)
+
+
+def salvar_artefato(busca, pasta=None):
+    """modelos/<nome>.joblib (modelo, encoder, colunas, classes) + modelos/<nome>.json (escolha e tempos)"""
+    import joblib
+    import sklearn
+
+    pasta = Path(pasta or PASTA_MODELOS)
+    pasta.mkdir(parents=True, exist_ok=True)
+    joblib.dump({"modelo": busca.modelo, "encoder": busca.encoder, "colunas": busca.meta["colunas"],
+                 "classes": busca.meta["classes"], "params": busca.melhor},
+                pasta / f"{busca.nome}.joblib")
+    resumo = {
+        "nome": busca.nome,
+        "estimador": busca.candidato["estimador"],
+        "params": busca.melhor,
+        "fixos": busca.candidato["fixos"],
+        "escalar": busca.candidato["escalar"],
+        "metrica": busca.metrica,
+        "score_cv": busca.score,
+        "tarefa": busca.meta["tarefa"],
+        "linhas": busca.meta["linhas"],
+        "n_folds": busca.meta["n_folds"],
+        "tempos": busca.tempos,
+        "ranking": busca.ranking.replace([np.inf, -np.inf], np.nan).to_dict("records"),
+        "sklearn": sklearn.__version__,
+        "gerado_em": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    caminho = pasta / f"{busca.nome}.json"
+    caminho.write_text(json.dumps(resumo, ensure_ascii=False, indent=2, default=_json), encoding="utf-8")
+    return caminho
+
+
+def carregar_artefato(nome, pasta=None):
+    """Dicionário salvo por salvar_artefato (modelo já treinado), ou None"""
+    caminho = Path(pasta or PASTA_MODELOS) / f"{nome}.joblib"
+    if not caminho.exists():
+        return None
+    import joblib
+    return joblib.load(caminho)
+
+
+def parametros_escolhidos(nome, pasta=None):
+    """Hiperparâmetros do vencedor (só o JSON, sem carregar o modelo); {} sem artefato"""
+    caminho = Path(pasta or PASTA_MODELOS) / f"{nome}.json"
+    if not caminho.exists():
+        return {}
+    params = json.loads(caminho.read_text(encoding="utf-8"))["params"]
+    # JSON não tem tupla (hidden_layer_sizes)
+    return {k: tuple(v) if isinstance(v, list) else v for k, v in params.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Busca de hiperparâmetros dos modelos tabulares")
+    parser.add_argument("conjuntos", nargs="*", default=["dieta", "veiculos"], choices=list(ESPACOS))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--eta", type=int, default=3)
+    parser.add_argument("--csv-student", default=None, help=f"CSV do Student Performance (padrão: {URL_STUDENT})")
+    parser.add_argument("--pasta", default=None, help=f"pasta dos artefatos (padrão: {PASTA_MODELOS})")
+    args = parser.parse_args()
+
+    for nome in args.conjuntos:
+        busca = buscar_espaco(nome, workers=args.workers, n_folds=args.folds, eta=args.eta,
+                              csv_student=args.csv_student)
+        caminho = salvar_artefato(busca, args.pasta)
+        t = busca.tempos
+        print(f"✅ {nome}: {busca.candidato['estimador'].rpartition('.')[2]} {busca.melhor} | "
+              f"{busca.metrica} {busca.score:.4f} | {t['ajustes']}/{t['ajustes_grade_completa']} "
+              f"ajustes | {t['total_s']:.1f} s (atributos em cache: {t['cache_atributos']}) -> {caminho}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import hashlib
+import itertools
+import os
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Resultados já calculados (LRU): (hash da série, grade, critério, ajustes da poda) -> BuscaOrdem
+_cache = OrderedDict()
+MAX_CACHE = 32
+
+
+def gerar_candidatos(p=range(3), d=range(2), q=range(3),
+                     P=range(1), D=range(1), Q=range(1), s=0):
+    """Monta a grade (p,d,q)(P,D,Q,s). Com s=0 a parte sazonal é ignorada."""
+    candidatos = []
+    for ordem in itertools.product(p, d, q):
+        if s:
+            for sazonal in itertools.product(P, D, Q):
+                candidatos.append((ordem, sazonal + (s,)))
+        else:
+            candidatos.append((ordem, (0, 0, 0, 0)))
+    return candidatos
+
+
+def _ajustar_candidato(args):
+    """Ajusta um candidato (executado nos processos do pool)"""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    valores, order, seasonal_order, maxiter, start_params = args
+    inicio = time.perf_counter()
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            model = SARIMAX(valores, order=order, seasonal_order=seasonal_order)
+            res = model.fit(start_params=start_params, maxiter=maxiter, disp=False)
+        return {
+            "order": order,
+            "seasonal_order": seasonal_order,
+            "aic": float(res.aic),
+            "bic": float(res.bic),
+            "convergiu": bool(res.mle_retvals.get("converged", False)),
+            "params": np.asarray(res.params),
+            "tempo_s": time.perf_counter() - inicio,
+            "erro": None,
+        }
+    except Exception as e:
+        return {
+            "order": order,
+            "seasonal_order": seasonal_order,
+            "aic": np.inf,
+            "bic": np.inf,
+            "convergiu": False,
+            "params": None,
+            "tempo_s": time.perf_counter() - inicio,
+            "erro": str(e),
+        }
+
+
+def _executar(tarefas, workers):
+    if workers <= 1:
+        return [_ajustar_candidato(t) for t in tarefas]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_ajustar_candidato, tarefas))
+
+
+class BuscaOrdem:
+    """Resultado de uma busca: ranking dos candidatos e o melhor ajuste"""
+
+    def __init__(self, ranking, resultado, criterio, tempo_s):
+        self.ranking = ranking
+        self.resultado = resultado
+        self.criterio = criterio
+        self.tempo_s = tempo_s
+
+    @property
+    def melhor(self):
+        linha = self.ranking.iloc[0]
+        return linha["order"], linha["seasonal_order"]
+
+
+def buscar_ordem(serie, candidatos, criterio="aic", workers=None,
+                 maxiter_rapido=15, maxiter=50, margem=10.0, max_finalistas=5,
+                 penalidade=5.0, usar_cache=True):
+    """Busca automática de ordem para ARIMA/SARIMAX.
+
+    1. Ajuste rápido (``maxiter_rapido``) de todos os candidatos em paralelo.
+    2. Poda: descarta quem falhou ou ficou a mais de ``margem`` pontos do melhor
+       critério; quem não convergiu no ajuste rápido entra com ``penalidade``
+       pontos a mais. Mantém no máximo ``max_finalistas``.
+    3. Ajuste final dos sobreviventes partindo dos parâmetros da etapa 1; entre
+       os finalistas, os que convergiram têm preferência.
+
+    O melhor ajuste fica em cache, então repetir a busca com a mesma série e a
+    mesma grade é imediato.
+    """
+    if criterio not in ("aic", "bic"):
+        raise ValueError("criterio deve ser 'aic' ou 'bic'")
+    valores = np.asarray(serie, dtype=float)
+    workers = workers or os.cpu_count() or 1
+
+    chave = (hashlib.sha1(valores.tobytes()).hexdigest(), tuple(candidatos), criterio,
+             maxiter, maxiter_rapido, margem, max_finalistas, penalidade)
+    if usar_cache and chave in _cache:
+        _cache.move_to_end(chave)
+        return _cache[chave]
+
+    inicio = time.perf_counter()
+
+    # Etapa 1 - ajuste rápido de todos os candidatos
+    rapidos = _executar([(valores, o, so, maxiter_rapido, None) for o, so in candidatos], workers)
+    validos = [r for r in rapidos if r["erro"] is None and np.isfinite(r[criterio])]
+    if not validos:
+        raise RuntimeError("Nenhum candidato pôde ser ajustado.")
+
+    def pontuacao(r):
+        return r[criterio] + (0.0 if r["convergiu"] else penalidade)
+
+    melhor_rapido = min(pontuacao(r) for r in validos)
+    finalistas = sorted((r for r in validos if pontuacao(r) <= melhor_rapido + margem),
+                        key=pontuacao)[:max_finalistas]
+
+    # Etapa 2 - ajuste completo dos finalistas com warm start
+    tarefas = [(valores, r["order"], r["seasonal_order"], maxiter, r["params"]) for r in finalistas]
+    finais = _executar(tarefas, min(workers, len(tarefas)))
+
+    finais_ok = [r for r in finais if r["erro"] is None and np.isfinite(r[criterio])]
+    if not finais_ok:
+        raise RuntimeError("Nenhum finalista convergiu.")
+    ids_finalistas = {id(r) for r in finalistas}
+    podados = [dict(r, podado=True) for r in rapidos if id(r) not in ids_finalistas]
+    linhas = [dict(r, podado=False) for r in finais_ok] + podados
+
+    ranking = pd.DataFrame(linhas).drop(columns=["params"])
+    ranking = ranking.sort_values(["podado", "convergiu", criterio],
+                                  ascending=[True, False, True]).reset_index(drop=True)
+
+    # Reconstrói o vencedor no processo principal só com o filtro (sem otimizar de novo)
+    convergidos = [r for r in finais_ok if r["convergiu"]]
+    vencedor = min(convergidos or finais_ok, key=lambda r: r[criterio])
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    model = SARIMAX(serie, order=vencedor["order"], seasonal_order=vencedor["seasonal_order"])
+    resultado = model.filter(vencedor["params"])
+
+    busca = BuscaOrdem(ranking, resultado, criterio, time.perf_counter() - inicio)
+    if usar_cache:
+        _cache[chave] = busca
+        if len(_cache) > MAX_CACHE:
+            _cache.popitem(last=False)
+    return busca
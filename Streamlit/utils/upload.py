@@ -0,0 +1,47 @@
+# Limites padrão para arquivos enviados pela interface
+MAX_BYTES = 200 * 1024 * 1024
+MAX_LINHAS = 5_000_000
+TAMANHO_BLOCO = 4 * 1024 * 1024
+LINHAS_AMOSTRA = 20
+
+
+class UploadInvalido(ValueError):
+    """Arquivo enviado fora dos limites ou ilegível"""
+
+
+def ler_upload(arquivo, header="infer", sep=",", max_bytes=MAX_BYTES, max_linhas=MAX_LINHAS,
+               tamanho_bloco=TAMANHO_BLOCO, linhas_amostra=LINHAS_AMOSTRA):
+    """Lê um CSV enviado (st.file_uploader) direto do buffer de bytes, em blocos, com pyarrow.
+
+    Não decodifica o arquivo para uma string Python nem faz cópias intermediárias:
+    o leitor em streaming percorre o buffer bloco a bloco e interrompe assim que
+    ``max_linhas`` é ultrapassado. Devolve (DataFrame, amostra com as primeiras linhas).
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
+    tamanho = getattr(arquivo, "size", None)
+    if tamanho is not None and tamanho > max_bytes:
+        raise UploadInvalido(f"Arquivo com {tamanho / 1e6:.1f} MB excede o limite de {max_bytes / 1e6:.0f} MB.")
+
+    buffer = arquivo.getbuffer() if hasattr(arquivo, "getbuffer") else arquivo.getvalue()
+    leitura = pacsv.ReadOptions(block_size=tamanho_bloco, autogenerate_column_names=header is None)
+    try:
+        leitor = pacsv.open_csv(pa.BufferReader(pa.py_buffer(buffer)), read_options=leitura,
+                                parse_options=pacsv.ParseOptions(delimiter=sep))
+        lotes, linhas = [], 0
+        for lote in leitor:
+            linhas += lote.num_rows
+            if linhas > max_linhas:
+                raise UploadInvalido(f"Arquivo excede o limite de {max_linhas} linhas.")
+            lotes.append(lote)
+        tabela = pa.Table.from_batches(lotes, schema=leitor.schema)
+    except pa.ArrowInvalid as e:
+        raise UploadInvalido(f"Não foi possível ler o CSV: {e}") from e
+
+    df = tabela.to_pandas()
+    if header is None:
+        df.columns = range(df.shape[1])
+    else:
+        df.columns = [str(c).lstrip("\ufeff") for c in df.columns]
+    return df, df.head(linhas_amostra)
@@ -0,0 +1,188 @@
+"""Cache de resultados de inferência YOLO endereçado pelo conteúdo da imagem.
+
+A chave é o hash dos pixels decodificados + a impressão digital do arquivo de
+pesos + os parâmetros de inferência (imgsz, conf, iou). Há dois níveis:
+  - memória: LRU com número máximo de itens;
+  - disco: um arquivo por resultado, com limite de tamanho total (remove os
+    acessados há mais tempo).
+Quando o arquivo de pesos muda, a impressão digital muda junto: as entradas
+antigas deixam de ser encontradas e a pasta delas é apagada.
+
+Uso:
+    preditor = PreditorComCache('model/yolov8n.pt', pasta_cache='.cache_yolo')
+    resultado = preditor.predict(cv2.imread('images/img03.png'), conf=0.4)
+    resultado['xyxy'], resultado['conf'], resultado['cls']
+    preditor.cache.estatisticas()
+"""
+import hashlib
+import os
+import pickle
+import shutil
+from collections import OrderedDict
+
+import numpy as np
+
+VERSAO = 1
+
+
+def impressao_pesos(caminho, _memo={}):
+    """Hash do conteúdo do arquivo de pesos (recalculado só quando mtime/tamanho mudam)"""
+    stat = os.stat(caminho)
+    marca = (os.path.abspath(caminho), stat.st_size, stat.st_mtime_ns)
+    if marca not in _memo:
+        h = hashlib.blake2b(digest_size=16)
+        with open(caminho, "rb") as f:
+            for bloco in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloco)
+        _memo[marca] = h.hexdigest()
+    return _memo[marca]
+
+
+def chave_imagem(img, **parametros):
+    """Hash dos pixels decodificados + formato + parâmetros de inferência"""
+    img = np.ascontiguousarray(img)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{VERSAO}|{img.shape}|{img.dtype}|{sorted(parametros.items())}".encode())
+    h.update(memoryview(img).cast("B"))
+    return h.hexdigest()
+
+
+def compactar(resultado):
+    """Results do ultralytics -> dicionário só com arrays NumPy"""
+    if resultado.probs is not None:
+        return {"tipo": "classify", "names": resultado.names,
+                "probs": resultado.probs.data.cpu().numpy().astype(np.float32)}
+    boxes = resultado.boxes
+    return {"tipo": "detect", "names": resultado.names,
+            "xyxy": boxes.xyxy.cpu().numpy().astype(np.float32),
+            "conf": boxes.conf.cpu().numpy().astype(np.float32),
+            "cls": boxes.cls.cpu().numpy().astype(np.int32)}
+
+
+class CacheResultados:
+    def __init__(self, pasta, impressao, max_itens_memoria=1024, max_bytes_disco=512 * 1024 * 1024):
+        self.max_itens_memoria = max_itens_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria = OrderedDict()
+        self.hits_memoria = 0
+        self.hits_disco = 0
+        self.misses = 0
+
+        self.pasta = None
+        if pasta:
+            self.pasta = os.path.join(pasta, impressao)
+            os.makedirs(self.pasta, exist_ok=True)
+            # Pastas de outras versões dos pesos ficaram obsoletas
+            for nome in os.listdir(pasta):
+                caminho = os.path.join(pasta, nome)
+                if nome != impressao and os.path.isdir(caminho):
+                    shutil.rmtree(caminho, ignore_errors=True)
+            self._bytes_disco = sum(e.stat().st_size for e in os.scandir(self.pasta) if e.is_file())
+
+    def _arquivo(self, chave):
+        return os.path.join(self.pasta, chave + ".pkl")
+
+    def obter(self, chave):
+        if chave in self._memoria:
+            self._memoria.move_to_end(chave)
+            self.hits_memoria += 1
+            return self._memoria[chave]
+        if self.pasta:
+            arquivo = self._arquivo(chave)
+            try:
+                with open(arquivo, "rb") as f:
+                    valor = pickle.load(f)
+                os.utime(arquivo)
+                self.hits_disco += 1
+                self._guardar_memoria(chave, valor)
+                return valor
+            except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+                pass
+        self.misses += 1
+        return None
+
+    def guardar(self, chave, valor):
+        self._guardar_memoria(chave, valor)
+        if not self.pasta:
+            return
+        arquivo = self._arquivo(chave)
+        temporario = arquivo + ".tmp"
+        with open(temporario, "wb") as f:
+            pickle.dump(valor, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporario, arquivo)
+        self._bytes_disco += os.path.getsize(arquivo)
+        if self._bytes_disco > self.max_bytes_disco:
+            self._despejar_disco()
+
+    def _guardar_memoria(self, chave, valor):
+        self._memoria[chave] = valor
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.max_itens_memoria:
+            self._memoria.popitem(last=False)
+
+    def _despejar_disco(self):
+        """Remove os arquivos acessados há mais tempo até ficar em 90% do limite"""
+        entradas = sorted((e for e in os.scandir(self.pasta) if e.name.endswith(".pkl")),
+                          key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entradas)
+        for e in entradas:
+            if total <= 0.9 * self.max_bytes_disco:
+                break
+            total -= e.stat().st_size
+            os.remove(e.path)
+        self._bytes_disco = total
+
+    def estatisticas(self):
+        consultas = self.hits_memoria + self.hits_disco + self.misses
+        return {"hits_memoria": self.hits_memoria, "hits_disco": self.hits_disco, "misses": self.misses,
+                "taxa_acerto": round((self.hits_memoria + self.hits_disco) / consultas, 4) if consultas else 0.0,
+                "itens_memoria": len(self._memoria),
+                "bytes_disco": self._bytes_disco if self.pasta else 0}
+
+
+class PreditorComCache:
+    """YOLO (detecção ou classificação) com cache de resultados por conteúdo"""
+
+    def __init__(self, pesos, pasta_cache=".cache_yolo", **opcoes_cache):
+        from ultralytics import YOLO
+        self.pesos = pesos
+        self.model = YOLO(pesos)
+        self._impressao = impressao_pesos(pesos)
+        self.opcoes_cache = opcoes_cache
+        self.pasta_cache = pasta_cache
+        self.cache = self._novo_cache()
+
+    def _novo_cache(self):
+        pasta = os.path.join(self.pasta_cache, os.path.basename(self.pesos)) if self.pasta_cache else None
+        return CacheResultados(pasta, self._impressao, **self.opcoes_cache)
+
+    def _verificar_pesos(self):
+        """Se o arquivo de pesos mudou, recarrega o modelo e troca de cache"""
+        impressao = impressao_pesos(self.pesos)
+        if impressao != self._impressao:
+            from ultralytics import YOLO
+            self.model = YOLO(self.pesos)
+            self._impressao = impressao
+            self.cache = self._novo_cache()
+
+    def predict_lote(self, imagens, imgsz=None, conf=0.25, iou=0.7):
+        """Resultados compactos para uma lista de imagens; só os misses vão ao modelo.
+
+        ``imgsz=None`` usa o tamanho padrão do modelo (224 na classificação).
+        """
+        self._verificar_pesos()
+        chaves = [chave_imagem(img, imgsz=imgsz, conf=conf, iou=iou) for img in imagens]
+        resultados = [self.cache.obter(c) for c in chaves]
+        faltando = [i for i, r in enumerate(resultados) if r is None]
+        if faltando:
+            opcoes = {"conf": conf, "iou": iou, "verbose": False, "save": False}
+            if imgsz:
+                opcoes["imgsz"] = imgsz
+            saidas = self.model.predict([imagens[i] for i in faltando], **opcoes)
+            for i, saida in zip(faltando, saidas):
+                resultados[i] = compactar(saida)
+                self.cache.guardar(chaves[i], resultados[i])
+        return resultados
+
+    def predict(self, img, imgsz=None, conf=0.25, iou=0.7):
+        return self.predict_lote([img], imgsz=imgsz, conf=conf, iou=iou)[0]
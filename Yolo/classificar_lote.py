@@ -0,0 +1,174 @@
+"""Classificação em lote de pastas inteiras com o YOLO de classificação.
+
+Mesma inferência do classification_01.py, mas para milhares de imagens:
+  - a leitura das imagens (threads) acontece em paralelo com a inferência;
+  - as imagens vão para o modelo em lotes;
+  - o top-k (nomes e probabilidades) é gravado incrementalmente em CSV ou Parquet;
+  - arquivos já classificados são pulados, então uma execução interrompida continua
+    de onde parou;
+  - com ``--cache`` imagens com pixels idênticos não passam de novo pelo modelo
+    (ver cache_resultados.py).
+
+Uso:
+    python classificar_lote.py images/ --saida resultados.csv --batch 32 --topk 5
+    python classificar_lote.py images/ --saida resultados.parquet   # pasta com partes .parquet
+    python classificar_lote.py images/ --cache .cache_yolo
+"""
+import argparse
+import csv
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+EXTENSOES = ('.png', '.jpg', '.jpeg', '.bmp', '.webp')
+
+
+def listar_imagens(pasta):
+    return sorted(os.path.join(raiz, nome) for raiz, _, nomes in os.walk(pasta)
+                  for nome in nomes if nome.lower().endswith(EXTENSOES))
+
+
+class SaidaCSV:
+    def __init__(self, caminho, colunas):
+        self.caminho = caminho
+        self.colunas = colunas
+
+    def ja_classificados(self):
+        if not os.path.exists(self.caminho):
+            return set()
+        with open(self.caminho, newline="", encoding="utf-8") as f:
+            return {linha["arquivo"] for linha in csv.DictReader(f)}
+
+    def gravar(self, linhas):
+        novo = not os.path.exists(self.caminho)
+        with open(self.caminho, "a", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=self.colunas)
+            if novo:
+                escritor.writeheader()
+            escritor.writerows(linhas)
+
+
+class SaidaParquet:
+    """Pasta com um arquivo .parquet por lote (Parquet não permite anexar a um arquivo)"""
+
+    def __init__(self, pasta, colunas):
+        import pyarrow as pa
+        self.pasta = pasta
+        self.colunas = colunas
+        # Schema fixo: sem ele o tipo das colunas (erro, classe_k, prob_k) seria inferido por lote
+        # e sairia nulo nos lotes sem valores, com partes incompatíveis entre si
+        self.schema = pa.schema([(c, pa.float32() if c.startswith("prob_") else pa.string())
+                                 for c in colunas])
+        os.makedirs(pasta, exist_ok=True)
+        self._parte = len(glob.glob(os.path.join(pasta, "parte-*.parquet")))
+
+    def ja_classificados(self):
+        import pyarrow.parquet as pq
+        vistos = set()
+        for arquivo in glob.glob(os.path.join(self.pasta, "parte-*.parquet")):
+            vistos.update(pq.read_table(arquivo, columns=["arquivo"]).column("arquivo").to_pylist())
+        return vistos
+
+    def gravar(self, linhas):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tabela = pa.Table.from_pylist(linhas, schema=self.schema)
+        temporario = os.path.join(self.pasta, f".parte-{self._parte:06d}.tmp")
+        pq.write_table(tabela, temporario)
+        os.replace(temporario, os.path.join(self.pasta, f"parte-{self._parte:06d}.parquet"))
+        self._parte += 1
+
+
+def lotes_prefetch(caminhos, batch_size, workers=4, adiante=2):
+    """Lê os próximos lotes em threads enquanto o modelo processa o atual"""
+    grupos = [caminhos[i:i + batch_size] for i in range(0, len(caminhos), batch_size)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pendentes = [[pool.submit(cv2.imread, c) for c in g] for g in grupos[:adiante]]
+        for i, grupo in enumerate(grupos):
+            futuros = pendentes.pop(0)
+            if i + adiante < len(grupos):
+                pendentes.append([pool.submit(cv2.imread, c) for c in grupos[i + adiante]])
+            yield grupo, [f.result() for f in futuros]
+
+
+def topk(probs, names, k):
+    ordem = np.argsort(probs)[::-1][:k]
+    return [(names[int(i)], float(probs[i])) for i in ordem]
+
+
+def classificar(model, imagens, imgsz=None, k=5):
+    """Top-k de cada imagem do lote (uma única chamada ao modelo)"""
+    opcoes = {"verbose": False, "save": False}
+    if imgsz:
+        opcoes["imgsz"] = imgsz
+    resultados = model.predict(imagens, **opcoes)
+    return [topk(r.probs.data.cpu().numpy(), r.names, k) for r in resultados]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classificação em lote com YOLO")
+    parser.add_argument("pasta")
+    parser.add_argument("--model", default="model/yolo11x-cls.pt")
+    parser.add_argument("--saida", default="resultados.csv")
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--topk", type=int, default=5)
+    parser.add_argument("--imgsz", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=4, help="threads de leitura das imagens")
+    parser.add_argument("--cache", default=None, help="pasta do cache de resultados por conteúdo")
+    args = parser.parse_args()
+
+    colunas = ["arquivo", "erro"] + [f"{c}_{i}" for i in range(1, args.topk + 1) for c in ("classe", "prob")]
+    saida = SaidaParquet(args.saida, colunas) if args.saida.endswith(".parquet") else SaidaCSV(args.saida, colunas)
+
+    caminhos = listar_imagens(args.pasta)
+    feitos = saida.ja_classificados()
+    pendentes = [c for c in caminhos if c not in feitos]
+    print(f"{len(caminhos)} imagens | {len(feitos)} já classificadas | {len(pendentes)} pendentes")
+
+    if args.cache:
+        from cache_resultados import PreditorComCache
+        preditor = PreditorComCache(args.model, pasta_cache=args.cache)
+        opcoes = {"imgsz": args.imgsz}
+    else:
+        model = YOLO(args.model)
+    inicio = time.perf_counter()
+    total = 0
+    for grupo, imagens in lotes_prefetch(pendentes, args.batch, args.workers):
+        validas = [i for i, img in enumerate(imagens) if img is not None]
+        if not validas:
+            previsoes = []
+        elif args.cache:
+            compactos = preditor.predict_lote([imagens[i] for i in validas], **opcoes)
+            previsoes = [topk(r["probs"], r["names"], args.topk) for r in compactos]
+        else:
+            previsoes = classificar(model, [imagens[i] for i in validas], args.imgsz, args.topk)
+        por_indice = dict(zip(validas, previsoes))
+
+        linhas = []
+        for i, caminho in enumerate(grupo):
+            linha = dict.fromkeys(colunas)
+            linha["arquivo"] = caminho
+            if i in por_indice:
+                for pos, (nome, prob) in enumerate(por_indice[i], start=1):
+                    linha[f"classe_{pos}"] = nome
+                    linha[f"prob_{pos}"] = round(prob, 5)
+            else:
+                linha["erro"] = "falha ao ler a imagem"
+            linhas.append(linha)
+        saida.gravar(linhas)
+
+        total += len(grupo)
+        tempo = time.perf_counter() - inicio
+        print(f"\r{total}/{len(pendentes)} imagens | {total / tempo:.1f} img/s", end="", flush=True)
+    print()
+    if args.cache:
+        print(preditor.cache.estatisticas())
+
+
+if __name__ == "__main__":
+    main()
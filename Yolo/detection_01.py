@@ -1,6 +1,13 @@
 import cv2
+import sys
+from pathlib import Path
 from ultralytics import YOLO
 
+pasta_modulos = str(Path(__file__).resolve().parents[1])
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from visao.latencia import ControladorLatencia, detectar_frame
+
 # Carregar o modelo YOLO
 model = YOLO('model/yolov8n.pt')
 
@@ -10,31 +17,18 @@ model = YOLO('model/yolov8n.pt')
 # Ler a webcam
 video = cv2.VideoCapture(0)
 
-# Dicionário de nomes das classes
-class_names = model.names
+# Latência alvo por frame (~15 FPS); o controle troca imgsz (640/480/320) e pula frames se preciso
+controle = ControladorLatencia(alvo_ms=66)
+caixas = []
 
 while True:
     check, img = video.read()
+    if not check:
+        break
     
-    # Realizar a predição na imagem
-    results = model.predict(img, verbose=False, save=True)
-
-    # Extrair detecções e desenhar na imagem
-    for result in results:
-        for box in result.boxes:
-            # Obter coordenadas, confiança e classe
-            x1, y1, x2, y2 = map(int, box.xyxy[0])  # Convertendo coordenadas para inteiros
-            confidence = box.conf[0]
-            cls = int(box.cls[0])
-            
-            # Obter o nome da classe
-            class_name = class_names[cls] if cls in class_names else 'Desconhecido'
-            
-            # Desenhar o retângulo na imagem
-            cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
-            # Adicionar o nome da classe e a confiança
-            cv2.putText(img, f'{class_name} ({confidence:.2f})', 
-                        (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    # Predição só nos frames escolhidos pelo controle de latência (só o predict é cronometrado);
+    # nos frames pulados são desenhadas as detecções do último frame processado
+    caixas = detectar_frame(model, img, controle, caixas)
 
     # Mostrar o vídeo com as detecções
     cv2.imshow('Detectando em LIA 2025', img)
@@ -45,4 +39,8 @@ while True:
 
 # Liberar a captura e destruir todas as janelas
 video.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+cv2.destroyAllWindows()
+
+# Métricas do controle de latência
+print(controle.estado())
+controle.salvar_decisoes('metricas_latencia.csv')
\ No newline at end of file
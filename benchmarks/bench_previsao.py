@@ -0,0 +1,56 @@
+"""Tempo de ajuste ARIMA/SARIMAX com os CSVs do Inflação.py e do 03_Leite."""
+import sys
+
+import pandas as pd
+
+from comum import RAIZ, medir
+
+pasta_modulos = str(RAIZ / "Streamlit")
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+
+CSV_INFLACAO = (RAIZ / "Entregas - Filipe Camello" / "Projeto Streamlit 13-10" / "Inflação"
+                / "brazil.inflation.monthly (statbureau.org).csv")
+CSV_LEITE = RAIZ / "Streamlit" / "03_Leite" / "producao_mensal_leite_litros.csv"
+
+
+def serie_inflacao(meses):
+    """Mesmo formato longo (ano x mês) que o Inflação.py monta a partir do CSV"""
+    df = pd.read_csv(CSV_INFLACAO, encoding="utf-8-sig")
+    df.columns = [c.strip() for c in df.columns]
+    meses_cols = [c for c in df.columns if c not in ("Year", "Total")]
+    valores = df[meses_cols].to_numpy().ravel()
+    return pd.Series(valores).dropna().astype(float).tail(meses).to_numpy()
+
+
+def serie_leite():
+    data = pd.read_csv(CSV_LEITE, header=None)
+    return pd.Series(data.iloc[:, 0].values,
+                     index=pd.date_range(start="2011-01-01", periods=len(data), freq="M"))
+
+
+def executar(repeticoes=5):
+    from statsmodels.tsa.arima.model import ARIMA
+    from utils.sarimax_incremental import MODO_FILTRO, PrevisorIncremental, ajustar
+
+    resultados = {}
+    # Inflação.py: ARIMA(1,1,1) sobre os últimos 36 meses (valor padrão da barra lateral)
+    inflacao = serie_inflacao(36)
+    resultados["previsao.arima_inflacao_fit"] = medir(
+        lambda: ARIMA(inflacao, order=(1, 1, 1)).fit(), repeticoes)
+
+    # 03_Leite: SARIMAX (2,0,0)x(0,1,1,12) completo e atualização de um mês por filtro
+    leite = serie_leite()
+    resultados["previsao.sarimax_leite_fit"] = medir(
+        lambda: ajustar(leite, (2, 0, 0), (0, 1, 1, 12)), repeticoes)
+
+    previsor = PrevisorIncremental()
+    previsor.ajustar(leite.iloc[:-1])
+    base, resultado_base = previsor.serie, previsor.resultado
+
+    def atualizar_um_mes():
+        previsor.serie, previsor.resultado = base, resultado_base
+        previsor.atualizar(leite.iloc[-1:], MODO_FILTRO)
+
+    resultados["previsao.sarimax_leite_filtro_1mes"] = medir(atualizar_um_mes, repeticoes)
+    return resultados
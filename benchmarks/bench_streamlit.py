@@ -0,0 +1,42 @@
+"""Carga do modelo e latência de predição dos apps dieta.py e veiculo.py.
+
+Os apps rodam sem servidor pelo ``streamlit.testing.v1.AppTest``:
+  - carga: primeira execução do script com o ``st.cache_data`` limpo (lê os dados e treina);
+  - rerun: execução seguinte, com o modelo já em cache;
+  - predicao: clique no botão de processar (rerun + predição).
+"""
+import time
+
+from comum import RAIZ, estatisticas
+
+APPS = {
+    "dieta": RAIZ / "Entregas - Filipe Camello" / "Projeto Streamlit 08-10" / "Dieta" / "dieta.py",
+    "veiculo": RAIZ / "Streamlit" / "02_Veículos" / "veiculo.py",
+}
+
+
+def _cronometrar(fn):
+    inicio = time.perf_counter()
+    fn()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def executar(repeticoes=5, timeout=120):
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    resultados = {}
+    for nome, caminho in APPS.items():
+        cargas, reruns, predicoes = [], [], []
+        for _ in range(repeticoes):
+            st.cache_data.clear()
+            app = AppTest.from_file(str(caminho), default_timeout=timeout)
+            cargas.append(_cronometrar(app.run))
+            if app.exception:
+                raise RuntimeError(f"{nome}: {app.exception[0].message}")
+            reruns.append(_cronometrar(app.run))
+            predicoes.append(_cronometrar(lambda: app.button[0].click().run()))
+        resultados[f"streamlit.{nome}_carga"] = estatisticas(cargas)
+        resultados[f"streamlit.{nome}_rerun"] = estatisticas(reruns)
+        resultados[f"streamlit.{nome}_predicao"] = estatisticas(predicoes)
+    return resultados
@@ -0,0 +1,78 @@
+"""Latência captura de tela -> detecção (laço do ia_minecraft_tela.py) em um framebuffer virtual.
+
+Sem DISPLAY, sobe um ``Xvfb`` próprio na resolução pedida e desenha um frame
+sintético nele, então roda em servidores sem monitor. Se o Xvfb não estiver
+instalado (``apt install xvfb``) o grupo é pulado.
+"""
+import os
+import shutil
+import subprocess
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+from comum import estatisticas
+from bench_yolo import PESOS_PADRAO, frames_sinteticos
+
+
+class SemDisplay(RuntimeError):
+    pass
+
+
+@contextmanager
+def framebuffer_virtual(largura=1920, altura=1080, numero=99):
+    if os.environ.get("DISPLAY"):
+        yield os.environ["DISPLAY"]
+        return
+    if not shutil.which("Xvfb"):
+        raise SemDisplay("Xvfb não encontrado e DISPLAY não definido")
+    display = f":{numero}"
+    processo = subprocess.Popen(["Xvfb", display, "-screen", "0", f"{largura}x{altura}x24", "-nolisten", "tcp"],
+                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        time.sleep(1.0)
+        if processo.poll() is not None:
+            raise SemDisplay(f"Xvfb terminou ao iniciar em {display}")
+        os.environ["DISPLAY"] = display
+        yield display
+    finally:
+        os.environ.pop("DISPLAY", None)
+        processo.terminate()
+        processo.wait(timeout=5)
+
+
+def executar(repeticoes=5, pesos=PESOS_PADRAO, imgsz=640, resolucao=(1920, 1080)):
+    from ultralytics import YOLO
+
+    with framebuffer_virtual(*resolucao):
+        # pyautogui conecta ao X na importação, por isso só depois do DISPLAY
+        import pyautogui
+        import tkinter as tk
+
+        # Conteúdo na tela: um frame sintético em uma janela do tamanho do framebuffer
+        from PIL import Image, ImageTk
+        raiz = tk.Tk()
+        raiz.geometry(f"{resolucao[0]}x{resolucao[1]}+0+0")
+        frame = cv2.cvtColor(frames_sinteticos(1, *resolucao)[0], cv2.COLOR_BGR2RGB)
+        foto = ImageTk.PhotoImage(Image.fromarray(frame))
+        tk.Label(raiz, image=foto, borderwidth=0).pack()
+        raiz.update()
+
+        model = YOLO(pesos)
+        etapas = {"captura": [], "resize": [], "predicao": [], "total": []}
+        for i in range(repeticoes * 4 + 1):
+            t0 = time.perf_counter()
+            img = cv2.cvtColor(np.array(pyautogui.screenshot()), cv2.COLOR_RGB2BGR)
+            t1 = time.perf_counter()
+            pequeno = cv2.resize(img, (imgsz, imgsz))
+            t2 = time.perf_counter()
+            model.predict(pequeno, verbose=False, save=False, imgsz=imgsz, conf=0.3, iou=0.5)
+            t3 = time.perf_counter()
+            if i == 0:
+                continue  # aquecimento
+            for etapa, tempo in zip(etapas, (t1 - t0, t2 - t1, t3 - t2, t3 - t0)):
+                etapas[etapa].append(tempo * 1000)
+        raiz.destroy()
+    return {f"tela.{etapa}": estatisticas(tempos) for etapa, tempos in etapas.items()}
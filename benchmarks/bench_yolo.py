@@ -0,0 +1,120 @@
+"""Etapas do YOLO por frame e vazão de ponta a ponta em vídeo (laço do detection_epis.py).
+
+Tudo roda offline: os frames e o vídeo são sintéticos (semente fixa) e, por padrão,
+o modelo é montado a partir do yaml do yolo11n (pesos aleatórios, nenhum download).
+A latência não depende dos valores dos pesos, só da arquitetura e do imgsz; para
+medir um modelo treinado passe ``--pesos model/best_br.pt``.
+"""
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from comum import estatisticas, medir
+
+PESOS_PADRAO = "yolo11n.yaml"
+
+
+def frames_sinteticos(n, largura=1280, altura=720, semente=0):
+    """Ruído + retângulos coloridos, para o pré-processamento não ser trivial"""
+    rng = np.random.default_rng(semente)
+    frames = []
+    for _ in range(n):
+        img = rng.integers(0, 256, (altura, largura, 3), dtype=np.uint8)
+        for _ in range(8):
+            x, y = int(rng.integers(0, largura - 100)), int(rng.integers(0, altura - 100))
+            cor = tuple(int(c) for c in rng.integers(0, 256, 3))
+            cv2.rectangle(img, (x, y), (x + int(rng.integers(40, 100)), y + int(rng.integers(40, 100))), cor, -1)
+        frames.append(img)
+    return frames
+
+
+def video_sintetico(caminho, frames, fps=30):
+    altura, largura = frames[0].shape[:2]
+    saida = cv2.VideoWriter(caminho, cv2.VideoWriter_fourcc(*'mp4v'), fps, (largura, altura))
+    for img in frames:
+        saida.write(img)
+    saida.release()
+    return caminho
+
+
+def desenhar(img, caixas, nomes):
+    """Mesmo desenho do detection_epis.py (texto + retângulo com cor por classe)"""
+    for x1, y1, x2, y2, conf, cls in caixas:
+        nomeClasse = nomes[int(cls)]
+        cv2.putText(img, f'{nomeClasse} - {conf:.2f}', (int(x1), int(y1) - 10),
+                    cv2.FONT_HERSHEY_COMPLEX, 1, (255, 0, 0), 2)
+        if nomeClasse in ['pessoa', 'com_capacete', 'com_colete']:
+            cor = (0, 255, 0)
+        elif nomeClasse in ['sem_capacete', 'sem_colete']:
+            cor = (0, 0, 255)
+        else:
+            cor = (255, 255, 0)
+        cv2.rectangle(img, (int(x1), int(y1)), (int(x2), int(y2)), cor, 3)
+
+
+def caixas_do_resultado(resultado, conf_min=0.4):
+    dados = resultado.boxes.data.cpu().numpy()
+    return dados[dados[:, 4] >= conf_min] if len(dados) else dados
+
+
+def executar(repeticoes=5, pesos=PESOS_PADRAO, imgsz=640, n_frames=60, resolucao=(1280, 720)):
+    from ultralytics import YOLO
+
+    model = YOLO(pesos)
+    frames = frames_sinteticos(n_frames, *resolucao)
+    resultados = {}
+
+    # Etapas internas do ultralytics (pré-processamento, rede, NMS) frame a frame
+    model.predict(frames[0], imgsz=imgsz, verbose=False)
+    etapas = {"preprocess": [], "inference": [], "postprocess": []}
+    for img in frames:
+        speed = model.predict(img, imgsz=imgsz, verbose=False)[0].speed
+        for etapa in etapas:
+            etapas[etapa].append(speed[etapa])
+    for etapa, tempos in etapas.items():
+        resultados[f"yolo.{etapa}"] = estatisticas(tempos)
+
+    # Desenho e codificação com um conjunto fixo de caixas (os pesos aleatórios quase não detectam)
+    rng = np.random.default_rng(1)
+    x1y1 = rng.uniform(0, [resolucao[0] - 200, resolucao[1] - 200], (20, 2))
+    caixas = np.column_stack([x1y1, x1y1 + rng.uniform(50, 200, (20, 2)),
+                              rng.uniform(0.4, 1.0, 20), rng.integers(0, 5, 20)])
+    nomes = {0: 'pessoa', 1: 'com_capacete', 2: 'com_colete', 3: 'sem_capacete', 4: 'sem_colete'}
+    resultados["yolo.draw"] = medir(lambda: desenhar(frames[0].copy(), caixas, nomes), repeticoes * 10)
+
+    with tempfile.TemporaryDirectory() as pasta:
+        escritor = cv2.VideoWriter(os.path.join(pasta, "encode.mp4"), cv2.VideoWriter_fourcc(*'mp4v'),
+                                   30, resolucao)
+        indice = iter(range(10 ** 9))
+        resultados["yolo.encode"] = medir(lambda: escritor.write(frames[next(indice) % n_frames]),
+                                          repeticoes * 10)
+        escritor.release()
+
+        # Ponta a ponta: ler -> prever -> desenhar -> gravar, como no detection_epis.py
+        entrada = video_sintetico(os.path.join(pasta, "entrada.mp4"), frames)
+        tempos = []
+        for _ in range(max(1, repeticoes // 2)):
+            video = cv2.VideoCapture(entrada)
+            saida = cv2.VideoWriter(os.path.join(pasta, "saida.mp4"), cv2.VideoWriter_fourcc(*'mp4v'),
+                                    30, resolucao)
+            inicio = time.perf_counter()
+            lidos = 0
+            while True:
+                ok, img = video.read()
+                if not ok:
+                    break
+                resultado = model(img, imgsz=imgsz, verbose=False)[0]
+                desenhar(img, caixas_do_resultado(resultado), resultado.names)
+                saida.write(img)
+                lidos += 1
+            total = time.perf_counter() - inicio
+            video.release()
+            saida.release()
+            tempos.append(total * 1000 / max(lidos, 1))
+        medida = estatisticas(tempos)
+        medida["fps"] = round(1000 / medida["mediana_ms"], 2) if medida["mediana_ms"] else 0.0
+        resultados["yolo.video_por_frame"] = medida
+    return resultados
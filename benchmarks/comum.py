@@ -0,0 +1,75 @@
+"""Funções compartilhadas pelos benchmarks: medição, ambiente e comparação com a baseline."""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+
+def medir(fn, repeticoes=5, aquecimento=1):
+    """Executa ``fn`` várias vezes e devolve estatísticas do tempo em ms"""
+    for _ in range(aquecimento):
+        fn()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        fn()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return estatisticas(tempos)
+
+
+def estatisticas(tempos_ms):
+    ordenados = sorted(tempos_ms)
+    p95 = ordenados[min(len(ordenados) - 1, int(round(0.95 * (len(ordenados) - 1))))]
+    return {"mediana_ms": round(statistics.median(ordenados), 3),
+            "p95_ms": round(p95, 3),
+            "min_ms": round(ordenados[0], 3),
+            "n": len(ordenados)}
+
+
+def ambiente():
+    """Dados da máquina gravados junto com os resultados (comparar só entre máquinas iguais)"""
+    info = {"python": sys.version.split()[0], "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(), "nucleos": os.cpu_count()}
+    for modulo in ("numpy", "torch", "ultralytics", "cv2", "statsmodels", "sklearn", "streamlit"):
+        try:
+            info[modulo] = __import__(modulo).__version__
+        except Exception:
+            pass
+    return info
+
+
+def salvar(caminho, dados):
+    Path(caminho).parent.mkdir(parents=True, exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        json.dump(dados, f, ensure_ascii=False, indent=2)
+
+
+def carregar(caminho):
+    with open(caminho, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def comparar(atual, baseline, limite=0.25):
+    """Compara a mediana de cada benchmark com a baseline.
+
+    ``limite`` é a piora relativa tolerada (0.25 = 25% mais lento). A baseline pode
+    trazer limites próprios por benchmark em ``baseline["limites"][nome]``.
+    Devolve uma linha por benchmark presente nos dois lados.
+    """
+    limites = baseline.get("limites", {})
+    linhas = []
+    for nome, medida in atual["resultados"].items():
+        base = baseline["resultados"].get(nome)
+        if not base or "mediana_ms" not in medida or "mediana_ms" not in base:
+            continue
+        variacao = medida["mediana_ms"] / base["mediana_ms"] - 1 if base["mediana_ms"] else 0.0
+        tolerancia = limites.get(nome, limite)
+        linhas.append({"benchmark": nome, "baseline_ms": base["mediana_ms"], "atual_ms": medida["mediana_ms"],
+                       "variacao_%": round(variacao * 100, 1), "limite_%": round(tolerancia * 100, 1),
+                       "regressao": variacao > tolerancia})
+    return linhas
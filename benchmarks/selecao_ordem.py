@@ -0,0 +1,51 @@
+"""Benchmark da busca automática de ordem: tempo total x número de workers.
+
+Uso:
+    python benchmarks/selecao_ordem.py --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parents[1]
+pasta_modulos = str(RAIZ / "Streamlit")
+if pasta_modulos not in sys.path:
+    sys.path.append(pasta_modulos)
+from utils.selecao_ordem import buscar_ordem, gerar_candidatos
+
+
+def carregar_leite():
+    data = pd.read_csv(RAIZ / "Streamlit" / "03_Leite" / "producao_mensal_leite_litros.csv", header=None)
+    return pd.Series(data.iloc[:, 0].values,
+                     index=pd.date_range(start="2011-01-01", periods=len(data), freq="M"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--criterio", default="aic", choices=["aic", "bic"])
+    args = parser.parse_args()
+
+    serie = carregar_leite()
+    candidatos = gerar_candidatos(p=range(3), d=range(2), q=range(2),
+                                  P=range(2), D=range(2), Q=range(2), s=12)
+    print(f"{len(candidatos)} candidatos, série com {len(serie)} meses")
+
+    linhas = []
+    for w in args.workers:
+        busca = buscar_ordem(serie, candidatos, criterio=args.criterio, workers=w, usar_cache=False)
+        linhas.append({"workers": w, "tempo_s": round(busca.tempo_s, 2),
+                       "melhor": f"{busca.melhor[0]}x{busca.melhor[1]}"})
+        print(linhas[-1])
+
+    tabela = pd.DataFrame(linhas)
+    tabela["speedup"] = (tabela["tempo_s"].iloc[0] / tabela["tempo_s"]).round(2)
+    print(tabela.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
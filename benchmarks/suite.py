@@ -0,0 +1,102 @@
+"""Suíte de benchmarks de desempenho (visão e previsão), offline e em CPU.
+
+Grupos:
+  yolo       etapas do YOLO por frame e vazão em vídeo sintético (detection_epis.py)
+  tela       captura de tela -> detecção em Xvfb (ia_minecraft_tela.py)
+  streamlit  carga do modelo e predição nos apps dieta.py e veiculo.py
+  previsao   ajuste ARIMA/SARIMAX (Inflação.py e 03_Leite)
+
+Os resultados vão para um JSON (com os dados da máquina). Com ``--baseline`` a
+mediana de cada benchmark é comparada com a da baseline (benchmarks/baseline.json)
+e a saída é 1 se alguma piorar além do limite, se a baseline não existir ou se
+algum grupo falhar. Grupos sem as dependências (ImportError) ou sem o ambiente
+(RuntimeError, ex.: sem Xvfb) são pulados; qualquer outro erro conta como falha.
+
+Uso:
+    python benchmarks/suite.py --saida benchmarks/resultados.json
+    python benchmarks/suite.py --grupos previsao streamlit --baseline benchmarks/baseline.json
+    python benchmarks/suite.py --atualizar-baseline benchmarks/baseline.json
+"""
+import argparse
+import importlib
+import sys
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import comum
+
+GRUPOS = {"yolo": "bench_yolo", "tela": "bench_tela", "streamlit": "bench_streamlit", "previsao": "bench_previsao"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--grupos", nargs="+", choices=list(GRUPOS), default=list(GRUPOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--pesos", default=None, help="pesos YOLO locais (padrão: yolo11n.yaml, sem download)")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--saida", default="benchmarks/resultados.json")
+    parser.add_argument("--baseline", default=None, help="JSON de referência para detectar regressões")
+    parser.add_argument("--limite", type=float, default=0.25, help="piora relativa tolerada (0.25 = 25%%)")
+    parser.add_argument("--atualizar-baseline", default=None, metavar="CAMINHO",
+                        help="grava os resultados desta execução como nova baseline")
+    args = parser.parse_args()
+
+    resultados, pulados, falhas = {}, {}, {}
+    for grupo in args.grupos:
+        opcoes = {"repeticoes": args.repeticoes}
+        if grupo in ("yolo", "tela"):
+            opcoes["imgsz"] = args.imgsz
+            if args.pesos:
+                opcoes["pesos"] = args.pesos
+        print(f"▶ {grupo}...", flush=True)
+        inicio = time.perf_counter()
+        try:
+            modulo = importlib.import_module(GRUPOS[grupo])
+            medidas = modulo.executar(**opcoes)
+        except (ImportError, RuntimeError) as e:
+            pulados[grupo] = str(e)
+            print(f"  pulado: {e}")
+            continue
+        except Exception as e:
+            # Um grupo quebrado (ex.: modelo ou vídeo ausente) não interrompe os demais
+            falhas[grupo] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+            print(f"  ❌ falhou: {falhas[grupo]}")
+            continue
+        for nome, medida in medidas.items():
+            print(f"  {nome:<40} mediana {medida['mediana_ms']:>10.2f} ms | p95 {medida['p95_ms']:>10.2f} ms")
+        resultados.update(medidas)
+        print(f"  ({time.perf_counter() - inicio:.1f} s)")
+
+    dados = {"data": datetime.now().isoformat(timespec="seconds"), "ambiente": comum.ambiente(),
+             "parametros": {"repeticoes": args.repeticoes, "pesos": args.pesos, "imgsz": args.imgsz},
+             "resultados": resultados, "pulados": pulados, "falhas": falhas}
+    comum.salvar(args.saida, dados)
+    print(f"💾 Resultados em {args.saida}")
+
+    if args.atualizar_baseline:
+        comum.salvar(args.atualizar_baseline, dados)
+        print(f"📌 Baseline atualizada: {args.atualizar_baseline}")
+
+    codigo = 1 if falhas else 0
+    if args.baseline:
+        if not Path(args.baseline).exists():
+            print(f"❌ Baseline não encontrada: {args.baseline} (gere com --atualizar-baseline)")
+            return 1
+        linhas = comum.comparar(dados, comum.carregar(args.baseline), args.limite)
+        for l in linhas:
+            marca = "❌" if l["regressao"] else "✅"
+            print(f"{marca} {l['benchmark']:<40} {l['baseline_ms']:>10.2f} -> {l['atual_ms']:>10.2f} ms "
+                  f"({l['variacao_%']:+.1f}%, limite {l['limite_%']:.0f}%)")
+        if any(l["regressao"] for l in linhas):
+            codigo = 1
+    if falhas:
+        print(f"❌ Grupos com falha: {', '.join(falhas)}")
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,14 @@ import time
 import psutil
 import pandas as pd
 from ultralytics import YOLO
+from visao import perfil
+from visao.codificador import abrir_codificador
+from visao.epi import CONF_MIN, desenhar
+from visao.mapa_calor import MapaCalor
+from visao.sidecar import GravadorDeteccoes
+
+# Rastreamento opcional das etapas: LIA_PERFIL=trace.json ou --perfil trace.json [--cprofile 5:10]
+perfil.configurar()
 
 model = YOLO('model/best_br.pt')
 video = cv2.VideoCapture('videos/epi-2.mp4')
@@ -15,16 +23,34 @@ frame_width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
 frame_height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
 fps = int(video.get(cv2.CAP_PROP_FPS))
 
-output_video = cv2.VideoWriter(
+# Gravação em thread própria: FFmpeg/libx264 quando instalado, senão OpenCV (mp4v)
+output_video = abrir_codificador(
     'video/saved_predictions.mp4',
-    cv2.VideoWriter_fourcc(*'mp4v'),
-    fps, (frame_width, frame_height)
+    fps, (frame_width, frame_height),
+    codec='libx264', preset='veryfast', crf=23, threads=0
 )
 
+# Todas as caixas do YOLO (conf >= 0.25) vão para o sidecar; o replay (python -m visao.replay)
+# redesenha o vídeo ou refaz as estatísticas com outro limiar/cores/classes sem nova inferência
+CONF_INFERENCIA = 0.25
+sidecar = GravadorDeteccoes('video/deteccoes.parquet', model.names, video='videos/epi-2.mp4',
+                            modelo='model/best_br.pt', fps=fps, largura=frame_width, altura=frame_height,
+                            conf_inferencia=CONF_INFERENCIA)
+indice_frame = 0
+
+# Mapas de calor de sem_capacete/sem_colete com permanência por célula (memória fixa).
+# Exporta a cada INTERVALO_MAPA_S, com a tecla 'h' e no fim; re-render: python -m visao.mapa_calor
+PASTA_MAPA = 'video/mapa_calor'
+INTERVALO_MAPA_S = 300
+mapa_calor = MapaCalor(frame_width, frame_height, model.names, fps=fps)
+ultima_exportacao = time.time()
+
 metricas = []
 
 while True:
-    check, img = video.read()
+    perfil.tick()
+    with perfil.span("capture"):
+        check, img = video.read()
     if not check:
         print("Não foi possível ler o frame. Finalizando...")
         break
@@ -32,34 +58,37 @@ while True:
     inicio = time.time()
 
     # Predição YOLO
-    results = model(img, verbose=False)[0]
+    with perfil.span("inference"):
+        results = model(img, verbose=False, conf=CONF_INFERENCIA)[0]
     nomes = results.names
-
-    for box in results.boxes:
-        # Coordenadas da bounding box
-        x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
-
-        # Classe
-        cls = int(box.cls.item())
-        nomeClasse = nomes[cls]
-
-        # Confiança
-        conf = float(box.conf.item())
-        if conf < 0.4:
-            continue
-
-        # Texto na imagem
-        texto = f'{nomeClasse} - {conf:.2f}'
-        cv2.putText(img, texto, (x1, y1 - 10),
-                    cv2.FONT_HERSHEY_COMPLEX, 1, (255, 0, 0), 2)
-
-        # Bounding box por classe
-        if nomeClasse in ['pessoa', 'com_capacete', 'com_colete']:
-            cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 3)
-        elif nomeClasse in ['sem_capacete', 'sem_colete']:
-            cv2.rectangle(img, (x1, y1), (x2, y2), (0, 0, 255), 3)
-        else:
-            cv2.rectangle(img, (x1, y1), (x2, y2), (255, 255, 0), 3)
+    dados = results.boxes.data.cpu().numpy()
+    sidecar.adicionar(indice_frame, dados)
+    indice_frame += 1
+
+    with perfil.span("analytics"):
+        if mapa_calor.fundo is None:
+            mapa_calor.definir_fundo(img)
+        mapa_calor.adicionar(dados)
+
+    with perfil.span("postprocess"):
+        caixas = []
+        for box in results.boxes:
+            # Coordenadas da bounding box
+            x1, y1, x2, y2 = map(int, box.xyxy[0].tolist())
+
+            # Classe
+            cls = int(box.cls.item())
+            nomeClasse = nomes[cls]
+
+            # Confiança
+            conf = float(box.conf.item())
+            if conf < CONF_MIN:
+                continue
+            caixas.append((x1, y1, x2, y2, nomeClasse, conf))
+
+    with perfil.span("draw"):
+        # Texto + bounding box com cor por classe (verde com EPI, vermelho sem EPI)
+        desenhar(img, caixas)
 
     # Tempo de inferência e métricas
     tempo_inferencia = time.time() - inicio
@@ -71,20 +100,33 @@ while True:
         "Tempo_inferencia (s)": round(tempo_inferencia, 4),
         "FPS": round(fps_atual, 2),
         "Uso_CPU (%)": uso_cpu,
-        "Uso_Memória (%)": uso_memoria
+        "Uso_Memória (%)": uso_memoria,
+        "Fila_codificador": output_video.fila()
     })
 
     # Exibe e grava frame
-    cv2.imshow('IMG', img)
-    output_video.write(img)
+    with perfil.span("encode"):
+        output_video.write(img)
 
-    if cv2.waitKey(int(1000/fps)) & 0xFF == 27:
+    with perfil.span("ui"):
+        cv2.imshow('IMG', img)
+        tecla = cv2.waitKey(int(1000/fps))
+    if tecla & 0xFF == 27:
         break
+    if tecla & 0xFF == ord('h') or time.time() - ultima_exportacao >= INTERVALO_MAPA_S:
+        mapa_calor.exportar(PASTA_MAPA)
+        ultima_exportacao = time.time()
+        print(f"🌡️ Mapa de calor atualizado em '{PASTA_MAPA}': {mapa_calor.resumo()}")
 
 video.release()
+sidecar.fechar()
 output_video.release()
+print(f"Codificador: {output_video.metricas()}")
 cv2.destroyAllWindows()
 
+mapa_calor.exportar(PASTA_MAPA)
+print(f"🌡️ Mapa de calor salvo em '{PASTA_MAPA}': {mapa_calor.resumo()}")
+
 df = pd.DataFrame(metricas)
 df.to_excel("video/metricas_yolo.xlsx", index=False)
 print("Métricas salvas em 'video/metricas_yolo.xlsx'")
\ No newline at end of file
@@ -0,0 +1,303 @@
+"""Limpeza de dados em blocos (out-of-core) a partir das funções dos notebooks.
+
+Reúne ``trataFaltantes``, ``delDuplicatas`` e ``delInconsistencias`` (Aula 11 - Iris)
+e ``remove_outliers_iqr`` (Aula 12 - Student Performance) em um único plano:
+
+    plano = (PlanoLimpeza()
+             .preencher_media(['largura_sepala', 'comprimento_petala'], filtro={'classe': 'Iris-setosa'})
+             .remover_duplicatas()
+             .remover_inconsistencias(['comprimento_sepala', 'largura_sepala',
+                                       'comprimento_petala', 'largura_petala']))
+    df = plano.executar(fonte_csv('iris.csv', chunksize=100_000))
+
+Cada passo só devolve uma máscara booleana sobre o bloco; o bloco é recortado uma
+única vez no final, então nenhum passo materializa um DataFrame novo. Os passos
+que precisam de estatísticas globais (médias, contagem de hashes, quantis) ganham
+uma passada de ajuste sobre a fonte antes da passada final.
+"""
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------------------- fontes
+
+def fonte_csv(caminho, chunksize=100_000, **opcoes):
+    """Fonte re-iterável que lê o CSV em blocos"""
+    def blocos():
+        yield from pd.read_csv(caminho, chunksize=chunksize, **opcoes)
+    return blocos
+
+
+def fonte_parquet(caminho, chunksize=100_000, colunas=None):
+    """Fonte re-iterável que lê o Parquet em lotes"""
+    import pyarrow.parquet as pq
+
+    def blocos():
+        arquivo = pq.ParquetFile(caminho)
+        for lote in arquivo.iter_batches(batch_size=chunksize, columns=colunas):
+            yield lote.to_pandas()
+    return blocos
+
+
+def fonte_dataframe(df, chunksize=100_000):
+    """Fonte re-iterável sobre um DataFrame já em memória (cada bloco é uma cópia pequena)"""
+    def blocos():
+        for inicio in range(0, len(df), chunksize):
+            yield df.iloc[inicio:inicio + chunksize].copy()
+    return blocos
+
+
+def _hash_linhas(bloco, subset):
+    dados = bloco if subset is None else bloco[subset]
+    return pd.util.hash_pandas_object(dados, index=False).to_numpy()
+
+
+# ---------------------------------------------------------------- passos
+
+class Passo:
+    precisa_ajuste = False
+
+    def iniciar_ajuste(self):
+        pass
+
+    def acumular(self, bloco, mascara):
+        pass
+
+    def finalizar_ajuste(self):
+        pass
+
+    def iniciar(self):
+        """Zera o estado de streaming antes de cada passada"""
+        pass
+
+    def aplicar(self, bloco, mascara):
+        return mascara
+
+
+class PreencherMedia(Passo):
+    """Substitui nulos pela média da coluna (opcionalmente só das linhas que batem com ``filtro``)"""
+    precisa_ajuste = True
+
+    def __init__(self, colunas, filtro=None):
+        self.colunas = list(colunas)
+        self.filtro = filtro or {}
+        self.medias = {}
+
+    def iniciar_ajuste(self):
+        self._soma = dict.fromkeys(self.colunas, 0.0)
+        self._n = dict.fromkeys(self.colunas, 0)
+
+    def acumular(self, bloco, mascara):
+        base = mascara.copy()
+        for col, valor in self.filtro.items():
+            base &= (bloco[col] == valor).to_numpy()
+        for col in self.colunas:
+            valores = bloco[col].to_numpy(dtype=float)[base]
+            valores = valores[~np.isnan(valores)]
+            self._soma[col] += valores.sum()
+            self._n[col] += len(valores)
+
+    def finalizar_ajuste(self):
+        self.medias = {c: (self._soma[c] / self._n[c] if self._n[c] else np.nan) for c in self.colunas}
+
+    def aplicar(self, bloco, mascara):
+        for col, media in self.medias.items():
+            bloco[col] = bloco[col].fillna(media)
+        return mascara
+
+
+class RemoverDuplicatas(Passo):
+    """Mantém só a primeira ocorrência de cada linha, entre todos os blocos (hash de 64 bits)"""
+
+    def __init__(self, subset=None):
+        self.subset = subset
+
+    def iniciar(self):
+        self._vistos = np.empty(0, dtype=np.uint64)
+
+    def aplicar(self, bloco, mascara):
+        indices = np.flatnonzero(mascara)
+        if not len(indices):
+            return mascara
+        h = _hash_linhas(bloco.iloc[indices], self.subset)
+        _, primeiros = np.unique(h, return_index=True)
+        novo = np.zeros(len(h), dtype=bool)
+        novo[primeiros] = True
+        novo &= ~np.isin(h, self._vistos)
+        self._vistos = np.union1d(self._vistos, h[novo])
+        mascara = mascara.copy()
+        mascara[indices[~novo]] = False
+        return mascara
+
+
+class RemoverInconsistencias(Passo):
+    """Remove todas as linhas cujos valores em ``subset`` se repetem (drop_duplicates keep=False)"""
+    precisa_ajuste = True
+
+    def __init__(self, subset):
+        self.subset = list(subset)
+        self.repetidos = np.empty(0, dtype=np.uint64)
+
+    def iniciar_ajuste(self):
+        self._hashes = []
+
+    def acumular(self, bloco, mascara):
+        self._hashes.append(_hash_linhas(bloco.loc[mascara], self.subset))
+
+    def finalizar_ajuste(self):
+        todos = np.concatenate(self._hashes) if self._hashes else np.empty(0, dtype=np.uint64)
+        valores, contagem = np.unique(todos, return_counts=True)
+        self.repetidos = valores[contagem > 1]
+        self._hashes = []
+
+    def aplicar(self, bloco, mascara):
+        if not len(self.repetidos):
+            return mascara
+        return mascara & ~np.isin(_hash_linhas(bloco, self.subset), self.repetidos)
+
+
+class RemoverOutliersIQR(Passo):
+    """Filtra valores fora de [Q1 - k*IQR, Q3 + k*IQR] em cada coluna.
+
+    Os quartis vêm de uma amostra uniforme de tamanho fixo (bottom-k com chaves
+    aleatórias), então são exatos quando a base cabe na amostra e aproximados
+    nas bases grandes, com memória constante. Diferente do notebook, os limites
+    de todas as colunas são calculados sobre as mesmas linhas.
+    """
+    precisa_ajuste = True
+
+    def __init__(self, colunas, k=1.5, tamanho_amostra=200_000, seed=0):
+        self.colunas = list(colunas)
+        self.k = k
+        self.tamanho_amostra = tamanho_amostra
+        self.seed = seed
+        self.limites = {}
+
+    def iniciar_ajuste(self):
+        self._rng = np.random.default_rng(self.seed)
+        self._chaves = np.empty(0)
+        self._amostra = np.empty((0, len(self.colunas)))
+
+    def acumular(self, bloco, mascara):
+        valores = bloco.loc[mascara, self.colunas].to_numpy(dtype=float)
+        chaves = np.concatenate([self._chaves, self._rng.random(len(valores))])
+        amostra = np.concatenate([self._amostra, valores])
+        if len(chaves) > self.tamanho_amostra:
+            manter = np.argpartition(chaves, self.tamanho_amostra)[:self.tamanho_amostra]
+            chaves, amostra = chaves[manter], amostra[manter]
+        self._chaves, self._amostra = chaves, amostra
+
+    def finalizar_ajuste(self):
+        for i, col in enumerate(self.colunas):
+            q1, q3 = np.nanquantile(self._amostra[:, i], [0.25, 0.75])
+            iqr = q3 - q1
+            self.limites[col] = (q1 - self.k * iqr, q3 + self.k * iqr)
+        self._chaves = self._amostra = None
+
+    def aplicar(self, bloco, mascara):
+        for col, (inferior, superior) in self.limites.items():
+            valores = bloco[col].to_numpy(dtype=float)
+            mascara = mascara & (valores >= inferior) & (valores <= superior)
+        return mascara
+
+
+# ---------------------------------------------------------------- plano
+
+class PlanoLimpeza:
+    """Sequência de passos executada em blocos sobre uma fonte re-iterável"""
+
+    def __init__(self):
+        self.passos = []
+
+    def adicionar(self, passo):
+        self.passos.append(passo)
+        return self
+
+    def preencher_media(self, colunas, filtro=None):
+        return self.adicionar(PreencherMedia(colunas, filtro))
+
+    def remover_duplicatas(self, subset=None):
+        return self.adicionar(RemoverDuplicatas(subset))
+
+    def remover_inconsistencias(self, subset):
+        return self.adicionar(RemoverInconsistencias(subset))
+
+    def remover_outliers_iqr(self, colunas, k=1.5, tamanho_amostra=200_000):
+        return self.adicionar(RemoverOutliersIQR(colunas, k, tamanho_amostra))
+
+    def _passada(self, fonte, ate):
+        """Percorre a fonte aplicando os passos [0, ate) e devolve (bloco, máscara)"""
+        for passo in self.passos[:ate]:
+            passo.iniciar()
+        for bloco in fonte():
+            bloco = bloco.reset_index(drop=True)
+            mascara = np.ones(len(bloco), dtype=bool)
+            for passo in self.passos[:ate]:
+                mascara = passo.aplicar(bloco, mascara)
+            yield bloco, mascara
+
+    def ajustar(self, fonte):
+        """Uma passada de ajuste para cada passo que precisa de estatísticas globais"""
+        for i, passo in enumerate(self.passos):
+            if passo.precisa_ajuste:
+                passo.iniciar_ajuste()
+                for bloco, mascara in self._passada(fonte, i):
+                    passo.acumular(bloco, mascara)
+                passo.finalizar_ajuste()
+        return self
+
+    def blocos_limpos(self, fonte):
+        """Gera os blocos já limpos (depois de ``ajustar``)"""
+        for bloco, mascara in self._passada(fonte, len(self.passos)):
+            if mascara.any():
+                yield bloco.loc[mascara]
+
+    def executar(self, fonte, destino=None):
+        """Ajusta e aplica o plano. Sem ``destino`` devolve um DataFrame; com um caminho
+        ``.parquet`` ou ``.csv`` grava os blocos incrementalmente e devolve o total de linhas."""
+        self.ajustar(fonte)
+        if destino is None:
+            partes = list(self.blocos_limpos(fonte))
+            return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+        total = 0
+        if str(destino).endswith(".parquet"):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            escritor = None
+            try:
+                for bloco in self.blocos_limpos(fonte):
+                    tabela = pa.Table.from_pandas(bloco, preserve_index=False)
+                    if escritor is None:
+                        escritor = pq.ParquetWriter(destino, tabela.schema)
+                    escritor.write_table(tabela)
+                    total += len(bloco)
+            finally:
+                if escritor is not None:
+                    escritor.close()
+        else:
+            for i, bloco in enumerate(self.blocos_limpos(fonte)):
+                bloco.to_csv(destino, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                total += len(bloco)
+        return total
+
+
+# ---------------------------------------------------------------- planos dos notebooks
+
+COLUNAS_IRIS = ['comprimento_sepala', 'largura_sepala', 'comprimento_petala', 'largura_petala']
+
+
+def plano_iris():
+    """trataFaltantes + delDuplicatas + delInconsistencias (Aula 11)"""
+    return (PlanoLimpeza()
+            .preencher_media(['largura_sepala', 'comprimento_petala'], filtro={'classe': 'Iris-setosa'})
+            .remover_duplicatas()
+            .remover_inconsistencias(COLUNAS_IRIS))
+
+
+def plano_student():
+    """delDuplicatas + remove_outliers_iqr nas quatro colunas do notebook (Aula 12)"""
+    return (PlanoLimpeza()
+            .remover_duplicatas()
+            .remover_outliers_iqr(['weekly_self_study_hours', 'attendance_percentage',
+                                   'class_participation', 'total_score']))
@@ -0,0 +1,9 @@
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+# Mesmos caminhos que os apps e scripts acrescentam: raiz (visao, limpeza_dados) e Streamlit (utils)
+for pasta in (str(RAIZ), str(RAIZ / "Streamlit")):
+    if pasta not in sys.path:
+        sys.path.append(pasta)
@@ -0,0 +1,23 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+from utils.backtest import COLUNAS_RESUMO, comparar_janelas, preencher_lacunas
+
+
+def test_preencher_lacunas_corta_bordas_e_interpola_o_meio():
+    valores = [np.nan, np.nan, 1.0, 2.0, np.nan, 4.0, np.nan]
+    np.testing.assert_allclose(preencher_lacunas(valores), [1.0, 2.0, 3.0, 4.0])
+
+
+def test_preencher_lacunas_recusa_lacuna_interna_longa():
+    valores = [1.0, np.nan, np.nan, np.nan, np.nan, 6.0]
+    with pytest.raises(ValueError):
+        preencher_lacunas(valores, max_lacuna=3)
+
+
+def test_comparar_janelas_serie_curta_devolve_tabela_vazia():
+    tabela = comparar_janelas(np.arange(10, dtype=float), [12, 24], horizonte=6)
+    assert tabela.empty
+    assert list(tabela.columns) == COLUNAS_RESUMO
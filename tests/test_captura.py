@@ -0,0 +1,67 @@
+from visao.captura import CapturaFrames, PROP_FRAME_COUNT, PROP_POS_FRAMES
+
+
+class _CapturaFalsa:
+    """Entrega ``n`` frames e depois falha; ``total`` é o FRAME_COUNT informado (0 em streams ao vivo)"""
+
+    def __init__(self, n, total):
+        self.n = n
+        self.total = total
+        self.pos = 0
+
+    def isOpened(self):
+        return True
+
+    def read(self):
+        if self.pos >= self.n:
+            return False, None
+        self.pos += 1
+        return True, self.pos
+
+    def get(self, propriedade):
+        return {PROP_FRAME_COUNT: self.total, PROP_POS_FRAMES: self.pos}.get(propriedade, 0)
+
+    def release(self):
+        pass
+
+
+def _ler_tudo(video):
+    frames = []
+    while True:
+        check, frame = video.read(timeout=5)
+        if not check:
+            return frames
+        frames.append(frame)
+
+
+def test_fim_de_vod_encerra_sem_reconectar():
+    aberturas = []
+
+    def abrir(endereco):
+        aberturas.append(endereco)
+        return _CapturaFalsa(3, total=3)
+
+    with CapturaFrames("http://vod/video.mp4", modo="fila", abrir=abrir, backoff_inicial=0.01) as video:
+        assert _ler_tudo(video) == [1, 2, 3]
+        assert video.fim_da_origem and video.reconexoes == 0
+    assert len(aberturas) == 1
+
+
+def test_falha_em_stream_ao_vivo_reconecta_ate_o_limite():
+    aberturas = []
+
+    def abrir(endereco):
+        aberturas.append(endereco)
+        return _CapturaFalsa(2, total=0)
+
+    with CapturaFrames("rtsp://camera", modo="fila", abrir=abrir, backoff_inicial=0.01,
+                       max_tentativas=2) as video:
+        assert _ler_tudo(video) == [1, 2, 1, 2, 1, 2]
+        assert not video.fim_da_origem and video.reconexoes == 2
+
+
+def test_fim_e_erro_reconecta_mesmo_no_fim():
+    with CapturaFrames("http://playlist", modo="fila", abrir=lambda e: _CapturaFalsa(1, total=1),
+                       backoff_inicial=0.01, max_tentativas=1, fim_e_erro=True) as video:
+        assert _ler_tudo(video) == [1, 1]
+        assert video.reconexoes == 1
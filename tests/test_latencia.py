@@ -0,0 +1,40 @@
+import pytest
+
+from visao.latencia import ControladorLatencia, detectar_frame
+
+
+class _ModeloFalso:
+    names = {0: "pessoa"}
+
+    def __init__(self):
+        self.chamadas = []
+
+    def predict(self, img, **opcoes):
+        self.chamadas.append(opcoes)
+        return []
+
+
+def test_registrar_desce_e_volta_com_histerese():
+    controle = ControladorLatencia(alvo_ms=50, janela=10, min_amostras=5)
+    for _ in range(4):
+        assert controle.registrar(80) is None
+    decisao = controle.registrar(80)
+    assert (decisao["de_imgsz"], decisao["imgsz"]) == (640, 480)
+    # Janela zerada depois da troca: nada muda antes de juntar min_amostras de novo
+    assert controle.registrar(1) is None
+    for _ in range(4):
+        decisao = controle.registrar(1) or decisao
+    assert controle.imgsz == 640 and decisao["motivo"] == "folga no orçamento"
+
+
+def test_detectar_frame_so_prediz_nos_frames_escolhidos():
+    pytest.importorskip("cv2")
+    np = pytest.importorskip("numpy")
+    modelo = _ModeloFalso()
+    controle = ControladorLatencia(alvo_ms=50, nivel_inicial=4)  # 320 px, 1 a cada 3 frames
+    img = np.zeros((32, 32, 3), dtype=np.uint8)
+    for _ in range(7):
+        detectar_frame(modelo, img, controle, [])
+    assert len(modelo.chamadas) == 3
+    assert all(c == {"imgsz": 320, "verbose": False} for c in modelo.chamadas)
+    assert controle.processados == 3
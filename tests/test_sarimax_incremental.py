@@ -0,0 +1,60 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("statsmodels")
+
+from utils.sarimax_incremental import MODO_COMPLETO, MODO_FILTRO, MODO_WARM, PrevisorIncremental
+
+
+def serie_mensal(n, seed=0):
+    rng = np.random.default_rng(seed)
+    indice = pd.date_range("2000-01-01", periods=n, freq="MS")
+    sazonal = 10 * np.sin(2 * np.pi * np.arange(n) / 12)
+    return pd.Series(600 + sazonal + rng.normal(0, 1, n), index=indice)
+
+
+def test_sincronizar_continuacao_filtra_so_os_meses_novos():
+    serie = serie_mensal(72)
+    previsor = PrevisorIncremental(order=(1, 0, 0), seasonal_order=(0, 1, 1, 12))
+    previsor.sincronizar(serie.iloc[:60])
+    params = previsor.resultado.params.copy()
+
+    previsor.sincronizar(serie, modo=MODO_FILTRO)
+
+    assert [h["modo"] for h in previsor.historico] == [MODO_COMPLETO, MODO_FILTRO]
+    assert previsor.historico[-1]["observacoes"] == 12
+    assert len(previsor.serie) == 72
+    # No modo filtro os parâmetros ficam congelados; o resultado equivale a filtrar a série inteira
+    np.testing.assert_allclose(previsor.resultado.params, params)
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+    filtrado = SARIMAX(serie, order=(1, 0, 0), seasonal_order=(0, 1, 1, 12)).filter(params)
+    np.testing.assert_allclose(previsor.forecast(6), filtrado.forecast(6), rtol=1e-6)
+
+
+def test_sincronizar_mesma_serie_nao_reajusta():
+    serie = serie_mensal(48)
+    previsor = PrevisorIncremental(order=(1, 0, 0), seasonal_order=(0, 1, 1, 12))
+    previsor.sincronizar(serie)
+    resultado = previsor.resultado
+
+    assert previsor.sincronizar(serie.copy(), modo=MODO_WARM) is resultado
+    assert len(previsor.historico) == 1
+
+
+def test_sincronizar_historico_alterado_faz_ajuste_completo():
+    serie = serie_mensal(60)
+    previsor = PrevisorIncremental(order=(1, 0, 0), seasonal_order=(0, 1, 1, 12))
+    previsor.sincronizar(serie.iloc[:48])
+
+    alterada = serie.copy()
+    alterada.iloc[10] += 50
+    previsor.sincronizar(alterada, modo=MODO_FILTRO)
+
+    assert [h["modo"] for h in previsor.historico] == [MODO_COMPLETO, MODO_COMPLETO]
+    assert previsor.historico[-1]["tamanho_serie"] == 60
+
+
+def test_atualizar_sem_ajuste_levanta_erro():
+    with pytest.raises(ValueError):
+        PrevisorIncremental().atualizar(serie_mensal(3))
@@ -0,0 +1 @@
+# Módulos compartilhados pelos scripts de detecção (YOLO em vídeo, tela e webcam)
@@ -0,0 +1,211 @@
+"""Leitura de vídeo em uma thread própria, com reconexão e só o frame mais recente.
+
+Dois modos:
+  - ``ultimo`` (streams, webcam): a thread lê sem parar e guarda só o frame mais
+    novo; se o consumidor (inferência) for mais lento, os frames antigos são
+    descartados em vez de acumularem no buffer do OpenCV;
+  - ``fila`` (arquivos): fila limitada; a thread espera quando a fila enche,
+    então nenhum frame se perde e a leitura do próximo já está adiantada.
+O modo padrão é ``fila`` para caminhos de arquivo existentes e ``ultimo`` para o resto.
+
+Quando a leitura falha em um stream, a conexão é reaberta com espera
+exponencial (0,5 s, 1 s, 2 s ... até ``backoff_max``). O fim de um vídeo sob
+demanda (URL HTTP de um arquivo, VOD) não é falha: se a origem informa o total
+de frames e a posição já chegou nele, a leitura termina sem reconectar
+(``fim_e_erro=True`` volta a reconectar, para playlists ao vivo que se repetem).
+``origem`` pode ser uma
+função que devolve a URL, para URLs que expiram (ex.: yt-dlp) serem resolvidas
+de novo a cada reconexão.
+
+Mesma interface do cv2.VideoCapture (``read``/``release``/``get``):
+
+    video = CapturaFrames(stream_url)
+    check, img = video.read()
+    video.metricas()   # lidos, entregues, descartados, reconexoes, atraso_ms...
+
+Teste local (arquivo ou stand-in RTSP/HTTP, ex.: ``ffmpeg -re -i v.mp4 -f mpegts http://...``):
+    python -m visao.captura videos/epi-2.mp4 --atraso-ms 100
+    python -m visao.captura rtsp://localhost:8554/teste --modo ultimo --atraso-ms 100
+"""
+import argparse
+import os
+import threading
+import time
+from collections import deque
+
+MODO_ULTIMO = "ultimo"
+MODO_FILA = "fila"
+
+# Mesmos valores de cv2.CAP_PROP_POS_FRAMES e cv2.CAP_PROP_FRAME_COUNT (sem importar o cv2 aqui)
+PROP_POS_FRAMES = 1
+PROP_FRAME_COUNT = 7
+
+
+class CapturaFrames:
+    def __init__(self, origem, modo=None, tamanho_fila=8, reconectar=True, backoff_inicial=0.5,
+                 backoff_max=10.0, max_tentativas=None, fim_e_erro=False, abrir=None):
+        self.origem = origem
+        self.arquivo = isinstance(origem, str) and os.path.isfile(origem)
+        self.modo = modo or (MODO_FILA if self.arquivo else MODO_ULTIMO)
+        self.tamanho_fila = tamanho_fila if self.modo == MODO_FILA else 1
+        self.reconectar = reconectar
+        self.backoff_inicial = backoff_inicial
+        self.backoff_max = backoff_max
+        self.max_tentativas = max_tentativas
+        self.fim_e_erro = fim_e_erro
+        if abrir is None:
+            import cv2
+            abrir = cv2.VideoCapture
+        self._abrir = abrir
+
+        self._frames = deque()
+        self._cond = threading.Condition()
+        self._parar = threading.Event()
+        self._fim = False
+        self.fim_da_origem = False
+
+        self.lidos = 0
+        self.entregues = 0
+        self.descartados = 0
+        self.reconexoes = 0
+        self.falhas_leitura = 0
+        self.atraso_ms = 0.0
+        self.atraso_max_ms = 0.0
+
+        self._cap = self._conectar()
+        if self._cap is None:
+            raise ConnectionError(f"Não foi possível abrir a origem de vídeo: {self._descrever()}")
+        self._thread = threading.Thread(target=self._ler_continuamente, name="captura", daemon=True)
+        self._thread.start()
+
+    def _descrever(self):
+        return self.origem if isinstance(self.origem, (str, int)) else getattr(self.origem, "__name__", "origem")
+
+    def _conectar(self):
+        endereco = self.origem() if callable(self.origem) else self.origem
+        if endereco is None:
+            return None
+        cap = self._abrir(endereco)
+        if not cap.isOpened():
+            cap.release()
+            return None
+        return cap
+
+    def _reconectar(self):
+        """Reabre a origem com espera exponencial; False se desistir ou se pediram para parar"""
+        espera = self.backoff_inicial
+        tentativas = 0
+        self._cap.release()
+        while not self._parar.is_set():
+            if self.max_tentativas is not None and tentativas >= self.max_tentativas:
+                return False
+            tentativas += 1
+            print(f"🔌 Reconectando em {espera:.1f} s (tentativa {tentativas})...")
+            if self._parar.wait(espera):
+                return False
+            cap = self._conectar()
+            if cap is not None:
+                self._cap = cap
+                self.reconexoes += 1
+                return True
+            espera = min(espera * 2, self.backoff_max)
+        return False
+
+    def _chegou_ao_fim(self):
+        """True se a origem tem duração conhecida e a posição já está no último frame"""
+        total = self._cap.get(PROP_FRAME_COUNT)
+        return total > 0 and self._cap.get(PROP_POS_FRAMES) >= total - 1
+
+    def _ler_continuamente(self):
+        while not self._parar.is_set():
+            ok, frame = self._cap.read()
+            if not ok:
+                if self.arquivo or (not self.fim_e_erro and self._chegou_ao_fim()):
+                    self.fim_da_origem = True
+                    break
+                self.falhas_leitura += 1
+                if not self.reconectar or not self._reconectar():
+                    break
+                continue
+            self.lidos += 1
+            with self._cond:
+                if self.modo == MODO_FILA:
+                    while len(self._frames) >= self.tamanho_fila and not self._parar.is_set():
+                        self._cond.wait(0.1)
+                elif self._frames:
+                    # O consumidor não pegou o anterior: fica só o mais novo
+                    self._frames.popleft()
+                    self.descartados += 1
+                self._frames.append((frame, time.perf_counter()))
+                self._cond.notify_all()
+        with self._cond:
+            self._fim = True
+            self._cond.notify_all()
+        self._cap.release()
+
+    def read(self, timeout=None):
+        """(True, frame) com o próximo frame; (False, None) no fim da origem ou no timeout"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._frames or self._fim, timeout):
+                return False, None
+            if not self._frames:
+                return False, None
+            frame, capturado = self._frames.popleft()
+            self._cond.notify_all()
+        self.entregues += 1
+        self.atraso_ms = (time.perf_counter() - capturado) * 1000
+        self.atraso_max_ms = max(self.atraso_max_ms, self.atraso_ms)
+        return True, frame
+
+    ler = read
+
+    def get(self, propriedade):
+        return self._cap.get(propriedade)
+
+    def isOpened(self):
+        return not self._fim or bool(self._frames)
+
+    def release(self):
+        self._parar.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+
+    parar = release
+
+    def metricas(self):
+        return {"modo": self.modo, "lidos": self.lidos, "entregues": self.entregues,
+                "descartados": self.descartados, "reconexoes": self.reconexoes,
+                "falhas_leitura": self.falhas_leitura, "fim_da_origem": self.fim_da_origem,
+                "fila": len(self._frames),
+                "atraso_ms": round(self.atraso_ms, 1), "atraso_max_ms": round(self.atraso_max_ms, 1)}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste da captura com consumidor lento")
+    parser.add_argument("origem", help="arquivo, URL RTSP/HTTP ou índice da webcam")
+    parser.add_argument("--modo", choices=[MODO_ULTIMO, MODO_FILA], default=None)
+    parser.add_argument("--atraso-ms", type=float, default=100.0, help="tempo simulado de inferência por frame")
+    parser.add_argument("--segundos", type=float, default=10.0)
+    args = parser.parse_args()
+
+    origem = int(args.origem) if args.origem.isdigit() else args.origem
+    with CapturaFrames(origem, modo=args.modo) as video:
+        fim = time.perf_counter() + args.segundos
+        while time.perf_counter() < fim:
+            check, img = video.read(timeout=5)
+            if not check:
+                break
+            time.sleep(args.atraso_ms / 1000)
+        print(video.metricas())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Gravação do vídeo anotado em uma thread própria, via FFmpeg (x264/x265) ou OpenCV.
+
+Os frames entram em uma fila limitada e uma thread separada os escreve, então o
+laço de inferência só paga a cópia para a fila. Com FFmpeg instalado os frames
+BGR crus vão pelo stdin para o libx264/libx265 (preset, CRF e threads
+configuráveis), com arquivos bem menores que o mp4v; sem FFmpeg o mesmo
+fluxo usa o cv2.VideoWriter.
+
+Mesma interface do cv2.VideoWriter (``write``/``release``):
+
+    saida = abrir_codificador('video/saida.mp4', fps, (largura, altura), preset='veryfast', crf=23)
+    saida.write(img)   # o frame não deve ser alterado depois do write (a escrita é assíncrona)
+    saida.release()
+    saida.metricas()   # frames, fps de codificação, fila atual e máxima, espera do produtor
+"""
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+
+_FIM = object()
+
+
+def caminho_ffmpeg():
+    """Executável do FFmpeg (variável LIA_FFMPEG ou o do PATH), ou None"""
+    return os.environ.get("LIA_FFMPEG") or shutil.which("ffmpeg")
+
+
+class _CodificadorEmThread:
+    """Fila limitada + thread de escrita; as subclasses implementam _gravar e _fechar"""
+
+    backend = None
+
+    def __init__(self, tamanho_fila=32):
+        self._fila = queue.Queue(maxsize=tamanho_fila)
+        self._erro = None
+        self.frames = 0
+        self.tempo_gravacao = 0.0
+        self.espera_produtor = 0.0
+        self.fila_max = 0
+        self._thread = threading.Thread(target=self._escrever, name="codificador", daemon=True)
+        self._thread.start()
+
+    def _escrever(self):
+        while True:
+            frame = self._fila.get()
+            if frame is _FIM:
+                break
+            if self._erro is not None:
+                continue
+            inicio = time.perf_counter()
+            try:
+                self._gravar(frame)
+            except Exception as e:
+                self._erro = e
+                continue
+            self.tempo_gravacao += time.perf_counter() - inicio
+            self.frames += 1
+
+    def write(self, frame):
+        if self._erro is not None:
+            raise RuntimeError(f"Falha no codificador ({self.backend}): {self._erro}") from self._erro
+        inicio = time.perf_counter()
+        # Bloqueia quando a fila enche: a memória fica limitada e o atraso aparece em espera_produtor
+        self._fila.put(frame)
+        self.espera_produtor += time.perf_counter() - inicio
+        self.fila_max = max(self.fila_max, self._fila.qsize())
+
+    def release(self):
+        self._fila.put(_FIM)
+        self._thread.join()
+        self._fechar()
+        if self._erro is not None:
+            raise RuntimeError(f"Falha no codificador ({self.backend}): {self._erro}") from self._erro
+
+    def fila(self):
+        return self._fila.qsize()
+
+    def metricas(self):
+        return {"backend": self.backend, "frames": self.frames,
+                "fps_codificacao": round(self.frames / self.tempo_gravacao, 1) if self.tempo_gravacao else 0.0,
+                "fila": self.fila(), "fila_max": self.fila_max,
+                "espera_produtor_s": round(self.espera_produtor, 3)}
+
+
+class CodificadorFFmpeg(_CodificadorEmThread):
+    def __init__(self, caminho, fps, tamanho, codec="libx264", preset="veryfast", crf=23, threads=0,
+                 tamanho_fila=32, ffmpeg=None):
+        self.backend = f"ffmpeg/{codec}"
+        largura, altura = tamanho
+        comando = [ffmpeg or caminho_ffmpeg(), "-y", "-loglevel", "error",
+                   "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{largura}x{altura}", "-r", str(fps), "-i", "-",
+                   "-an", "-c:v", codec, "-preset", preset, "-crf", str(crf), "-threads", str(threads),
+                   # yuv420p exige largura e altura pares
+                   "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", "-movflags", "+faststart"]
+        if codec == "libx265":
+            comando += ["-tag:v", "hvc1"]
+        self._processo = subprocess.Popen(comando + [caminho], stdin=subprocess.PIPE)
+        super().__init__(tamanho_fila)
+
+    def _gravar(self, frame):
+        self._processo.stdin.write(frame.tobytes() if not frame.flags.c_contiguous else frame.data)
+
+    def _fechar(self):
+        try:
+            self._processo.stdin.close()
+        except BrokenPipeError:
+            pass
+        if self._processo.wait() != 0 and self._erro is None:
+            self._erro = RuntimeError(f"ffmpeg terminou com código {self._processo.returncode}")
+
+
+class CodificadorOpenCV(_CodificadorEmThread):
+    def __init__(self, caminho, fps, tamanho, fourcc="mp4v", tamanho_fila=32):
+        import cv2
+        self.backend = f"opencv/{fourcc}"
+        self._saida = cv2.VideoWriter(caminho, cv2.VideoWriter_fourcc(*fourcc), fps, tamanho)
+        super().__init__(tamanho_fila)
+
+    def _gravar(self, frame):
+        self._saida.write(frame)
+
+    def _fechar(self):
+        self._saida.release()
+
+
+def abrir_codificador(caminho, fps, tamanho, codec="libx264", preset="veryfast", crf=23, threads=0,
+                      tamanho_fila=32):
+    """FFmpeg quando disponível; senão cv2.VideoWriter (mp4v) com o mesmo fluxo em thread"""
+    if caminho_ffmpeg():
+        return CodificadorFFmpeg(caminho, fps, tamanho, codec, preset, crf, threads, tamanho_fila)
+    print("⚠️ FFmpeg não encontrado; gravando com OpenCV (mp4v)")
+    return CodificadorOpenCV(caminho, fps, tamanho, tamanho_fila=tamanho_fila)
@@ -0,0 +1,27 @@
+"""Classes, cores e desenho das detecções de EPI (mesmo padrão do detection_epis.py)."""
+import cv2
+
+CONF_MIN = 0.4
+
+# Cores BGR por classe; classes fora do dicionário usam COR_OUTRAS
+CORES = {
+    'pessoa': (0, 255, 0),
+    'com_capacete': (0, 255, 0),
+    'com_colete': (0, 255, 0),
+    'sem_capacete': (0, 0, 255),
+    'sem_colete': (0, 0, 255),
+}
+COR_OUTRAS = (255, 255, 0)
+COR_TEXTO = (255, 0, 0)
+
+# Classes que indicam falta de EPI
+CLASSES_VIOLACAO = ('sem_capacete', 'sem_colete')
+
+
+def desenhar(img, caixas, cores=CORES):
+    """Desenha [(x1, y1, x2, y2, nomeClasse, conf)] com texto e retângulo por classe"""
+    for x1, y1, x2, y2, nomeClasse, conf in caixas:
+        x1, y1, x2, y2 = int(x1), int(y1), int(x2), int(y2)
+        cv2.putText(img, f'{nomeClasse} - {conf:.2f}', (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_COMPLEX, 1, COR_TEXTO, 2)
+        cv2.rectangle(img, (x1, y1), (x2, y2), cores.get(nomeClasse, COR_OUTRAS), 3)
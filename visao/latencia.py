@@ -0,0 +1,164 @@
+"""Controle da latência por frame em vídeo ao vivo (webcam, stream).
+
+O controlador mede a latência de cada frame processado e ajusta dois botões:
+o ``imgsz`` do YOLO (ex.: 320/480/640) e o salto de frames (processar 1 a cada N).
+Os níveis formam uma escada, do melhor para o mais barato:
+
+    640/1 -> 480/1 -> 320/1 -> 320/2 -> 320/3 -> 320/4
+
+Com salto N, o orçamento de um frame processado é N x alvo (os frames pulados
+só são lidos e exibidos com as últimas caixas). A decisão usa o p95 de uma
+janela móvel, com histerese:
+  - desce um degrau quando p95 > orçamento;
+  - sobe um degrau só se o custo estimado no degrau de cima ficar abaixo de
+    ``margem`` x orçamento (o custo do YOLO cresce com imgsz²);
+  - depois de cada troca a janela é zerada e nada muda até juntar ``min_amostras``.
+
+Uso (o laço que os scripts de vídeo compartilham):
+    controle = ControladorLatencia(alvo_ms=66)
+    caixas = []
+    while True:
+        check, img = video.read()
+        caixas = detectar_frame(model, img, controle, caixas)
+        cv2.imshow('...', img)
+
+Só o ``model.predict`` entra na medição: extrair e desenhar as caixas fica de fora.
+"""
+import csv
+import time
+from collections import deque
+
+TAMANHOS = (640, 480, 320)
+
+
+def escada(tamanhos=TAMANHOS, max_salto=4):
+    """Níveis (imgsz, salto) do mais caro para o mais barato"""
+    tamanhos = sorted(tamanhos, reverse=True)
+    return [(t, 1) for t in tamanhos] + [(tamanhos[-1], s) for s in range(2, max_salto + 1)]
+
+
+class ControladorLatencia:
+    def __init__(self, alvo_ms=66.0, tamanhos=TAMANHOS, max_salto=4, janela=30, min_amostras=None,
+                 margem=0.8, nivel_inicial=0):
+        self.alvo_ms = alvo_ms
+        self.niveis = escada(tamanhos, max_salto)
+        self.nivel = nivel_inicial
+        self.margem = margem
+        self.min_amostras = min_amostras or max(5, janela // 2)
+        self.latencias = deque(maxlen=janela)
+        self.decisoes = []
+        self.frames = 0
+        self.processados = 0
+
+    @property
+    def imgsz(self):
+        return self.niveis[self.nivel][0]
+
+    @property
+    def salto(self):
+        return self.niveis[self.nivel][1]
+
+    def orcamento(self, nivel=None):
+        return self.alvo_ms * self.niveis[self.nivel if nivel is None else nivel][1]
+
+    def p95(self):
+        if not self.latencias:
+            return 0.0
+        ordenadas = sorted(self.latencias)
+        return float(ordenadas[min(len(ordenadas) - 1, int(0.95 * len(ordenadas)))])
+
+    def processar_frame(self):
+        """True se o frame atual deve passar pelo modelo (os demais só são exibidos)"""
+        processar = self.frames % self.salto == 0
+        self.frames += 1
+        return processar
+
+    def _custo_estimado(self, p95, nivel):
+        atual, novo = self.niveis[self.nivel][0], self.niveis[nivel][0]
+        return p95 * (novo / atual) ** 2
+
+    def registrar(self, latencia_ms):
+        """Registra a latência de um frame processado e decide se troca de nível"""
+        self.processados += 1
+        self.latencias.append(latencia_ms)
+        if len(self.latencias) < self.min_amostras:
+            return None
+        p95 = self.p95()
+        if p95 > self.orcamento() and self.nivel < len(self.niveis) - 1:
+            return self._trocar(self.nivel + 1, p95, "p95 acima do orçamento")
+        if self.nivel > 0:
+            acima = self.nivel - 1
+            if self._custo_estimado(p95, acima) < self.margem * self.orcamento(acima):
+                return self._trocar(acima, p95, "folga no orçamento")
+        return None
+
+    def _trocar(self, nivel, p95, motivo):
+        de = self.niveis[self.nivel]
+        self.nivel = nivel
+        self.latencias.clear()
+        decisao = {"frame": self.frames, "p95_ms": round(p95, 1), "orcamento_ms": round(self.orcamento(), 1),
+                   "de_imgsz": de[0], "de_salto": de[1], "imgsz": self.imgsz, "salto": self.salto,
+                   "motivo": motivo}
+        self.decisoes.append(decisao)
+        return decisao
+
+    def estado(self):
+        """Métricas atuais (para exibir no frame ou gravar junto com as demais)"""
+        return {"alvo_ms": self.alvo_ms, "imgsz": self.imgsz, "salto": self.salto,
+                "p95_ms": round(self.p95(), 1), "frames": self.frames, "processados": self.processados,
+                "trocas": len(self.decisoes)}
+
+    def texto(self):
+        e = self.estado()
+        return f"imgsz {e['imgsz']} | 1/{e['salto']} | p95 {e['p95_ms']:.0f}/{self.orcamento():.0f} ms"
+
+    def predict(self, model, img, **opcoes):
+        """``model.predict`` no imgsz atual, cronometrado e registrado; devolve (results, decisao)"""
+        inicio = time.perf_counter()
+        results = model.predict(img, imgsz=self.imgsz, verbose=False, **opcoes)
+        decisao = self.registrar((time.perf_counter() - inicio) * 1000)
+        return results, decisao
+
+    def salvar_decisoes(self, caminho):
+        colunas = ["frame", "p95_ms", "orcamento_ms", "de_imgsz", "de_salto", "imgsz", "salto", "motivo"]
+        with open(caminho, "w", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=colunas)
+            escritor.writeheader()
+            escritor.writerows(self.decisoes)
+
+
+def extrair_caixas(results, nomes):
+    """[(x1, y1, x2, y2, classe, confiança)] de todas as detecções de ``results``"""
+    caixas = []
+    for result in results:
+        for box in result.boxes:
+            x1, y1, x2, y2 = map(int, box.xyxy[0])
+            cls = int(box.cls[0])
+            caixas.append((x1, y1, x2, y2, nomes[cls] if cls in nomes else 'Desconhecido', float(box.conf[0])))
+    return caixas
+
+
+def desenhar(img, caixas, controle=None):
+    """Desenha as caixas (e o estado do controle, se houver) direto em ``img``"""
+    import cv2
+    for x1, y1, x2, y2, classe, confianca in caixas:
+        cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(img, f'{classe} ({confianca:.2f})', (x1, y1 - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+    if controle is not None:
+        cv2.putText(img, controle.texto(), (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+
+
+def detectar_frame(model, img, controle, caixas):
+    """Um passo do laço de vídeo: prediz se o controle escolher este frame e desenha.
+
+    Nos frames pulados as caixas desenhadas são as do último frame processado;
+    devolve as caixas atuais para a chamada seguinte.
+    """
+    if controle.processar_frame():
+        results, decisao = controle.predict(model, img)
+        caixas = extrair_caixas(results, model.names)
+        if decisao:
+            print(f"⚙️ {decisao['motivo']}: imgsz {decisao['imgsz']}, 1 a cada {decisao['salto']} frames "
+                  f"(p95 {decisao['p95_ms']} ms)")
+    desenhar(img, caixas, controle)
+    return caixas
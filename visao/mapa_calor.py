@@ -0,0 +1,229 @@
+"""Mapas de calor incrementais das detecções de EPI, com permanência por célula.
+
+O frame é dividido em células de ``celula`` pixels e, para cada classe
+acompanhada (por padrão as de falta de EPI), grades NumPy pré-alocadas
+acumulam a cada frame:
+  - ``contagem``: centros de caixa que caíram na célula;
+  - ``area``: soma da área das caixas (fração do frame; a média indica a proximidade da câmera);
+  - ``frames_ocupados``: frames com pelo menos uma detecção na célula (permanência total);
+  - ``sequencia`` / ``sequencia_max``: frames seguidos ocupados agora e o maior trecho contínuo.
+As grades têm tamanho fixo, então a memória não cresce com a duração do vídeo,
+e o custo por frame é de algumas operações vetorizadas sobre poucos milhares de células.
+
+    mapa = MapaCalor(largura, altura, model.names, fps=fps)
+    mapa.adicionar(results.boxes.data.cpu().numpy())   # a cada frame
+    mapa.exportar('video/mapa_calor')                   # a qualquer momento
+
+A exportação grava ``mapa_calor.npz`` (grades brutas), ``mapa_<classe>.png``
+(sobre o frame de fundo) e ``celulas.csv`` (células ordenadas por contagem).
+O .npz pode ser re-renderizado depois, sem o vídeo:
+
+    python -m visao.mapa_calor video/mapa_calor/mapa_calor.npz --saida video/mapa_turno --escala linear
+"""
+import argparse
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+from visao.epi import CLASSES_VIOLACAO, CONF_MIN
+
+
+class MapaCalor:
+    def __init__(self, largura, altura, nomes, classes=CLASSES_VIOLACAO, celula=32, conf_min=CONF_MIN, fps=30):
+        self.largura = int(largura)
+        self.altura = int(altura)
+        self.nomes = {int(k): v for k, v in dict(nomes).items()}
+        self.classes = tuple(classes)
+        self.celula = int(celula)
+        self.conf_min = conf_min
+        self.fps = fps or 30
+        self.linhas = -(-self.altura // self.celula)
+        self.colunas = -(-self.largura // self.celula)
+
+        # id do modelo -> posição da classe nas grades (-1 para classes não acompanhadas)
+        self._posicao = np.full(max(self.nomes, default=0) + 1, -1, dtype=np.int64)
+        for cls, nome in self.nomes.items():
+            if nome in self.classes:
+                self._posicao[cls] = self.classes.index(nome)
+
+        forma = (len(self.classes), self.linhas, self.colunas)
+        self.contagem = np.zeros(forma, dtype=np.uint32)
+        self.area = np.zeros(forma, dtype=np.float64)
+        self.frames_ocupados = np.zeros(forma, dtype=np.uint32)
+        self.sequencia = np.zeros(forma, dtype=np.uint32)
+        self.sequencia_max = np.zeros(forma, dtype=np.uint32)
+        self._ocupada = np.zeros(forma, dtype=bool)
+        self._sequencias_abertas = False
+        self.deteccoes = np.zeros(len(self.classes), dtype=np.int64)
+        self.frames = 0
+        self.fundo = None
+
+    def definir_fundo(self, img):
+        """Frame de referência para os PNGs (guardado uma vez, cópia própria)"""
+        self.fundo = img.copy()
+
+    def adicionar(self, dados):
+        """``dados``: array (n, 6) no formato do ``results.boxes.data`` (xyxy, conf, cls)"""
+        self.frames += 1
+        dados = np.asarray(dados, dtype=np.float32).reshape(-1, 6)
+        cls = dados[:, 5].astype(np.int64)
+        validas = (dados[:, 4] >= self.conf_min) & (cls >= 0) & (cls < len(self._posicao))
+        posicao = np.full(len(dados), -1, dtype=np.int64)
+        posicao[validas] = self._posicao[cls[validas]]
+        selecionadas = posicao >= 0
+        ocupou = bool(selecionadas.any())
+
+        if ocupou:
+            caixas = dados[selecionadas]
+            p = posicao[selecionadas]
+            cx = (caixas[:, 0] + caixas[:, 2]) * 0.5
+            cy = (caixas[:, 1] + caixas[:, 3]) * 0.5
+            ix = np.clip((cx // self.celula).astype(np.int64), 0, self.colunas - 1)
+            iy = np.clip((cy // self.celula).astype(np.int64), 0, self.linhas - 1)
+            area = (caixas[:, 2] - caixas[:, 0]) * (caixas[:, 3] - caixas[:, 1]) / (self.largura * self.altura)
+            np.add.at(self.contagem, (p, iy, ix), 1)
+            np.add.at(self.area, (p, iy, ix), area)
+            self.deteccoes += np.bincount(p, minlength=len(self.classes))
+
+        # Sem detecção neste frame e sem sequência aberta, as grades de permanência não mudam
+        if not ocupou and not self._sequencias_abertas:
+            return
+        self._ocupada.fill(False)
+        if ocupou:
+            self._ocupada[p, iy, ix] = True
+        self.frames_ocupados += self._ocupada
+        self.sequencia += self._ocupada
+        self.sequencia *= self._ocupada
+        np.maximum(self.sequencia_max, self.sequencia, out=self.sequencia_max)
+        self._sequencias_abertas = ocupou
+
+    def snapshot(self):
+        """Cópia das grades no estado atual (o acúmulo pode continuar em seguida)"""
+        return {
+            "classes": np.array(self.classes),
+            "celula": self.celula,
+            "largura": self.largura,
+            "altura": self.altura,
+            "fps": self.fps,
+            "frames": self.frames,
+            "deteccoes": self.deteccoes.copy(),
+            "contagem": self.contagem.copy(),
+            "area": self.area.copy(),
+            "frames_ocupados": self.frames_ocupados.copy(),
+            "sequencia_max": self.sequencia_max.copy(),
+        }
+
+    def resumo(self):
+        return {classe: {"deteccoes": int(self.deteccoes[i]),
+                         "celulas_ocupadas": int((self.frames_ocupados[i] > 0).sum()),
+                         "permanencia_max_s": round(int(self.sequencia_max[i].max(initial=0)) / self.fps, 2)}
+                for i, classe in enumerate(self.classes)}
+
+    def imagem(self, classe, escala="log", alfa=0.5):
+        """Mapa de calor colorido da classe no tamanho do frame, sobre o fundo se houver"""
+        import cv2
+        grade = self.contagem[self.classes.index(classe)].astype(np.float32)
+        if escala == "log":
+            # Sem o log, um único ponto muito frequente apaga o resto do mapa
+            grade = np.log1p(grade)
+        maximo = grade.max(initial=0)
+        normalizada = (grade * (255 / maximo) if maximo > 0 else grade).astype(np.uint8)
+        normalizada = cv2.resize(normalizada, (self.colunas * self.celula, self.linhas * self.celula),
+                                 interpolation=cv2.INTER_LINEAR)[:self.altura, :self.largura]
+        cor = cv2.applyColorMap(normalizada, cv2.COLORMAP_JET)
+        if self.fundo is None:
+            return cor
+        fundo = self.fundo
+        if fundo.shape[:2] != cor.shape[:2]:
+            fundo = cv2.resize(fundo, (self.largura, self.altura))
+        mistura = cv2.addWeighted(fundo, 1 - alfa, cor, alfa, 0)
+        # Células sem nenhuma detecção ficam com o fundo original
+        vazio = normalizada == 0
+        mistura[vazio] = fundo[vazio]
+        return mistura
+
+    def celulas(self):
+        """DataFrame com as células ocupadas de cada classe, da mais frequente para a menos"""
+        import pandas as pd
+        partes = []
+        for i, classe in enumerate(self.classes):
+            iy, ix = np.nonzero(self.contagem[i])
+            contagem = self.contagem[i, iy, ix]
+            partes.append(pd.DataFrame({
+                "classe": classe, "linha": iy, "coluna": ix,
+                "x1": ix * self.celula, "y1": iy * self.celula,
+                "x2": np.minimum((ix + 1) * self.celula, self.largura),
+                "y2": np.minimum((iy + 1) * self.celula, self.altura),
+                "deteccoes": contagem,
+                "area_media_%": np.round(100 * self.area[i, iy, ix] / contagem, 3),
+                "permanencia_s": np.round(self.frames_ocupados[i, iy, ix] / self.fps, 2),
+                "permanencia_max_s": np.round(self.sequencia_max[i, iy, ix] / self.fps, 2),
+            }))
+        df = pd.concat(partes, ignore_index=True)
+        return df.sort_values(["classe", "deteccoes"], ascending=[True, False], ignore_index=True)
+
+    def exportar(self, pasta, escala="log"):
+        """Grava .npz, PNGs e CSV do estado atual; cada arquivo é trocado de uma vez (os.replace)"""
+        import cv2
+        pasta = Path(pasta)
+        pasta.mkdir(parents=True, exist_ok=True)
+
+        estado = self.snapshot()
+        estado["nomes"] = json.dumps(self.nomes, ensure_ascii=False)
+        caminhos = [pasta / "mapa_calor.npz"]
+        with open(pasta / "mapa_calor.tmp.npz", "wb") as f:
+            np.savez_compressed(f, **estado)
+        os.replace(pasta / "mapa_calor.tmp.npz", caminhos[0])
+
+        if self.fundo is not None and not (pasta / "fundo.jpg").exists():
+            cv2.imwrite(str(pasta / "fundo.jpg"), self.fundo)
+        for classe in self.classes:
+            destino = pasta / f"mapa_{classe}.png"
+            cv2.imwrite(str(pasta / f"mapa_{classe}.tmp.png"), self.imagem(classe, escala))
+            os.replace(pasta / f"mapa_{classe}.tmp.png", destino)
+            caminhos.append(destino)
+
+        destino = pasta / "celulas.csv"
+        self.celulas().to_csv(pasta / "celulas.tmp.csv", index=False)
+        os.replace(pasta / "celulas.tmp.csv", destino)
+        caminhos.append(destino)
+        return caminhos
+
+    @classmethod
+    def carregar(cls, caminho):
+        """Reconstrói o mapa a partir de um .npz exportado (e do fundo.jpg ao lado, se existir)"""
+        with np.load(caminho) as dados:
+            mapa = cls(int(dados["largura"]), int(dados["altura"]), json.loads(str(dados["nomes"])),
+                       classes=[str(c) for c in dados["classes"]], celula=int(dados["celula"]),
+                       fps=float(dados["fps"]))
+            mapa.frames = int(dados["frames"])
+            for nome in ("deteccoes", "contagem", "area", "frames_ocupados", "sequencia_max"):
+                getattr(mapa, nome)[...] = dados[nome]
+        fundo = Path(caminho).with_name("fundo.jpg")
+        if fundo.exists():
+            import cv2
+            mapa.fundo = cv2.imread(str(fundo))
+        return mapa
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-renderiza um mapa de calor exportado (.npz)")
+    parser.add_argument("npz")
+    parser.add_argument("--saida", default=None, help="pasta dos PNGs/CSV (padrão: a do .npz)")
+    parser.add_argument("--escala", choices=["log", "linear"], default="log")
+    parser.add_argument("--fundo", default=None, help="imagem de fundo no lugar do fundo.jpg")
+    args = parser.parse_args()
+
+    mapa = MapaCalor.carregar(args.npz)
+    if args.fundo:
+        import cv2
+        mapa.fundo = cv2.imread(args.fundo)
+    caminhos = mapa.exportar(args.saida or Path(args.npz).parent, args.escala)
+    print(f"{mapa.frames} frames | {mapa.resumo()}")
+    print("\n".join(str(c) for c in caminhos))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""Rastreamento opcional das etapas dos detectores, exportado no formato Chrome trace.
+
+Desligado por padrão: ``span()`` devolve sempre o mesmo gerenciador vazio e
+``tick()`` não faz nada, então as chamadas podem ficar no código de produção.
+Liga por variável de ambiente ou argumento de linha de comando:
+
+    LIA_PERFIL=trace.json python detection_epis.py
+    python detection_epis.py --perfil trace.json --cprofile 5:10
+
+``--cprofile INICIO:DURACAO`` (ou ``LIA_CPROFILE``) também liga o cProfile da
+thread que chama ``tick()`` entre INICIO e INICIO+DURACAO segundos e grava o
+resultado ao lado do trace (``trace.json.prof``, abrir com pstats/snakeviz).
+
+O arquivo é gravado na saída do programa e pode ser aberto em chrome://tracing
+ou https://ui.perfetto.dev (uma linha por thread, com pid e tid reais).
+
+Uso no laço:
+    from visao import perfil
+    perfil.configurar()
+    with perfil.span("inference"):
+        results = model(img)
+"""
+import argparse
+import atexit
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+
+MAX_EVENTOS = 2_000_000
+
+
+class _SpanNulo:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULO = _SpanNulo()
+
+
+class _Span:
+    __slots__ = ("tracer", "nome", "inicio")
+
+    def __init__(self, tracer, nome):
+        self.tracer = tracer
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.registrar(self.nome, self.inicio, time.perf_counter_ns())
+        return False
+
+
+class Tracer:
+    """Guarda (nome, tid, início, fim) em memória e grava tudo no fim"""
+
+    def __init__(self, destino, max_eventos=MAX_EVENTOS):
+        self.destino = destino
+        self.max_eventos = max_eventos
+        self.eventos = []
+        self.descartados = 0
+        self.threads = {}
+        self.pid = os.getpid()
+        self._origem = time.perf_counter_ns()
+
+    def span(self, nome):
+        return _Span(self, nome)
+
+    def registrar(self, nome, inicio_ns, fim_ns):
+        if len(self.eventos) >= self.max_eventos:
+            self.descartados += 1
+            return
+        tid = threading.get_ident()
+        if tid not in self.threads:
+            self.threads[tid] = threading.current_thread().name
+        # list.append é atômico com o GIL: várias threads podem registrar sem lock
+        self.eventos.append((nome, tid, inicio_ns, fim_ns))
+
+    def exportar(self):
+        eventos = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                    "args": {"name": os.path.basename(sys.argv[0]) or "python"}}]
+        eventos += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": nome}}
+                    for tid, nome in self.threads.items()]
+        eventos += [{"name": nome, "cat": "etapa", "ph": "X", "pid": self.pid, "tid": tid,
+                     "ts": (inicio - self._origem) / 1000, "dur": (fim - inicio) / 1000}
+                    for nome, tid, inicio, fim in list(self.eventos)]
+        with open(self.destino, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms",
+                       "otherData": {"descartados": self.descartados}}, f)
+        print(f"🧭 Trace com {len(self.eventos)} spans salvo em {self.destino}")
+
+
+class JanelaCProfile:
+    """cProfile ligado só entre ``inicio`` e ``inicio + duracao`` segundos"""
+
+    def __init__(self, destino, inicio=0.0, duracao=10.0):
+        self.destino = destino
+        self.inicio = inicio
+        self.fim = inicio + duracao
+        self._t0 = time.perf_counter()
+        self._perfil = None
+        self.encerrada = False
+
+    def tick(self):
+        if self.encerrada:
+            return
+        agora = time.perf_counter() - self._t0
+        if self._perfil is None and agora >= self.inicio:
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+        elif self._perfil is not None and agora >= self.fim:
+            self.encerrar()
+
+    def encerrar(self):
+        if self._perfil is None or self.encerrada:
+            return
+        self._perfil.disable()
+        self._perfil.dump_stats(self.destino)
+        self.encerrada = True
+        print(f"🧭 cProfile ({self.fim - self.inicio:.0f} s) salvo em {self.destino}")
+
+
+_tracer = None
+_janela = None
+
+
+def span(nome):
+    """Gerenciador de contexto que mede uma etapa (vazio quando o rastreamento está desligado)"""
+    if _tracer is None:
+        return _NULO
+    return _tracer.span(nome)
+
+
+def tick():
+    """Chamar uma vez por iteração na thread que deve aparecer no cProfile"""
+    if _janela is not None:
+        _janela.tick()
+
+
+def ativo():
+    return _tracer is not None
+
+
+def _janela_de(texto):
+    inicio, _, duracao = texto.partition(":")
+    return float(inicio or 0), float(duracao or 10)
+
+
+def configurar(destino=None, cprofile=None, argv=None):
+    """Lê ``--perfil``/``--cprofile`` da linha de comando ou LIA_PERFIL/LIA_CPROFILE.
+
+    Os argumentos são retirados de ``sys.argv`` para não atrapalhar outros parsers.
+    """
+    global _tracer, _janela
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--perfil", default=None)
+    parser.add_argument("--cprofile", default=None)
+    conhecidos, restantes = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    if argv is None:
+        sys.argv[1:] = restantes
+
+    destino = destino or conhecidos.perfil or os.environ.get("LIA_PERFIL")
+    cprofile = cprofile or conhecidos.cprofile or os.environ.get("LIA_CPROFILE")
+    if cprofile and not destino:
+        destino = "trace.json"
+    if not destino:
+        return None
+
+    _tracer = Tracer(destino)
+    atexit.register(_tracer.exportar)
+    if cprofile:
+        _janela = JanelaCProfile(destino + ".prof", *_janela_de(cprofile))
+        atexit.register(_janela.encerrar)
+    return _tracer
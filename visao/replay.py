@@ -0,0 +1,115 @@
+"""Replay do sidecar de detecções: novo vídeo anotado ou estatísticas de EPI sem rodar o YOLO.
+
+Limiar de confiança, filtro de classes e cores são escolhidos na hora:
+
+    # Estatísticas (segundos, não lê o vídeo)
+    python -m visao.replay video/deteccoes.parquet --conf 0.6 --estatisticas video/epi_conf06.xlsx
+
+    # Vídeo reanotado só com as violações, em amarelo
+    python -m visao.replay video/deteccoes.parquet --conf 0.5 --classes sem_capacete sem_colete \\
+        --cor sem_capacete=0,255,255 --cor sem_colete=0,255,255 --saida video/violacoes.mp4
+"""
+import argparse
+
+import pandas as pd
+
+from visao.epi import CLASSES_VIOLACAO, CONF_MIN, CORES
+from visao.sidecar import ler_deteccoes
+
+
+def filtrar(deteccoes, conf=CONF_MIN, classes=None):
+    filtro = deteccoes["conf"] >= conf
+    if classes:
+        filtro &= deteccoes["classe"].isin(classes)
+    return deteccoes[filtro]
+
+
+def estatisticas_epi(deteccoes, total_frames, violacoes=CLASSES_VIOLACAO):
+    """Resumo por classe + frames com falta de EPI (as detecções já filtradas)"""
+    por_classe = (deteccoes.groupby("classe", observed=True)
+                  .agg(deteccoes=("conf", "size"), frames=("frame", "nunique"), conf_media=("conf", "mean"))
+                  .reset_index())
+    por_classe["frames_%"] = (100 * por_classe["frames"] / max(total_frames, 1)).round(2)
+    por_classe["conf_media"] = por_classe["conf_media"].round(3)
+
+    frames_violacao = deteccoes.loc[deteccoes["classe"].isin(violacoes), "frame"].nunique()
+    resumo = {"frames": total_frames, "frames_com_violacao": int(frames_violacao),
+              "frames_com_violacao_%": round(100 * frames_violacao / max(total_frames, 1), 2),
+              "deteccoes": len(deteccoes)}
+    return por_classe, resumo
+
+
+def renderizar(deteccoes, video_origem, saida, cores=CORES, **opcoes_codificador):
+    """Relê o vídeo original e desenha as caixas do sidecar (sem inferência)"""
+    import cv2
+    from visao.codificador import abrir_codificador
+    from visao.epi import desenhar
+
+    video = cv2.VideoCapture(video_origem)
+    if not video.isOpened():
+        raise FileNotFoundError(f"Não foi possível abrir o vídeo: {video_origem}")
+    fps = video.get(cv2.CAP_PROP_FPS) or 30
+    tamanho = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    codificador = abrir_codificador(saida, fps, tamanho, **opcoes_codificador)
+
+    colunas = ["x1", "y1", "x2", "y2", "classe", "conf"]
+    por_frame = {f: list(g[colunas].itertuples(index=False, name=None))
+                 for f, g in deteccoes.groupby("frame")}
+    indice = 0
+    while True:
+        check, img = video.read()
+        if not check:
+            break
+        desenhar(img, por_frame.get(indice, ()), cores)
+        codificador.write(img)
+        indice += 1
+    video.release()
+    codificador.release()
+    return indice, codificador.metricas()
+
+
+def _cor(texto):
+    nome, _, bgr = texto.partition("=")
+    return nome, tuple(int(c) for c in bgr.split(","))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay do sidecar de detecções")
+    parser.add_argument("sidecar")
+    parser.add_argument("--conf", type=float, default=CONF_MIN)
+    parser.add_argument("--classes", nargs="+", default=None, help="só estas classes")
+    parser.add_argument("--cor", action="append", default=[], type=_cor, metavar="CLASSE=B,G,R")
+    parser.add_argument("--video", default=None, help="vídeo original (padrão: o dos metadados)")
+    parser.add_argument("--saida", default=None, help="grava um novo vídeo anotado")
+    parser.add_argument("--estatisticas", default=None, help="grava as estatísticas (.xlsx ou .csv)")
+    args = parser.parse_args()
+
+    deteccoes, meta = ler_deteccoes(args.sidecar)
+    if args.conf < meta.get("conf_inferencia", 0):
+        print(f"⚠️ O sidecar só tem caixas com conf >= {meta['conf_inferencia']}")
+    selecionadas = filtrar(deteccoes, args.conf, args.classes)
+    total_frames = int(meta.get("frames") or (deteccoes["frame"].max() + 1 if len(deteccoes) else 0))
+
+    por_classe, resumo = estatisticas_epi(selecionadas, total_frames)
+    print(por_classe.to_string(index=False))
+    print(resumo)
+    if args.estatisticas:
+        if args.estatisticas.endswith(".csv"):
+            por_classe.to_csv(args.estatisticas, index=False)
+        else:
+            with pd.ExcelWriter(args.estatisticas) as escritor:
+                por_classe.to_excel(escritor, sheet_name="por_classe", index=False)
+                pd.DataFrame([resumo]).to_excel(escritor, sheet_name="resumo", index=False)
+        print(f"Estatísticas salvas em {args.estatisticas}")
+
+    if args.saida:
+        video = args.video or meta.get("video")
+        if not video:
+            raise SystemExit("Informe --video (o sidecar não registra o vídeo de origem)")
+        cores = {**CORES, **dict(args.cor)}
+        frames, metricas = renderizar(selecionadas, video, args.saida, cores)
+        print(f"🎞️ {frames} frames reanotados em {args.saida} | {metricas}")
+
+
+if __name__ == "__main__":
+    main()
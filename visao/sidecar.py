@@ -0,0 +1,91 @@
+"""Arquivo de detecções (sidecar) gravado durante a inferência, em Parquet.
+
+Uma linha por caixa: frame, x1, y1, x2, y2, conf, cls. Todas as caixas que o
+YOLO devolve são gravadas (o limiar de confiança do script é aplicado só no
+desenho), então o replay pode usar qualquer limiar maior ou igual ao da
+inferência. Os nomes das classes, o vídeo de origem, fps, tamanho e modelo vão
+nos metadados do arquivo. A gravação é feita em grupos de linhas, com memória
+constante durante o vídeo.
+
+    sidecar = GravadorDeteccoes('video/deteccoes.parquet', model.names, video='videos/epi-2.mp4', fps=fps)
+    sidecar.adicionar(indice_frame, results.boxes.data.cpu().numpy())
+    sidecar.fechar()
+
+    deteccoes, meta = ler_deteccoes('video/deteccoes.parquet')
+"""
+import json
+
+import numpy as np
+
+COLUNAS = ("frame", "x1", "y1", "x2", "y2", "conf", "cls")
+
+
+class GravadorDeteccoes:
+    def __init__(self, caminho, nomes, linhas_por_grupo=50_000, **metadados):
+        import pyarrow as pa
+        self.caminho = caminho
+        self.linhas_por_grupo = linhas_por_grupo
+        meta = {"nomes": json.dumps({int(k): v for k, v in dict(nomes).items()}, ensure_ascii=False),
+                "metadados": json.dumps(metadados, ensure_ascii=False, default=str)}
+        self.schema = pa.schema([("frame", pa.int32()), ("x1", pa.float32()), ("y1", pa.float32()),
+                                 ("x2", pa.float32()), ("y2", pa.float32()), ("conf", pa.float32()),
+                                 ("cls", pa.int16())], metadata=meta)
+        self._escritor = None
+        self._pendentes = []
+        self._n_pendentes = 0
+        self.linhas = 0
+        self.frames = 0
+
+    def adicionar(self, frame, dados):
+        """``dados``: array (n, 6) no formato do ``results.boxes.data`` (xyxy, conf, cls)"""
+        self.frames += 1
+        dados = np.asarray(dados, dtype=np.float32).reshape(-1, 6)
+        if not len(dados):
+            return
+        self._pendentes.append((np.full(len(dados), frame, dtype=np.int32), dados))
+        self._n_pendentes += len(dados)
+        if self._n_pendentes >= self.linhas_por_grupo:
+            self._descarregar()
+
+    def _descarregar(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if not self._pendentes:
+            return
+        frames = np.concatenate([f for f, _ in self._pendentes])
+        dados = np.concatenate([d for _, d in self._pendentes])
+        colunas = [frames] + [dados[:, i] for i in range(5)] + [dados[:, 5].astype(np.int16)]
+        tabela = pa.Table.from_arrays(colunas, schema=self.schema)
+        if self._escritor is None:
+            self._escritor = pq.ParquetWriter(self.caminho, self.schema, compression="zstd")
+        self._escritor.write_table(tabela)
+        self.linhas += len(frames)
+        self._pendentes, self._n_pendentes = [], 0
+
+    def fechar(self):
+        self._descarregar()
+        if self._escritor is None:
+            # Vídeo sem nenhuma detecção: grava o arquivo vazio com o schema
+            import pyarrow.parquet as pq
+            self._escritor = pq.ParquetWriter(self.caminho, self.schema, compression="zstd")
+        # Total de frames processados (inclui os sem detecção), conhecido só no fim
+        if hasattr(self._escritor, "add_key_value_metadata"):
+            self._escritor.add_key_value_metadata({"frames_processados": str(self.frames)})
+        self._escritor.close()
+        print(f"🗂️ {self.linhas} detecções de {self.frames} frames salvas em {self.caminho}")
+
+
+def ler_deteccoes(caminho):
+    """(DataFrame com as colunas de COLUNAS + 'classe', metadados com 'nomes')"""
+    import pyarrow.parquet as pq
+    tabela = pq.read_table(caminho)
+    # Metadados do rodapé do arquivo (inclui os adicionados no fechamento)
+    bruto = pq.read_metadata(caminho).metadata or {}
+    nomes = {int(k): v for k, v in json.loads(bruto.get(b"nomes", b"{}")).items()}
+    meta = json.loads(bruto.get(b"metadados", b"{}"))
+    meta["nomes"] = nomes
+    if b"frames_processados" in bruto:
+        meta["frames"] = int(bruto[b"frames_processados"])
+    df = tabela.to_pandas()
+    df["classe"] = df["cls"].map(nomes).astype("category")
+    return df, meta